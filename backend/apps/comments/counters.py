@@ -0,0 +1,61 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Value, When
+
+from .models import Comment, CommentTotal, MatchCommentCount, UserCommentCount
+
+TOTAL_ID = 1
+
+
+def _adjusted(delta):
+    if delta >= 0:
+        return F('count') + delta
+    # Clamp before subtracting: count + delta below zero is out of range for
+    # unsigned columns (MySQL), so it can't be clamped afterwards.
+    return Case(When(count__lt=-delta, then=Value(0)), default=F('count') + delta)
+
+
+def _bump(model, lookup, delta):
+    if model.objects.filter(**lookup).update(count=_adjusted(delta)):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=max(delta, 0), **lookup)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(count=_adjusted(delta))
+
+
+def record_comment(comment, delta):
+    # Called from the comment create/delete paths, inside their transaction.
+    _bump(MatchCommentCount, {'match_id': str(comment.match_id)}, delta)
+    _bump(UserCommentCount, {'user_id': comment.user_id}, delta)
+    _bump(CommentTotal, {'id': TOTAL_ID}, delta)
+
+
+def match_comment_counts(match_ids):
+    counts = dict.fromkeys(map(str, match_ids), 0)
+    counts.update(MatchCommentCount.objects.filter(match_id__in=list(counts)).values_list('match_id', 'count'))
+    return counts
+
+
+def comment_total():
+    # One row kept next to the per-user counters, so exact in every worker
+    # without a COUNT or SUM over a growing table.
+    return CommentTotal.objects.filter(id=TOTAL_ID).values_list('count', flat=True).first() or 0
+
+
+@transaction.atomic
+def rebuild_counters():
+    MatchCommentCount.objects.all().delete()
+    UserCommentCount.objects.all().delete()
+
+    MatchCommentCount.objects.bulk_create([
+        MatchCommentCount(match_id=row['match_id'], count=row['total'])
+        for row in Comment.objects.values('match_id').annotate(total=Count('id')).order_by()
+    ], batch_size=1000)
+    UserCommentCount.objects.bulk_create([
+        UserCommentCount(user_id=row['user_id'], count=row['total'])
+        for row in Comment.objects.values('user_id').annotate(total=Count('id')).order_by()
+    ], batch_size=1000)
+    CommentTotal.objects.update_or_create(id=TOTAL_ID, defaults={'count': Comment.objects.count()})
+
+    return MatchCommentCount.objects.count(), UserCommentCount.objects.count()
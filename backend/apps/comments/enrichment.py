@@ -0,0 +1,114 @@
+import datetime
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Min, Q
+from django.utils import timezone
+
+from apps.matches.quota import PRIORITY_BACKFILL
+from .match_details import fetch_match_data, save_snapshot
+from .models import Comment, EnrichmentJob
+
+ENRICHMENT_QUEUE_SETTINGS = getattr(settings, 'ENRICHMENT_QUEUE', {})
+
+LEASE_SECONDS = ENRICHMENT_QUEUE_SETTINGS.get('LEASE_SECONDS', 300)
+MAX_ATTEMPTS = ENRICHMENT_QUEUE_SETTINGS.get('MAX_ATTEMPTS', 5)
+RETRY_BACKOFF = ENRICHMENT_QUEUE_SETTINGS.get('RETRY_BACKOFF', 30)
+RETRY_BACKOFF_MAX = ENRICHMENT_QUEUE_SETTINGS.get('RETRY_BACKOFF_MAX', 3600)
+
+
+def enqueue_enrichment(match_id):
+    # One job per match: a repeat enqueue only bumps enqueued_at so the
+    # worker knows to run it again if it was already in progress.
+    match_id = str(match_id)
+    now = timezone.now()
+    if EnrichmentJob.objects.filter(match_id=match_id).update(enqueued_at=now):
+        return
+    try:
+        with transaction.atomic():
+            EnrichmentJob.objects.create(match_id=match_id, enqueued_at=now, available_at=now)
+    except IntegrityError:
+        EnrichmentJob.objects.filter(match_id=match_id).update(enqueued_at=now)
+
+
+def claim_jobs(limit):
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = EnrichmentJob.objects.filter(available_at__lte=now).order_by('available_at')
+        if connection.features.has_select_for_update_skip_locked:
+            jobs = jobs.select_for_update(skip_locked=True)
+        jobs = list(jobs[:limit])
+
+        # Lease the claimed jobs so other workers skip them until they expire.
+        EnrichmentJob.objects.filter(id__in=[job.id for job in jobs]).update(
+            available_at=now + datetime.timedelta(seconds=LEASE_SECONDS)
+        )
+    return jobs
+
+
+def run_job(job):
+    match_data = fetch_match_data(job.match_id, priority=PRIORITY_BACKFILL)
+    if not match_data:
+        raise RuntimeError(f'No match data for {job.match_id}')
+
+    snapshot = save_snapshot(job.match_id, match_data)
+    Comment.objects.filter(match_id=job.match_id, snapshot__isnull=True).update(snapshot=snapshot)
+
+
+def complete_job(job):
+    if EnrichmentJob.objects.filter(id=job.id, enqueued_at__lte=job.enqueued_at).delete()[0]:
+        return
+    # Re-enqueued while running, make it available again straight away.
+    EnrichmentJob.objects.filter(id=job.id).update(available_at=timezone.now(), attempts=0, last_error=None)
+
+
+def fail_job(job, error):
+    attempts = job.attempts + 1
+    now = timezone.now()
+    # Only the enqueue this run was claimed for is retried or dropped.
+    claimed = EnrichmentJob.objects.filter(id=job.id, enqueued_at__lte=job.enqueued_at)
+    if attempts >= MAX_ATTEMPTS:
+        if claimed.delete()[0]:
+            print(f"Dropping enrichment job for match {job.match_id} after {attempts} attempts: {error}")
+            return
+    else:
+        delay = min(RETRY_BACKOFF * 2 ** (attempts - 1), RETRY_BACKOFF_MAX)
+        if claimed.update(attempts=attempts, last_error=str(error), available_at=now + datetime.timedelta(seconds=delay)):
+            return
+
+    # Re-enqueued while running: the new request starts its own count of
+    # attempts, after the first backoff.
+    EnrichmentJob.objects.filter(id=job.id).update(
+        attempts=0,
+        last_error=str(error),
+        available_at=now + datetime.timedelta(seconds=RETRY_BACKOFF)
+    )
+
+
+def process_jobs(limit=20):
+    processed = failed = 0
+    for job in claim_jobs(limit):
+        try:
+            run_job(job)
+        except Exception as e:
+            fail_job(job, e)
+            failed += 1
+        else:
+            complete_job(job)
+            processed += 1
+    return processed, failed
+
+
+def queue_stats():
+    now = timezone.now()
+    stats = EnrichmentJob.objects.aggregate(
+        oldest=Min('enqueued_at'),
+        oldest_ready=Min('enqueued_at', filter=Q(available_at__lte=now)),
+    )
+    return {
+        'depth': EnrichmentJob.objects.count(),
+        'ready': EnrichmentJob.objects.filter(available_at__lte=now).count(),
+        'retrying': EnrichmentJob.objects.filter(attempts__gt=0).count(),
+        'lag_seconds': round((now - stats['oldest']).total_seconds(), 1) if stats['oldest'] else 0,
+        'ready_lag_seconds': round((now - stats['oldest_ready']).total_seconds(), 1) if stats['oldest_ready'] else 0,
+    }
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.comments.enrichment import process_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued match snapshot enrichment jobs for new comments'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=2,
+                            help='Seconds to wait when the queue is empty')
+        parser.add_argument('--batch-size', type=int, default=20)
+        parser.add_argument('--once', action='store_true',
+                            help='Process one batch and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                processed, failed = process_jobs(options['batch_size'])
+            except Exception as e:
+                self.stderr.write(f'enrichment: {e}')
+                processed = failed = 0
+
+            if processed or failed:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'enrichment: {processed} done, {failed} failed in {elapsed:.2f}s')
+
+            if options['once']:
+                break
+
+            if not processed and not failed:
+                time.sleep(options['interval'])
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.comments.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-match, per-user and total comment counters from the Comment table'
+
+    def handle(self, *args, **options):
+        matches, users = rebuild_counters()
+        self.stdout.write(f'Rebuilt counters for {matches} matches and {users} users')
@@ -0,0 +1,98 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.timezone import make_aware
+
+from apps.matches.cache import match_ttl
+from apps.matches.football_api import football_get
+from apps.matches.quota import PRIORITY_BACKFILL
+from .models import Comment, MatchSnapshot
+
+MATCH_DETAILS_PREFETCH_SETTINGS = getattr(settings, 'MATCH_DETAILS_PREFETCH', {})
+
+MAX_WORKERS = MATCH_DETAILS_PREFETCH_SETTINGS.get('MAX_WORKERS', 4)
+
+def snapshot_fields(match_data):
+    home_team = match_data.get('homeTeam', {})
+    away_team = match_data.get('awayTeam', {})
+    competition = match_data.get('competition', {})
+
+    match_date = None
+    if match_data.get('utcDate'):
+        try:
+            match_date = make_aware(datetime.strptime(match_data.get('utcDate'), '%Y-%m-%dT%H:%M:%SZ'))
+        except Exception as e:
+            print(f"Error parsing date: {e}")
+
+    home_team_name = home_team.get('name', 'Unknown Team')
+    away_team_name = away_team.get('name', 'Unknown Team')
+    return {
+        'home_team_name': home_team_name,
+        'home_team_shortname': home_team.get('shortName', home_team_name),
+        'home_team_crest': home_team.get('crest', ''),
+        'away_team_name': away_team_name,
+        'away_team_shortname': away_team.get('shortName', away_team_name),
+        'away_team_crest': away_team.get('crest', ''),
+        'competition_name': competition.get('name', 'Unknown'),
+        'competition_id': competition.get('id', 0),
+        'date': match_date,
+        'status': match_data.get('status', 'UNKNOWN'),
+        'score': match_data.get('score', {"fullTime": {"home": 0, "away": 0}}),
+    }
+
+
+def save_snapshot(match_id, match_data):
+    # One row per match, so a score refresh is a single write for every comment on it.
+    snapshot, _ = MatchSnapshot.objects.update_or_create(
+        match_id=str(match_id),
+        defaults=snapshot_fields(match_data)
+    )
+    return snapshot
+
+
+def fetch_match_data(match_id, priority=PRIORITY_BACKFILL):
+    try:
+        status_code, match_data = football_get(f'/matches/{match_id}', ttl=match_ttl, priority=priority)
+        if status_code == 200:
+            return match_data
+    except Exception as e:
+        print(f"Error fetching match details: {e}")
+    return None
+
+
+def prefetch_match_details(comments):
+    # Link the page's comments to snapshots, fetching each unknown match once and side by side.
+    missing = [comment for comment in comments if not comment.snapshot_id]
+    match_ids = list(dict.fromkeys(str(comment.match_id) for comment in missing))
+    if not match_ids:
+        return
+
+    snapshots = MatchSnapshot.objects.in_bulk(match_ids, field_name='match_id')
+    to_fetch = [match_id for match_id in match_ids if match_id not in snapshots]
+
+    fetched = {}
+    if to_fetch:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(to_fetch))) as executor:
+            fetched = dict(zip(to_fetch, executor.map(fetch_match_data, to_fetch)))
+
+    # One transaction for the inserts and the relinking.
+    with transaction.atomic():
+        if fetched:
+            MatchSnapshot.objects.bulk_create(
+                [MatchSnapshot(match_id=match_id, **snapshot_fields(match_data))
+                 for match_id, match_data in fetched.items() if match_data],
+                ignore_conflicts=True
+            )
+            snapshots.update(MatchSnapshot.objects.in_bulk(to_fetch, field_name='match_id'))
+
+        linked = []
+        for comment in missing:
+            snapshot = snapshots.get(str(comment.match_id))
+            if snapshot:
+                comment.snapshot = snapshot
+                linked.append(comment)
+
+        if linked:
+            Comment.objects.bulk_update(linked, ['snapshot'])
@@ -0,0 +1,38 @@
+# Generated by Django 5.2 on 2026-10-17 22:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0004_comment_match_away_team_shortname_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('match_id', models.CharField(max_length=100, unique=True)),
+                ('home_team_name', models.CharField(max_length=100)),
+                ('home_team_shortname', models.CharField(blank=True, max_length=100, null=True)),
+                ('home_team_crest', models.URLField(blank=True, max_length=500, null=True)),
+                ('away_team_name', models.CharField(max_length=100)),
+                ('away_team_shortname', models.CharField(blank=True, max_length=100, null=True)),
+                ('away_team_crest', models.URLField(blank=True, max_length=500, null=True)),
+                ('competition_name', models.CharField(blank=True, max_length=100, null=True)),
+                ('competition_id', models.IntegerField(blank=True, null=True)),
+                ('date', models.DateTimeField(blank=True, null=True)),
+                ('status', models.CharField(blank=True, max_length=50, null=True)),
+                ('score', models.JSONField(blank=True, default=dict)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='snapshot',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='comments', to='comments.matchsnapshot'),
+        ),
+    ]
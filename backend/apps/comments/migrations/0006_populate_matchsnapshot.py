@@ -0,0 +1,74 @@
+import json
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def build_snapshots(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    MatchSnapshot = apps.get_model('comments', 'MatchSnapshot')
+
+    # The most recently written comment per match carries the freshest details.
+    latest_ids = list(
+        Comment.objects.filter(match_home_team_name__isnull=False)
+        .values('match_id')
+        .annotate(latest_id=Max('id'))
+        .values_list('latest_id', flat=True)
+    )
+
+    snapshots = []
+    for comment in Comment.objects.filter(id__in=latest_ids).iterator():
+        try:
+            score = json.loads(comment.match_score) if comment.match_score else {}
+        except ValueError:
+            score = {"fullTime": {"home": 0, "away": 0}}
+
+        snapshots.append(MatchSnapshot(
+            match_id=comment.match_id,
+            home_team_name=comment.match_home_team_name,
+            home_team_shortname=comment.match_home_team_shortname,
+            home_team_crest=comment.match_home_team_crest,
+            away_team_name=comment.match_away_team_name or 'Unknown Team',
+            away_team_shortname=comment.match_away_team_shortname,
+            away_team_crest=comment.match_away_team_crest,
+            competition_name=comment.match_competition_name,
+            competition_id=comment.match_competition_id,
+            date=comment.match_date,
+            status=comment.match_status,
+            score=score,
+        ))
+    MatchSnapshot.objects.bulk_create(snapshots, batch_size=500)
+
+    for match_id, snapshot_id in MatchSnapshot.objects.values_list('match_id', 'id'):
+        Comment.objects.filter(match_id=match_id).update(snapshot_id=snapshot_id)
+
+
+def restore_comment_fields(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    MatchSnapshot = apps.get_model('comments', 'MatchSnapshot')
+
+    for snapshot in MatchSnapshot.objects.iterator():
+        Comment.objects.filter(snapshot_id=snapshot.id).update(
+            match_home_team_name=snapshot.home_team_name,
+            match_home_team_shortname=snapshot.home_team_shortname,
+            match_home_team_crest=snapshot.home_team_crest,
+            match_away_team_name=snapshot.away_team_name,
+            match_away_team_shortname=snapshot.away_team_shortname,
+            match_away_team_crest=snapshot.away_team_crest,
+            match_competition_name=snapshot.competition_name,
+            match_competition_id=snapshot.competition_id,
+            match_date=snapshot.date,
+            match_status=snapshot.status,
+            match_score=json.dumps(snapshot.score),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0005_matchsnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(build_snapshots, restore_comment_fields),
+    ]
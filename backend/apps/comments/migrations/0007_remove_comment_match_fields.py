@@ -0,0 +1,57 @@
+# Generated by Django 5.2 on 2026-10-17 22:38
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0006_populate_matchsnapshot'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_away_team_crest',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_away_team_name',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_away_team_shortname',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_competition_id',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_competition_name',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_date',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_home_team_crest',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_home_team_name',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_home_team_shortname',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_score',
+        ),
+        migrations.RemoveField(
+            model_name='comment',
+            name='match_status',
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    MatchCommentCount = apps.get_model('comments', 'MatchCommentCount')
+    UserCommentCount = apps.get_model('comments', 'UserCommentCount')
+
+    # Same as counters.rebuild_counters, against the historical models.
+    MatchCommentCount.objects.all().delete()
+    UserCommentCount.objects.all().delete()
+
+    MatchCommentCount.objects.bulk_create([
+        MatchCommentCount(match_id=row['match_id'], count=row['total'])
+        for row in Comment.objects.values('match_id').annotate(total=Count('id')).order_by()
+    ], batch_size=1000)
+    UserCommentCount.objects.bulk_create([
+        UserCommentCount(user_id=row['user_id'], count=row['total'])
+        for row in Comment.objects.values('user_id').annotate(total=Count('id')).order_by()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0010_comment_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-17 23:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0011_populate_comment_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
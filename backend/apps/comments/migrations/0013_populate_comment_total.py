@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def fill_total(apps, schema_editor):
+    Comment = apps.get_model('comments', 'Comment')
+    CommentTotal = apps.get_model('comments', 'CommentTotal')
+    CommentTotal.objects.update_or_create(id=1, defaults={'count': Comment.objects.count()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0012_comment_total'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_total, migrations.RunPython.noop),
+    ]
@@ -1,55 +1,93 @@
 from django.db import models
 from django.contrib.auth.models import User
-import json
+
+class MatchSnapshot(models.Model):
+    match_id = models.CharField(max_length=100, unique=True)
+    home_team_name = models.CharField(max_length=100)
+    home_team_shortname = models.CharField(max_length=100, blank=True, null=True)
+    home_team_crest = models.URLField(max_length=500, blank=True, null=True)
+    away_team_name = models.CharField(max_length=100)
+    away_team_shortname = models.CharField(max_length=100, blank=True, null=True)
+    away_team_crest = models.URLField(max_length=500, blank=True, null=True)
+    competition_name = models.CharField(max_length=100, blank=True, null=True)
+    competition_id = models.IntegerField(blank=True, null=True)
+    date = models.DateTimeField(blank=True, null=True)
+    status = models.CharField(max_length=50, blank=True, null=True)
+    score = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.home_team_name} vs {self.away_team_name}"
+
+    def as_match_details(self):
+        return {
+            'id': self.match_id,
+            'homeTeam': {
+                'name': self.home_team_name,
+                'shortName': self.home_team_shortname or self.home_team_name,
+                'crest': self.home_team_crest or ''
+            },
+            'awayTeam': {
+                'name': self.away_team_name,
+                'shortName': self.away_team_shortname or self.away_team_name,
+                'crest': self.away_team_crest or ''
+            },
+            'competition': {
+                'id': self.competition_id or 0,
+                'name': self.competition_name or 'Unknown'
+            },
+            'utcDate': self.date.isoformat() if self.date else None,
+            'status': self.status or 'UNKNOWN',
+            'score': self.score
+        }
 
 class Comment(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     match_id = models.CharField(max_length=100)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
-    match_home_team_name = models.CharField(max_length=100, blank=True, null=True)
-    match_home_team_shortname = models.CharField(max_length=100, blank=True, null=True)
-    match_home_team_crest = models.URLField(max_length=500, blank=True, null=True)
-    match_away_team_name = models.CharField(max_length=100, blank=True, null=True)
-    match_away_team_shortname = models.CharField(max_length=100, blank=True, null=True)
-    match_away_team_crest = models.URLField(max_length=500, blank=True, null=True)
-    match_competition_name = models.CharField(max_length=100, blank=True, null=True)
-    match_competition_id = models.IntegerField(blank=True, null=True)
-    match_date = models.DateTimeField(blank=True, null=True)
-    match_status = models.CharField(max_length=50, blank=True, null=True)
-    match_score = models.TextField(blank=True, null=True)
+    snapshot = models.ForeignKey(MatchSnapshot, on_delete=models.SET_NULL, blank=True, null=True, related_name='comments')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='comment_feed_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} on {self.match_id}"
     
     def get_match_details(self):
-        if not self.match_home_team_name:
+        if not self.snapshot_id:
             return None
-            
-        score_data = {}
-        if self.match_score:
-            try:
-                score_data = json.loads(self.match_score) 
-            except:
-                score_data = {"fullTime": {"home": 0, "away": 0}}
-        
-        return {
-            'id': self.match_id,
-            'homeTeam': {
-                'name': self.match_home_team_name,
-                'shortName': self.match_home_team_shortname or self.match_home_team_name,
-                'crest': self.match_home_team_crest or ''
-            },
-            'awayTeam': {
-                'name': self.match_away_team_name,
-                'shortName': self.match_away_team_shortname or self.match_away_team_name,
-                'crest': self.match_away_team_crest or ''
-            },
-            'competition': {
-                'id': self.match_competition_id or 0,
-                'name': self.match_competition_name or 'Unknown'
-            },
-            'utcDate': self.match_date.isoformat() if self.match_date else None,
-            'status': self.match_status or 'UNKNOWN',
-            'score': score_data
-        }
\ No newline at end of file
+        return self.snapshot.as_match_details()
+
+class EnrichmentJob(models.Model):
+    match_id = models.CharField(max_length=100, unique=True)
+    enqueued_at = models.DateTimeField()
+    available_at = models.DateTimeField(db_index=True)
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Enrich match {self.match_id}"
+
+class MatchCommentCount(models.Model):
+    match_id = models.CharField(max_length=100, unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.match_id}: {self.count}"
+
+class UserCommentCount(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='comment_counter')
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.count}"
+
+class CommentTotal(models.Model):
+    # A single row (id=1) holding the number of comments site-wide.
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.count} comments"
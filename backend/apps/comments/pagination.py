@@ -0,0 +1,57 @@
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+COMMENT_FEED_SETTINGS = getattr(settings, 'COMMENT_FEED', {})
+
+MAX_PAGE_SIZE = COMMENT_FEED_SETTINGS.get('MAX_PAGE_SIZE', 100)
+
+
+def encode_cursor(comment, direction):
+    payload = json.dumps({'c': comment.created_at.isoformat(), 'i': comment.id, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        created_at = parse_datetime(payload['c'])
+        if created_at is None or payload['d'] not in ('next', 'prev'):
+            raise ValueError
+        return created_at, int(payload['i']), payload['d']
+    except (ValueError, KeyError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+def keyset_page(queryset, cursor, page_size):
+    # Newest first on (created_at, id); the composite index makes every page a range scan.
+    if not cursor:
+        rows = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+        has_next, has_prev = len(rows) > page_size, False
+        rows = rows[:page_size]
+    else:
+        created_at, comment_id, direction = decode_cursor(cursor)
+        if direction == 'next':
+            rows = list(
+                queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=comment_id))
+                .order_by('-created_at', '-id')[:page_size + 1]
+            )
+            has_next, has_prev = len(rows) > page_size, True
+            rows = rows[:page_size]
+        else:
+            rows = list(
+                queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=comment_id))
+                .order_by('created_at', 'id')[:page_size + 1]
+            )
+            has_next, has_prev = True, len(rows) > page_size
+            rows = rows[:page_size][::-1]
+
+    return {
+        'rows': rows,
+        'next_cursor': encode_cursor(rows[-1], 'next') if rows and has_next else None,
+        'prev_cursor': encode_cursor(rows[0], 'prev') if rows and has_prev else None,
+    }
+
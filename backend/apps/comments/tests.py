@@ -0,0 +1,151 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.core.testing import endpoint_budget
+from apps.matches.cache import encoded_cache
+from apps.matches.quota import PRIORITY_BACKFILL
+from .counters import comment_total, rebuild_counters, record_comment
+from .enrichment import MAX_ATTEMPTS, claim_jobs, enqueue_enrichment, fail_job, process_jobs
+from .models import Comment, EnrichmentJob, MatchCommentCount, MatchSnapshot, UserCommentCount
+
+
+class CounterMigrationTests(TransactionTestCase):
+    before = [('comments', '0010_comment_counters')]
+    after = [('comments', '0011_populate_comment_counters')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    def test_existing_comments_are_counted(self):
+        apps = self.migrate(self.before)
+        user = apps.get_model('auth', 'User').objects.create(username='early')
+        HistoricalComment = apps.get_model('comments', 'Comment')
+        HistoricalComment.objects.create(user_id=user.id, match_id='100', content='first')
+        HistoricalComment.objects.create(user_id=user.id, match_id='100', content='second')
+        HistoricalComment.objects.create(user_id=user.id, match_id='200', content='third')
+
+        apps = self.migrate(self.after)
+        MatchCount = apps.get_model('comments', 'MatchCommentCount')
+        UserCount = apps.get_model('comments', 'UserCommentCount')
+        self.assertEqual(dict(MatchCount.objects.values_list('match_id', 'count')), {'100': 2, '200': 1})
+        self.assertEqual(UserCount.objects.get(user_id=user.id).count, 3)
+
+        apps = self.migrate([('comments', '0013_populate_comment_total')])
+        self.assertEqual(apps.get_model('comments', 'CommentTotal').objects.get().count, 3)
+
+
+class RecordCommentTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='fan')
+
+    def test_create_and_delete(self):
+        comment = Comment.objects.create(user=self.user, match_id='300', content='hi')
+        record_comment(comment, 1)
+        record_comment(comment, 1)
+        record_comment(comment, -1)
+        self.assertEqual(MatchCommentCount.objects.get(match_id='300').count, 1)
+        self.assertEqual(UserCommentCount.objects.get(user=self.user).count, 1)
+        self.assertEqual(comment_total(), 1)
+
+    def test_decrement_stops_at_zero(self):
+        comment = Comment.objects.create(user=self.user, match_id='400', content='hi')
+        record_comment(comment, -1)
+        record_comment(comment, -1)
+        self.assertEqual(MatchCommentCount.objects.get(match_id='400').count, 0)
+        self.assertEqual(UserCommentCount.objects.get(user=self.user).count, 0)
+        self.assertEqual(comment_total(), 0)
+
+    def test_rebuild_counts_every_comment(self):
+        other = User.objects.create(username='other')
+        Comment.objects.create(user=self.user, match_id='500', content='hi')
+        Comment.objects.create(user=other, match_id='600', content='hi')
+        self.assertEqual(comment_total(), 0)
+        self.assertEqual(rebuild_counters(), (2, 2))
+        self.assertEqual(comment_total(), 2)
+
+
+class EnrichmentQueueTests(TestCase):
+    def test_jobs_fetch_at_backfill_priority(self):
+        enqueue_enrichment(500)
+        with mock.patch('apps.comments.enrichment.fetch_match_data', return_value=None) as fetch:
+            self.assertEqual(process_jobs(), (0, 1))
+        fetch.assert_called_once_with('500', priority=PRIORITY_BACKFILL)
+
+    def test_failure_counts_attempts(self):
+        enqueue_enrichment(500)
+        job, = claim_jobs(1)
+        fail_job(job, RuntimeError('upstream down'))
+        self.assertEqual(EnrichmentJob.objects.get(match_id='500').attempts, 1)
+
+    def test_reenqueue_while_running_resets_attempts(self):
+        enqueue_enrichment(500)
+        EnrichmentJob.objects.update(attempts=MAX_ATTEMPTS - 1)
+        job, = claim_jobs(1)
+        enqueue_enrichment(500)
+        fail_job(job, RuntimeError('upstream down'))
+
+        job = EnrichmentJob.objects.get(match_id='500')
+        self.assertEqual(job.attempts, 0)
+        self.assertEqual(job.last_error, 'upstream down')
+
+
+def fake_match_data(match_id):
+    return {'homeTeam': {'name': f'Home {match_id}'}, 'awayTeam': {'name': f'Away {match_id}'}, 'status': 'FINISHED'}
+
+
+# TransactionTestCase, so queries are counted as they run in production:
+# without the savepoints TestCase wraps around every atomic block.
+class CommentQueryBudgetTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        encoded_cache.clear()
+        self.user = User.objects.create(username='fan')
+        other = User.objects.create(username='other')
+        known = MatchSnapshot.objects.create(match_id='1', home_team_name='Home', away_team_name='Away')
+        for i in range(5):
+            record_comment(Comment.objects.create(user=self.user, match_id='1', content='hi', snapshot=known), 1)
+            # Unknown matches make the feed fetch and link snapshots.
+            record_comment(Comment.objects.create(user=other, match_id=str(100 + i), content='hi'), 1)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.user).key)
+
+        patcher = mock.patch('apps.comments.match_details.fetch_match_data', fake_match_data)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_comment_list(self):
+        with endpoint_budget('comment-list'):
+            response = self.client.get('/api/comments/1/')
+        self.assertEqual(len(response.json()), 5)
+
+    def test_comment_list_all(self):
+        with endpoint_budget('comment-list-all'):
+            response = self.client.get('/api/comments/')
+        self.assertEqual(response.json()['total'], 10)
+
+        with endpoint_budget('comment-list-all'):
+            response = self.client.get('/api/comments/?cursor=&page_size=3')
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_user_comments(self):
+        with endpoint_budget('user-comments'):
+            response = self.client.get('/api/comments/user/')
+        self.assertEqual(len(response.json()), 5)
+
+    def test_user_comments_by_username(self):
+        with endpoint_budget('user-comments-by-username'):
+            response = self.client.get('/api/comments/user/other/')
+        self.assertEqual(len(response.json()), 5)
@@ -7,4 +7,5 @@ urlpatterns = [
     path('user/<str:username>/', views.user_comments_by_username, name='user-comments-by-username'),
     path('', views.comment_list_all, name='comment-list-all'),
     path('delete/<int:comment_id>/', views.delete_comment, name='delete-comment'),
+    path('enrichment-stats/', views.enrichment_stats, name='enrichment-stats'),
 ]
\ No newline at end of file
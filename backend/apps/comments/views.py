@@ -2,16 +2,22 @@ from django.shortcuts import render
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from .models import Comment
+from .models import Comment, MatchSnapshot
 from rest_framework import serializers
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authentication import TokenAuthentication
 from django.contrib.auth.models import User
-import requests
+from django.db import transaction
+from django.db.models import Count, Max
 import os
 import json
-from django.utils.timezone import make_aware
-from datetime import datetime
+from apps.core.etags import etag_matches, make_etag, negotiated_etag, not_modified, with_etag
+from apps.core.renderers import PreRenderedJSON
+from apps.matches.cache import encoded_body
+from .counters import comment_total, record_comment
+from .enrichment import enqueue_enrichment, queue_stats
+from .match_details import prefetch_match_details
+from .pagination import MAX_PAGE_SIZE, keyset_page
 
 class CommentSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
@@ -23,6 +29,14 @@ class CommentSerializer(serializers.ModelSerializer):
             'match_id': {'required': False}
         }
 
+class UserCommentListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        comments = list(data.all() if hasattr(data, 'all') else data)
+        prefetch_match_details(comments)
+        for comment in comments:
+            comment.match_details_prefetched = True
+        return super().to_representation(comments)
+
 class UserCommentSerializer(serializers.ModelSerializer):
     username = serializers.CharField(source='user.username', read_only=True)
     match_details = serializers.SerializerMethodField()
@@ -30,60 +44,18 @@ class UserCommentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ['id', 'match_id', 'content', 'created_at', 'username', 'match_details']
+        list_serializer_class = UserCommentListSerializer
     
     def get_match_details(self, obj):
+        if not getattr(obj, 'match_details_prefetched', False):
+            prefetch_match_details([obj])
+
         stored_details = obj.get_match_details()
         if stored_details:
             return stored_details
             
-        match_id = obj.match_id
-        try:
-            FOOTBALL_API_URL = 'https://api.football-data.org/v4'
-            FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
-            
-            response = requests.get(
-                f'{FOOTBALL_API_URL}/matches/{match_id}',
-                headers={'X-Auth-Token': FOOTBALL_API_KEY}
-            )
-            
-            if response.status_code == 200:
-                match_data = response.json()
-                
-                obj.match_home_team_name = match_data.get('homeTeam', {}).get('name', 'Unknown Team')
-                obj.match_home_team_shortname = match_data.get('homeTeam', {}).get('shortName', obj.match_home_team_name)
-                obj.match_home_team_crest = match_data.get('homeTeam', {}).get('crest', '')
-                
-                obj.match_away_team_name = match_data.get('awayTeam', {}).get('name', 'Unknown Team')
-                obj.match_away_team_shortname = match_data.get('awayTeam', {}).get('shortName', obj.match_away_team_name)
-                obj.match_away_team_crest = match_data.get('awayTeam', {}).get('crest', '')
-                
-                obj.match_competition_name = match_data.get('competition', {}).get('name', 'Unknown')
-                obj.match_competition_id = match_data.get('competition', {}).get('id', 0)
-                
-                if match_data.get('utcDate'):
-                    try:
-                        utc_date = datetime.strptime(match_data.get('utcDate'), '%Y-%m-%dT%H:%M:%SZ')
-                        obj.match_date = make_aware(utc_date)
-                    except Exception as e:
-                        print(f"Error parsing date: {e}")
-                    
-                obj.match_status = match_data.get('status', 'UNKNOWN')
-                
-                try:
-                    score_data = match_data.get('score', {"fullTime": {"home": 0, "away": 0}})
-                    obj.match_score = json.dumps(score_data)
-                except Exception as e:
-                    print(f"Error storing score data: {e}")
-                    obj.match_score = json.dumps({"fullTime": {"home": 0, "away": 0}})
-                    
-                obj.save()
-                
-                return obj.get_match_details()
-        except Exception as e:
-            print(f"Error fetching match details: {e}")
-            
         return {
-            'id': match_id,
+            'id': obj.match_id,
             'homeTeam': {'name': 'Unknown Team', 'shortName': 'UNK', 'crest': ''},
             'awayTeam': {'name': 'Unknown Team', 'shortName': 'UNK', 'crest': ''},
             'competition': {'id': 0, 'name': 'Unknown'},
@@ -95,9 +67,15 @@ class UserCommentSerializer(serializers.ModelSerializer):
 @api_view(['GET', 'POST'])
 def comment_list(request, match_id):
     if request.method == 'GET':
-        comments = Comment.objects.filter(match_id=match_id).order_by('-created_at')
+        comments = Comment.objects.filter(match_id=match_id).select_related('user').order_by('-created_at')
+        
+        version = comments.aggregate(count=Count('id'), last_id=Max('id'))
+        etag = negotiated_etag(request, make_etag('comment-list', match_id, version['count'], version['last_id']))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
         serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        return with_etag(Response(serializer.data), etag)
     
     elif request.method == 'POST':
         if not request.user.is_authenticated:
@@ -105,44 +83,12 @@ def comment_list(request, match_id):
         
         serializer = CommentSerializer(data=request.data)
         if serializer.is_valid():
-            comment = serializer.save(user=request.user, match_id=match_id)
-            
-            try:
-                FOOTBALL_API_URL = 'https://api.football-data.org/v4'
-                FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
-                
-                response = requests.get(
-                    f'{FOOTBALL_API_URL}/matches/{match_id}',
-                    headers={'X-Auth-Token': FOOTBALL_API_KEY}
-                )
-                
-                if response.status_code == 200:
-                    match_data = response.json()
-                    
-                    comment.match_home_team_name = match_data.get('homeTeam', {}).get('name', 'Unknown Team')
-                    comment.match_home_team_shortname = match_data.get('homeTeam', {}).get('shortName', comment.match_home_team_name)
-                    comment.match_home_team_crest = match_data.get('homeTeam', {}).get('crest', '')
-                    
-                    comment.match_away_team_name = match_data.get('awayTeam', {}).get('name', 'Unknown Team')
-                    comment.match_away_team_shortname = match_data.get('awayTeam', {}).get('shortName', comment.match_away_team_name)
-                    comment.match_away_team_crest = match_data.get('awayTeam', {}).get('crest', '')
-                    
-                    comment.match_competition_name = match_data.get('competition', {}).get('name', 'Unknown')
-                    comment.match_competition_id = match_data.get('competition', {}).get('id', 0)
-                    
-                    if match_data.get('utcDate'):
-                        try:
-                            utc_date = datetime.strptime(match_data.get('utcDate'), '%Y-%m-%dT%H:%M:%SZ')
-                            comment.match_date = make_aware(utc_date)
-                        except Exception as e:
-                            print(f"Error parsing date: {e}")
-                    
-                    comment.match_status = match_data.get('status', 'UNKNOWN')
-                    score_data = match_data.get('score', {"fullTime": {"home": 0, "away": 0}})
-                    comment.match_score = json.dumps(score_data)
-                    comment.save()
-            except Exception as e:
-                print(f"Error storing match details for comment: {e}")
+            # Link to what we already know and let the enrichment worker refresh it.
+            snapshot = MatchSnapshot.objects.filter(match_id=str(match_id)).first()
+            with transaction.atomic():
+                comment = serializer.save(user=request.user, match_id=match_id, snapshot=snapshot)
+                record_comment(comment, 1)
+            enqueue_enrichment(match_id)
             
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -150,30 +96,59 @@ def comment_list(request, match_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_comments(request):
-    comments = Comment.objects.filter(user=request.user).order_by('-created_at')
+    comments = Comment.objects.filter(user=request.user).select_related('user', 'snapshot').order_by('-created_at')
     serializer = UserCommentSerializer(comments, many=True)
     return Response(serializer.data)
 
 @api_view(['GET'])
 def comment_list_all(request):
-    page_size = int(request.query_params.get('page_size', 20))
-    page = int(request.query_params.get('page', 1))
-    
-    offset = (page - 1) * page_size
-    
-    comments = Comment.objects.all().order_by('-created_at')[offset:offset+page_size]
-    
-    serializer = UserCommentSerializer(comments, many=True)
+    try:
+        page_size = min(int(request.query_params.get('page_size', 20)), MAX_PAGE_SIZE)
+        page = int(request.query_params.get('page', 1))
+    except ValueError:
+        return Response({"detail": "page and page_size must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+    if page_size < 1 or page < 1:
+        return Response({"detail": "page and page_size must be positive"}, status=status.HTTP_400_BAD_REQUEST)
 
-    total_comments = Comment.objects.count()
-    
-    return Response({
-        'results': serializer.data,
-        'page': page,
-        'page_size': page_size,
-        'total': total_comments,
-        'total_pages': (total_comments + page_size - 1) // page_size
+    comments = Comment.objects.select_related('user', 'snapshot')
+    total_comments = comment_total()
+
+    cursor = request.query_params.get('cursor')
+    if cursor is not None:
+        try:
+            feed_page = keyset_page(comments, cursor, page_size)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        rows = feed_page['rows']
+        payload = {
+            'page_size': page_size,
+            'next_cursor': feed_page['next_cursor'],
+            'prev_cursor': feed_page['prev_cursor'],
+            'total': total_comments,
+        }
+    else:
+        offset = (page - 1) * page_size
+        rows = list(comments.order_by('-created_at', '-id')[offset:offset+page_size])
+        payload = {
+            'page': page,
+            'page_size': page_size,
+            'total': total_comments,
+            'total_pages': (total_comments + page_size - 1) // page_size
+        }
+
+    # Validate against the rows on this page instead of aggregating the whole table.
+    etag = negotiated_etag(request, make_etag('comment-list-all', payload, [
+        (comment.id, comment.snapshot_id, comment.snapshot.updated_at if comment.snapshot_id else None)
+        for comment in rows
+    ]))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    body = encoded_body('comment-list-all', etag, lambda: {
+        'results': UserCommentSerializer(rows, many=True).data,
+        **payload,
     })
+    return with_etag(Response(PreRenderedJSON(body)), etag)
     
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
@@ -187,7 +162,9 @@ def delete_comment(request, comment_id):
                 status=status.HTTP_403_FORBIDDEN
             )
             
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
+            record_comment(comment, -1)
         return Response(status=status.HTTP_204_NO_CONTENT)
     except Comment.DoesNotExist:
         return Response(
@@ -199,8 +176,12 @@ def delete_comment(request, comment_id):
 def user_comments_by_username(request, username):
     try:
         user = User.objects.get(username=username)
-        comments = Comment.objects.filter(user=user).order_by('-created_at')
+        comments = Comment.objects.filter(user=user).select_related('user', 'snapshot').order_by('-created_at')
         serializer = UserCommentSerializer(comments, many=True)
         return Response(serializer.data)
     except User.DoesNotExist:
-        return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+@api_view(['GET'])
+def enrichment_stats(request):
+    return Response(queue_stats())
@@ -0,0 +1,86 @@
+import gzip
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSION_SETTINGS = getattr(settings, 'COMPRESSION', {})
+
+MIN_SIZE = COMPRESSION_SETTINGS.get('MIN_SIZE', 1024)
+GZIP_LEVEL = COMPRESSION_SETTINGS.get('GZIP_LEVEL', 6)
+BROTLI_QUALITY = COMPRESSION_SETTINGS.get('BROTLI_QUALITY', 5)
+CACHE_ENTRIES = COMPRESSION_SETTINGS.get('CACHE_ENTRIES', 256)
+
+
+def gzip_compress(content):
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def brotli_compress(content):
+    return brotli.compress(content, quality=BROTLI_QUALITY)
+
+
+COMPRESSORS = {'gzip': gzip_compress}
+if brotli is not None:
+    COMPRESSORS['br'] = brotli_compress
+
+# Preferred first when the client weights them equally.
+PREFERENCE = ('br', 'gzip')
+
+
+def negotiate_encoding(header):
+    weights = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in PREFERENCE:
+        if coding not in COMPRESSORS:
+            continue
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressedBodyCache:
+    def __init__(self, max_entries=CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, etag, encoding):
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+            return body
+
+    def set(self, etag, encoding, body):
+        with self._lock:
+            self._entries[(etag, encoding)] = body
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+compressed_cache = CompressedBodyCache()
@@ -0,0 +1,10 @@
+from django.db import connections, router
+
+
+def upsert_options(model, unique_fields, update_fields):
+    """bulk_create() keyword arguments that update rows already present."""
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    # MySQL upserts on any unique key and rejects an explicit conflict target.
+    if connections[router.db_for_write(model)].features.supports_update_conflicts_with_target:
+        options['unique_fields'] = unique_fields
+    return options
@@ -0,0 +1,46 @@
+import hashlib
+import json
+
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+
+def content_etag(content):
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return quote_etag(hashlib.sha1(content).hexdigest())
+
+
+def make_etag(*parts):
+    return content_etag(json.dumps(parts, default=str, separators=(',', ':')))
+
+
+def negotiated_etag(request, etag):
+    # The browsable API renders the same data as HTML. It gets its own ETag so
+    # it never shares a validator, or a cached body, with the JSON response.
+    renderer = getattr(request, 'accepted_renderer', None)
+    if not etag or renderer is None or renderer.format == 'json':
+        return etag
+    return make_etag(etag, renderer.media_type)
+
+
+def etag_matches(request, etag):
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header or not etag:
+        return False
+
+    etags = parse_etags(header)
+    # If-None-Match uses the weak comparison function.
+    return '*' in etags or etag in etags or f'W/{etag}' in etags
+
+
+def not_modified(etag):
+    response = HttpResponseNotModified()
+    response['ETag'] = etag
+    return response
+
+
+def with_etag(response, etag):
+    if etag:
+        response['ETag'] = etag
+    return response
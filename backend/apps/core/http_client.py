@@ -0,0 +1,197 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .metrics import add_timing, registry
+
+HTTP_CLIENT_SETTINGS = getattr(settings, 'HTTP_CLIENT', {})
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36'
+
+DEFAULT_TIMEOUT = HTTP_CLIENT_SETTINGS.get('DEFAULT_TIMEOUT', (3.05, 10))
+PROVIDER_TIMEOUTS = HTTP_CLIENT_SETTINGS.get('TIMEOUTS', {})
+POOL_MAXSIZE = HTTP_CLIENT_SETTINGS.get('POOL_MAXSIZE', 20)
+MAX_RETRIES = HTTP_CLIENT_SETTINGS.get('MAX_RETRIES', 2)
+BACKOFF_FACTOR = HTTP_CLIENT_SETTINGS.get('BACKOFF_FACTOR', 0.3)
+BACKOFF_JITTER = HTTP_CLIENT_SETTINGS.get('BACKOFF_JITTER', 0.3)
+RETRY_STATUSES = (502, 503, 504)
+# Hosts outside the configured providers (fetch-source takes any URL) share
+# one session and one metrics label, so neither grows with user input.
+OTHER_HOST = 'other'
+
+
+def backoff_delay(attempt):
+    return BACKOFF_FACTOR * (2 ** attempt) + random.uniform(0, BACKOFF_JITTER)
+
+
+def normalize_timeout(timeout):
+    # (connect, read) as requests takes it; a single number applies to both.
+    if isinstance(timeout, (int, float)):
+        return (timeout, timeout)
+    connect_timeout, read_timeout = timeout
+    return (connect_timeout, read_timeout)
+
+
+class HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms, error):
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.total_ms += elapsed_ms
+        self.last_ms = elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.min_ms = elapsed_ms if self.min_ms is None else min(self.min_ms, elapsed_ms)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'avg_ms': round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            'min_ms': round(self.min_ms or 0.0, 2),
+            'max_ms': round(self.max_ms, 2),
+            'last_ms': round(self.last_ms, 2),
+        }
+
+
+class OutboundClient:
+    def __init__(self, hosts=PROVIDER_TIMEOUTS):
+        self._hosts = set(hosts)
+        self._sessions = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def register_host(self, host):
+        with self._lock:
+            self._hosts.add(host)
+
+    def host_key(self, host):
+        return host if host in self._hosts else OTHER_HOST
+
+    def _build_session(self, retry_requests):
+        # Without retry_requests only failed connects are retried: the
+        # request never reached the server. Callers that pay per request
+        # (the football-data quota) retry themselves.
+        attempts = MAX_RETRIES if retry_requests else 0
+        retry = Retry(
+            total=MAX_RETRIES,
+            connect=MAX_RETRIES,
+            read=attempts,
+            status=attempts,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=BACKOFF_FACTOR,
+            backoff_jitter=BACKOFF_JITTER,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+        session = requests.Session()
+        session.headers['User-Agent'] = USER_AGENT
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session_for(self, host, retry=True):
+        host = self.host_key(host)
+        with self._lock:
+            session = self._sessions.get((host, retry))
+            if session is None:
+                session = self._build_session(retry)
+                self._sessions[(host, retry)] = session
+                self._stats.setdefault(host, HostStats())
+            return session
+
+    def timeout_for(self, host, timeout=None):
+        return normalize_timeout(timeout or PROVIDER_TIMEOUTS.get(host, DEFAULT_TIMEOUT))
+
+    def get(self, url, timeout=None, retry=True, **kwargs):
+        host = urlsplit(url).hostname or ''
+        session = self.session_for(host, retry)
+        started = time.perf_counter()
+        try:
+            response = session.get(url, timeout=self.timeout_for(host, timeout), **kwargs)
+        except requests.RequestException:
+            self.record(host, started, error=True)
+            raise
+
+        self.record(host, started, error=response.status_code >= 500)
+        return response
+
+    def record(self, host, started, error):
+        host = self.host_key(host)
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats.setdefault(host, HostStats()).record(elapsed * 1000, error)
+
+        add_timing('upstream', elapsed)
+        registry.inc('upstream_requests_total', host=host)
+        if error:
+            registry.inc('upstream_errors_total', host=host)
+        registry.observe('upstream_request_duration_seconds', elapsed, host=host)
+
+    def stats(self):
+        with self._lock:
+            return {host: host_stats.as_dict() for host, host_stats in self._stats.items()}
+
+
+class AsyncOutboundClient:
+    def __init__(self, stats_client):
+        # httpx clients are bound to the event loop they were created on.
+        self._clients = weakref.WeakKeyDictionary()
+        self._stats_client = stats_client
+
+    def _client_for_running_loop(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                headers={'User-Agent': USER_AGENT},
+                limits=httpx.Limits(max_keepalive_connections=POOL_MAXSIZE),
+                follow_redirects=True,
+            )
+            self._clients[loop] = client
+        return client
+
+    async def get(self, url, timeout=None, retry=True, **kwargs):
+        host = urlsplit(url).hostname or ''
+        connect_timeout, read_timeout = self._stats_client.timeout_for(host, timeout)
+        client = self._client_for_running_loop()
+        # Same policy as the sync sessions: without retry only connects are retried.
+        retry_errors = httpx.TransportError if retry else (httpx.ConnectError, httpx.ConnectTimeout)
+
+        for attempt in range(MAX_RETRIES + 1):
+            is_last_attempt = attempt == MAX_RETRIES
+            started = time.perf_counter()
+            try:
+                response = await client.get(url, timeout=httpx.Timeout(read_timeout, connect=connect_timeout), **kwargs)
+            except httpx.TransportError as e:
+                self._stats_client.record(host, started, error=True)
+                if is_last_attempt or not isinstance(e, retry_errors):
+                    raise
+            else:
+                self._stats_client.record(host, started, error=response.status_code >= 500)
+                if not retry or response.status_code not in RETRY_STATUSES or is_last_attempt:
+                    return response
+
+            await asyncio.sleep(backoff_delay(attempt))
+
+
+http_client = OutboundClient()
+async_http_client = AsyncOutboundClient(http_client)
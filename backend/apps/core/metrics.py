@@ -0,0 +1,220 @@
+import contextvars
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+METRICS_SETTINGS = getattr(settings, 'METRICS', {})
+
+METRICS_DIR = METRICS_SETTINGS.get('DIR') or os.path.join(tempfile.gettempdir(), 'ninetyplus-metrics')
+FLUSH_INTERVAL = METRICS_SETTINGS.get('FLUSH_INTERVAL', 1.0)
+BUCKETS = METRICS_SETTINGS.get('BUCKETS', (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+
+HELP = {
+    'http_requests_total': ('counter', 'Requests served, by endpoint, method and status class'),
+    'http_request_duration_seconds': ('histogram', 'End-to-end request latency by endpoint'),
+    'http_request_db_seconds': ('histogram', 'DB time spent per request by endpoint'),
+    'db_queries_total': ('counter', 'SQL queries executed, by endpoint'),
+    'upstream_requests_total': ('counter', 'Outbound HTTP calls by host'),
+    'upstream_errors_total': ('counter', 'Outbound HTTP calls that failed or returned 5xx, by host'),
+    'upstream_request_duration_seconds': ('histogram', 'Outbound HTTP latency by host'),
+    'parse_duration_seconds': ('histogram', 'HTML parse time by document and parser backend'),
+    'render_duration_seconds': ('histogram', 'Response serialization time by renderer'),
+    'cache_lookups_total': ('counter', 'In-process cache lookups by cache and result'),
+    'cache_evictions_total': ('counter', 'In-process cache evictions by cache'),
+    'cache_hit_ratio': ('gauge', 'Fresh hits over lookups, summed over all workers'),
+}
+
+# Per-request phase durations, reported in the Server-Timing header.
+request_timings = contextvars.ContextVar('request_timings', default=None)
+
+
+def _key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class MetricsRegistry:
+    """Process-local metrics, periodically written to METRICS_DIR so any
+    worker can serve the sum over every live worker on /metrics."""
+
+    def __init__(self, metrics_dir=METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._counters = {}
+        self._histograms = {}
+        self._caches = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+    def inc(self, name, value=1, **labels):
+        key = (name, _key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+    def register_cache(self, name, cache):
+        self._caches[name] = cache
+
+    def snapshot(self):
+        with self._lock:
+            counters = [[name, list(labels), value] for (name, labels), value in self._counters.items()]
+            histograms = [[name, list(labels), dict(histogram, buckets=list(histogram['buckets']))]
+                          for (name, labels), histogram in self._histograms.items()]
+
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            for result, value in (('hit', stats['hits']), ('miss', stats['misses']), ('stale', stats['stale_hits'])):
+                counters.append(['cache_lookups_total', [['cache', name], ['result', result]], value])
+            counters.append(['cache_evictions_total', [['cache', name]], stats['evictions']])
+
+        return {'pid': os.getpid(), 'counters': counters, 'histograms': histograms}
+
+    def _path_for(self, pid):
+        return os.path.join(self.metrics_dir, f'metrics-{pid}.json')
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_flush < FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+
+        try:
+            os.makedirs(self.metrics_dir, exist_ok=True)
+            path = self._path_for(os.getpid())
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
+
+    def _worker_snapshots(self):
+        snapshots = [self.snapshot()]
+        for path in glob.glob(os.path.join(self.metrics_dir, 'metrics-*.json')):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if snapshot.get('pid') == os.getpid():
+                continue
+            if not _pid_alive(snapshot.get('pid')):
+                # Only workers that are still running are reported.
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(snapshot)
+        return snapshots
+
+    def collect(self):
+        counters = {}
+        histograms = {}
+        for snapshot in self._worker_snapshots():
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(tuple(label) for label in labels))
+                counters[key] = counters.get(key, 0) + value
+            for name, labels, histogram in snapshot['histograms']:
+                key = (name, tuple(tuple(label) for label in labels))
+                merged = histograms.setdefault(key, {'buckets': [0] * len(BUCKETS), 'sum': 0.0, 'count': 0})
+                merged['buckets'] = [a + b for a, b in zip(merged['buckets'], histogram['buckets'])]
+                merged['sum'] += histogram['sum']
+                merged['count'] += histogram['count']
+        return counters, histograms
+
+    def render(self):
+        counters, histograms = self.collect()
+
+        gauges = {}
+        lookups = {}
+        for (name, labels), value in counters.items():
+            if name == 'cache_lookups_total':
+                label_dict = dict(labels)
+                totals = lookups.setdefault(label_dict['cache'], {'hit': 0, 'all': 0})
+                totals['all'] += value
+                if label_dict['result'] == 'hit':
+                    totals['hit'] += value
+        for cache_name, totals in lookups.items():
+            ratio = totals['hit'] / totals['all'] if totals['all'] else 0.0
+            gauges[('cache_hit_ratio', (('cache', cache_name),))] = round(ratio, 4)
+
+        lines = []
+        for name, (kind, description) in HELP.items():
+            series = {**counters, **gauges} if kind != 'histogram' else histograms
+            rows = sorted((labels, value) for (series_name, labels), value in series.items() if series_name == name)
+            if not rows:
+                continue
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in rows:
+                if kind == 'histogram':
+                    for bound, count in zip(BUCKETS, value['buckets']):
+                        lines.append(f'{name}_bucket{_format_labels(labels + (("le", str(bound)),))} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(labels + (("le", "+Inf"),))} {value["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(labels)} {round(value["sum"], 6)}')
+                    lines.append(f'{name}_count{_format_labels(labels)} {value["count"]}')
+                else:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def add_timing(phase, seconds):
+    timings = request_timings.get()
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase, metric, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        add_timing(phase, elapsed)
+        registry.observe(metric, elapsed, **labels)
+
+
+def server_timing(timings):
+    return ', '.join(f'{phase};dur={seconds * 1000:.1f}' for phase, seconds in timings.items())
+
+
+registry = MetricsRegistry()
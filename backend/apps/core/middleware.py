@@ -0,0 +1,167 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from .compression import COMPRESSORS, MIN_SIZE, compressed_cache, negotiate_encoding
+from .metrics import add_timing, registry, request_timings, server_timing
+from .queries import QueryRecorder, budget_for
+
+
+class QueryCountMiddleware:
+    # Debug-only: reports SQL query count and DB time per request and warns
+    # when an endpoint goes over its budget in settings.QUERY_BUDGETS.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.DEBUG:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        with recorder.install():
+            response = self.get_response(request)
+        return self.report(request, response, recorder)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        async with recorder.install_async():
+            response = await self.get_response(request)
+        return self.report(request, response, recorder)
+
+    def report(self, request, response, recorder):
+        response['X-DB-Query-Count'] = str(recorder.count)
+        response['X-DB-Time-Ms'] = str(recorder.duration_ms)
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        budget = budget_for(url_name)
+        if budget is not None:
+            response['X-DB-Query-Budget'] = str(budget)
+            if recorder.count > budget:
+                print(f"Query budget exceeded for {url_name}: {recorder.count} queries (budget {budget})")
+        return response
+
+
+def endpoint_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.view_name or 'unnamed'
+
+
+class MetricsMiddleware:
+    # Latency, DB time and per-phase timings for every request: recorded into
+    # the shared metrics registry and returned in a Server-Timing header.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = request_timings.set({})
+        started = time.perf_counter()
+        try:
+            recorder = QueryRecorder(keep_statements=False)
+            with recorder.install():
+                response = self.get_response(request)
+            return self.record(request, response, recorder, started)
+        finally:
+            request_timings.reset(token)
+
+    async def __acall__(self, request):
+        token = request_timings.set({})
+        started = time.perf_counter()
+        try:
+            recorder = QueryRecorder(keep_statements=False)
+            async with recorder.install_async():
+                response = await self.get_response(request)
+            return self.record(request, response, recorder, started)
+        finally:
+            request_timings.reset(token)
+
+    def record(self, request, response, recorder, started):
+        elapsed = time.perf_counter() - started
+        endpoint = endpoint_name(request)
+
+        registry.inc('http_requests_total', endpoint=endpoint, method=request.method,
+                     status=f'{response.status_code // 100}xx')
+        registry.observe('http_request_duration_seconds', elapsed, endpoint=endpoint)
+        registry.observe('http_request_db_seconds', recorder.duration, endpoint=endpoint)
+        registry.inc('db_queries_total', recorder.count, endpoint=endpoint)
+        registry.flush()
+
+        timings = {'db': recorder.duration, **request_timings.get(), 'total': elapsed}
+        response['Server-Timing'] = server_timing(timings)
+        return response
+
+
+class CompressionMiddleware:
+    # gzip, or brotli when the client accepts it and the package is installed,
+    # for bodies over MIN_SIZE. Event streams are never buffered or compressed.
+    # Compressed bodies of ETagged responses are kept, so a repeated payload is
+    # compressed once.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.compress(request, await self.get_response(request))
+
+    def compress(self, request, response):
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or response.status_code != 200
+            or len(response.content) < MIN_SIZE
+            or response.get('Content-Type', '').startswith('text/event-stream')
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        started = time.perf_counter()
+        etag = response.get('ETag')
+        body = compressed_cache.get(etag, encoding) if etag else None
+        if body is None:
+            body = COMPRESSORS[encoding](response.content)
+            if etag:
+                compressed_cache.set(etag, encoding, body)
+        add_timing('compress', time.perf_counter() - started)
+
+        if len(body) >= len(response.content):
+            return response
+
+        response.content = body
+        response['Content-Length'] = str(len(body))
+        response['Content-Encoding'] = encoding
+        if etag and not etag.startswith('W/'):
+            # The encoded bytes differ from the identity ones.
+            response['ETag'] = f'W/{etag}'
+        return response
@@ -0,0 +1,55 @@
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.db import connections
+
+QUERY_BUDGETS = getattr(settings, 'QUERY_BUDGETS', {})
+
+
+class QueryRecorder:
+    def __init__(self, using=None, keep_statements=True):
+        self.using = using
+        self.keep_statements = keep_statements
+        self.count = 0
+        self.duration = 0.0
+        self.statements = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            if self.keep_statements:
+                self.statements.append(sql)
+
+    @property
+    def duration_ms(self):
+        return round(self.duration * 1000, 2)
+
+    @contextmanager
+    def install(self):
+        aliases = [self.using] if self.using else list(connections)
+        with ExitStack() as stack:
+            for alias in aliases:
+                stack.enter_context(connections[alias].execute_wrapper(self))
+            yield self
+
+    @asynccontextmanager
+    async def install_async(self):
+        # Connections are per thread; async views query through the request's
+        # thread-sensitive sync_to_async thread, so hook the wrapper in there.
+        installed = self.install()
+        await sync_to_async(installed.__enter__)()
+        try:
+            yield self
+        finally:
+            await sync_to_async(installed.__exit__)(None, None, None)
+
+
+def budget_for(url_name):
+    return QUERY_BUDGETS.get(url_name)
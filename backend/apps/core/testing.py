@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+
+from .queries import QueryRecorder, budget_for
+
+
+@contextmanager
+def query_budget(max_queries, using=None):
+    """Fail if the block runs more than max_queries SQL statements.
+
+        with query_budget(4):
+            client.get('/api/comments/')
+    """
+    recorder = QueryRecorder(using)
+    with recorder.install():
+        yield recorder
+
+    if recorder.count > max_queries:
+        statements = '\n'.join(f'  {sql}' for sql in recorder.statements)
+        raise AssertionError(f'{recorder.count} queries executed, budget is {max_queries}:\n{statements}')
+
+
+def endpoint_budget(url_name, using=None):
+    """query_budget using the per-endpoint limit from settings.QUERY_BUDGETS."""
+    budget = budget_for(url_name)
+    if budget is None:
+        raise KeyError(f'No query budget configured for {url_name}')
+    return query_budget(budget, using)
@@ -0,0 +1,25 @@
+import time
+
+from django.test import SimpleTestCase
+
+from .http_client import OTHER_HOST, OutboundClient
+
+
+class OutboundClientHostTests(SimpleTestCase):
+    def test_unknown_hosts_share_one_session_and_label(self):
+        client = OutboundClient(hosts={'api.football-data.org'})
+        provider = client.session_for('api.football-data.org')
+        first = client.session_for('one.example.com')
+        self.assertIs(client.session_for('two.example.com'), first)
+        self.assertIsNot(provider, first)
+
+        for host in ('one.example.com', 'two.example.com', 'api.football-data.org'):
+            client.record(host, time.perf_counter(), error=False)
+        stats = client.stats()
+        self.assertEqual(sorted(stats), ['api.football-data.org', OTHER_HOST])
+        self.assertEqual(stats[OTHER_HOST]['requests'], 2)
+
+    def test_registered_host_gets_its_own_session(self):
+        client = OutboundClient(hosts=())
+        client.register_host('127.0.0.1')
+        self.assertIsNot(client.session_for('127.0.0.1'), client.session_for('example.com'))
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from .metrics import registry
+
+METRICS_TOKEN = getattr(settings, 'METRICS', {}).get('TOKEN')
+
+
+@require_GET
+def metrics(request):
+    if METRICS_TOKEN and request.headers.get('Authorization') != f'Bearer {METRICS_TOKEN}':
+        return HttpResponse(status=401)
+
+    registry.flush(force=True)
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
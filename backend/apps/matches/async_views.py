@@ -0,0 +1,303 @@
+import asyncio
+import datetime
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from apps.core.http_client import async_http_client
+from .cache import encoded_body, match_ttl, matches_ttl, standings_ttl, team_matches_ttl
+from apps.core.renderers import dumps
+from apps.core.etags import etag_matches, make_etag, not_modified, with_etag
+from apps.comments.counters import match_comment_counts
+from .dates import bg_today, wants_formatted_dates, with_formatted_dates
+from .football_api import football_fetch_async, football_get_async
+from .match_index import MatchQuery, query_matches, shape_payload
+from .live_stream import (
+    KEEPALIVE_INTERVAL,
+    event_stream_response,
+    format_event,
+    live_broadcaster,
+    parse_competitions,
+)
+from .quota import PRIORITY_LIVE, PRIORITY_MATCH_DETAILS, PRIORITY_STANDINGS, QuotaExhausted
+from .scoreboard import get_scoreboard_index_async
+from .scraping import SCRAPE_HEADERS, stream_url_for
+from .streams import stream_index
+from .standings import MAX_COMPETITIONS, parse_competition_ids, standings_batch_async
+from .teams import MAX_RESULTS, team_index
+
+# Async counterparts of the upstream-bound views in views.py. They keep the
+# same URLs and payloads and are routed in when MATCHES_ASYNC_VIEWS is on;
+# live_stream has no sync version and is always served from here.
+
+
+def json_response(data, status=200, headers=None):
+    return HttpResponse(dumps(data), status=status, headers=headers, content_type='application/json')
+
+
+def encoded_response(endpoint, etag, build):
+    body = encoded_body(endpoint, etag, build)
+    return with_etag(HttpResponse(body, content_type='application/json'), etag)
+
+
+def rate_limited_response(error):
+    return json_response({
+        'error': str(error),
+        'retry_after': error.retry_after
+    }, status=429, headers={'Retry-After': str(error.retry_after)})
+
+
+@require_GET
+async def get_matches(request):
+    try:
+        query = MatchQuery.from_request(request)
+        result = await football_fetch_async('/matches', ttl=matches_ttl, priority=PRIORITY_LIVE)
+        matches = query_matches(result.data, result.etag, query)
+        comment_counts = await sync_to_async(match_comment_counts)([match['id'] for match in matches])
+
+        # match_status depends on the current day, so it is part of the validator.
+        today = bg_today() if wants_formatted_dates(request) else None
+        etag = make_etag(result.etag, comment_counts, today, query.key())
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return encoded_response('matches', etag, lambda: {
+            **shape_payload(result.data, matches, query, today),
+            'comment_counts': comment_counts,
+        })
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def live_stream(request):
+    # Each open stream is a long-lived connection; under WSGI it would hold a
+    # worker thread for its whole lifetime, so the route is ASGI only.
+    if not isinstance(request, ASGIRequest):
+        return json_response({'error': 'The live stream is only served under ASGI'}, status=501)
+
+    subscriber = live_broadcaster.subscribe(
+        parse_competitions(request.GET.get('competitions')),
+        loop=asyncio.get_running_loop()
+    )
+
+    async def events():
+        try:
+            yield format_event('snapshot', live_broadcaster.snapshot(subscriber))
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if item is None:
+                    return
+                event, data = item
+                yield format_event(event, data)
+        finally:
+            live_broadcaster.unsubscribe(subscriber)
+
+    return event_stream_response(events())
+
+
+@require_GET
+async def get_standings(request, competition_id=2021):
+    try:
+        result = await football_fetch_async(
+            f'/competitions/{competition_id}/standings',
+            ttl=standings_ttl,
+            priority=PRIORITY_STANDINGS
+        )
+        if etag_matches(request, result.etag):
+            return not_modified(result.etag)
+        return encoded_response('standings', result.etag, lambda: result.data)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def get_standings_batch(request):
+    try:
+        competition_ids = parse_competition_ids(request.GET.get('competitions'))
+        if not competition_ids or len(competition_ids) > MAX_COMPETITIONS:
+            return json_response({'error': f'competitions must list 1 to {MAX_COMPETITIONS} competition ids'}, status=400)
+
+        standings = await standings_batch_async(competition_ids)
+        etag = make_etag([(entry['competition_id'], entry['status'], entry.get('etag')) for entry in standings])
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return with_etag(json_response({'standings': standings}), etag)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def get_match_details(request, match_id):
+    try:
+        result = await football_fetch_async(f'/matches/{match_id}', ttl=match_ttl, priority=PRIORITY_MATCH_DETAILS)
+        comment_count = (await sync_to_async(match_comment_counts)([match_id]))[str(match_id)]
+
+        today = bg_today() if wants_formatted_dates(request) else None
+        etag = make_etag(result.etag, comment_count, today)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return encoded_response('match-details', etag, lambda: {
+            'match': with_formatted_dates(result.data, today) if today else result.data,
+            'comment_count': comment_count,
+        })
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def fetch_site_source(request):
+    try:
+        url = request.GET.get('url')
+
+        if not url:
+            return json_response({
+                'error': 'URL parameter is required',
+            }, status=400)
+
+        response = await async_http_client.get(url, headers=SCRAPE_HEADERS)
+
+        return json_response({
+            'source': response.text,
+            'status': response.status_code,
+            'url': url
+        })
+
+    except Exception as e:
+        return json_response({
+            'error': str(e),
+        }, status=500)
+
+
+@require_GET
+async def get_team_matches(request, team_id):
+    try:
+        query = MatchQuery.from_request(request)
+        today = datetime.datetime.now().strftime('%Y-%m-%d')
+        thirty_days_later = (datetime.datetime.now() + datetime.timedelta(days=30)).strftime('%Y-%m-%d')
+
+        result = await football_fetch_async(
+            f'/teams/{team_id}/matches',
+            params={
+                'dateFrom': today,
+                'dateTo': thirty_days_later,
+                'status': 'SCHEDULED,TIMED'
+            },
+            ttl=team_matches_ttl,
+            priority=PRIORITY_STANDINGS
+        )
+
+        if result.status_code == 200:
+            etag = make_etag(result.etag, query.key())
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return encoded_response('team-matches', etag, lambda: shape_payload(
+                result.data, query_matches(result.data, result.etag, query), query
+            ))
+        return json_response({
+            'error': f"Failed to fetch team matches: {result.status_code}"
+        }, status=result.status_code)
+    except ValueError as e:
+        return json_response({'error': str(e)}, status=400)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def search_teams(request):
+    try:
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return json_response({'error': 'q parameter is required'}, status=400)
+
+        try:
+            limit = max(1, min(int(request.GET.get('limit', MAX_RESULTS)), MAX_RESULTS))
+        except ValueError:
+            limit = MAX_RESULTS
+
+        # Only the first search (before any index exists) waits on standings.
+        teams = await team_index.search_async(query, limit)
+        return json_response({'teams': teams})
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
+
+
+@require_GET
+async def get_stream_embed(request):
+    try:
+        home_team = request.GET.get('home_team')
+        away_team = request.GET.get('away_team')
+        match_date_str = request.GET.get('match_date')
+
+        if not home_team or not away_team or not match_date_str:
+            return json_response({
+                'error': 'home_team, away_team, and match_date parameters are required',
+            }, status=400)
+
+        # Only the first lookup (or a failed refresh) ever waits on the scrape.
+        stream_id = await stream_index.find_stream_id_async(home_team, away_team, match_date_str)
+
+        return json_response({
+            'stream_url': stream_url_for(stream_id) if stream_id else None
+        })
+
+    except Exception as e:
+        return json_response({
+            'error': str(e),
+            'stream_url': None
+        }, status=500)
+
+
+@require_GET
+async def get_match_events(request, match_id):
+    no_events = {'homeTeamEvents': [], 'awayTeamEvents': []}
+    try:
+        status_code, match_data = await football_get_async(f'/matches/{match_id}', ttl=match_ttl, priority=PRIORITY_MATCH_DETAILS)
+
+        if status_code != 200:
+            return json_response({
+                'error': f'Failed to fetch match data: {status_code}'
+            }, status=status_code)
+
+        home_team = match_data.get('homeTeam', {}).get('name', '')
+        away_team = match_data.get('awayTeam', {}).get('name', '')
+
+        match_date = datetime.datetime.fromisoformat(match_data.get('utcDate').replace('Z', '+00:00'))
+        if match_date > datetime.datetime.now(datetime.timezone.utc):
+            return json_response(no_events)
+
+        scoreboard = await get_scoreboard_index_async(match_date)
+
+        if scoreboard is None:
+            return json_response(no_events)
+
+        home_events, away_events = scoreboard.events_for(home_team, away_team)
+
+        return json_response({
+            'homeTeamEvents': home_events,
+            'awayTeamEvents': away_events
+        })
+
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return json_response({'error': str(e)}, status=500)
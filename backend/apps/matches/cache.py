@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+from apps.core.metrics import registry, timed
+from apps.core.renderers import dumps
+
+LIVE_STATUSES = ('IN_PLAY', 'PAUSED')
+FINISHED_STATUSES = ('FINISHED', 'AWARDED')
+
+CACHE_SETTINGS = getattr(settings, 'FOOTBALL_CACHE', {})
+
+LIVE_TTL = CACHE_SETTINGS.get('LIVE_TTL', 15)
+MATCHES_TTL = CACHE_SETTINGS.get('MATCHES_TTL', 60)
+STANDINGS_TTL = CACHE_SETTINGS.get('STANDINGS_TTL', 300)
+TEAM_MATCHES_TTL = CACHE_SETTINGS.get('TEAM_MATCHES_TTL', 600)
+FINISHED_TTL = CACHE_SETTINGS.get('FINISHED_TTL', None)
+MAX_ENTRIES = CACHE_SETTINGS.get('MAX_ENTRIES', 512)
+ENCODED_MAX_ENTRIES = CACHE_SETTINGS.get('ENCODED_MAX_ENTRIES', 128)
+
+
+class ResponseCache:
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.evictions = 0
+
+    def get(self, key, allow_stale=False):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                if not allow_stale:
+                    self.misses += 1
+                    return None
+                self.stale_hits += 1
+            else:
+                self.hits += 1
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def expires_in(self, key):
+        # Seconds of freshness left (negative once stale), without counting as a lookup.
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[1] is None:
+            return None
+        return entry[1] - time.monotonic()
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'stale_hits': self.stale_hits,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+def matches_ttl(data):
+    statuses = {match.get('status') for match in data.get('matches', [])}
+    if statuses.intersection(LIVE_STATUSES):
+        return LIVE_TTL
+    return MATCHES_TTL
+
+
+def match_ttl(data):
+    match_status = data.get('status')
+    if match_status in LIVE_STATUSES:
+        return LIVE_TTL
+    if match_status in FINISHED_STATUSES:
+        return FINISHED_TTL
+    return MATCHES_TTL
+
+
+def standings_ttl(data):
+    return STANDINGS_TTL
+
+
+def team_matches_ttl(data):
+    return TEAM_MATCHES_TTL
+
+
+response_cache = ResponseCache()
+registry.register_cache('football_api', response_cache)
+
+# Encoded response bodies keyed by (endpoint, ETag). The ETag already
+# identifies the body, so a hit skips building and encoding the payload.
+encoded_cache = ResponseCache(max_entries=ENCODED_MAX_ENTRIES)
+registry.register_cache('encoded_responses', encoded_cache)
+
+
+def encoded_body(endpoint, etag, build):
+    key = (endpoint, etag)
+    body = encoded_cache.get(key) if etag else None
+    if body is None:
+        payload = build()
+        with timed('render', 'render_duration_seconds', renderer='encoded'):
+            body = dumps(payload)
+        if etag:
+            encoded_cache.set(key, body)
+    return body
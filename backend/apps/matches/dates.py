@@ -0,0 +1,56 @@
+import datetime
+from functools import lru_cache
+
+import pytz
+
+BG_TIMEZONE = pytz.timezone('Europe/Sofia')
+
+FORMAT_TYPES = ('time_only', 'date_time', 'match_status')
+
+MAX_BULK_DATES = 500
+
+
+@lru_cache(maxsize=4096)
+def parse_utc_date(utc_date_str):
+    utc_date = datetime.datetime.fromisoformat(utc_date_str.replace('Z', '+00:00'))
+    return utc_date.astimezone(BG_TIMEZONE)
+
+
+def bg_today():
+    return datetime.datetime.now(BG_TIMEZONE).date()
+
+
+def format_match_date(utc_date_str, format_type, today=None):
+    bg_date = parse_utc_date(utc_date_str)
+
+    if format_type == 'time_only':
+        return bg_date.strftime('%H:%M')
+    elif format_type == 'date_time':
+        return f"{bg_date.strftime('%d %b')}, {bg_date.strftime('%H:%M')}"
+    elif format_type == 'match_status':
+        today = today or bg_today()
+        tomorrow = today + datetime.timedelta(days=1)
+
+        if bg_date.date() == today:
+            return bg_date.strftime('%H:%M')
+        elif bg_date.date() == tomorrow:
+            return f"Tomorrow, {bg_date.strftime('%H:%M')}"
+        return f"{bg_date.strftime('%d %b')}, {bg_date.strftime('%H:%M')}"
+
+    raise KeyError(format_type)
+
+
+def format_match_dates(utc_date_str, format_types=FORMAT_TYPES, today=None):
+    today = today or bg_today()
+    return {format_type: format_match_date(utc_date_str, format_type, today) for format_type in format_types}
+
+
+def wants_formatted_dates(request):
+    return request.GET.get('formatted', '').lower() in ('1', 'true', 'yes')
+
+
+def with_formatted_dates(match, today):
+    # Upstream payloads are shared with the response cache, never mutate them.
+    if not match.get('utcDate'):
+        return match
+    return {**match, 'formatted_dates': format_match_dates(match['utcDate'], today=today)}
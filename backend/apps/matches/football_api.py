@@ -0,0 +1,119 @@
+import asyncio
+import os
+import time
+from collections import namedtuple
+from urllib.parse import urlencode, urlsplit
+
+from asgiref.sync import sync_to_async
+
+from apps.core.etags import content_etag
+from apps.core.http_client import MAX_RETRIES, RETRY_STATUSES, async_http_client, backoff_delay, http_client
+
+from .cache import MATCHES_TTL, response_cache
+from .quota import PRIORITY_MATCH_DETAILS, QuotaExhausted, quota_scheduler
+from .singleflight import async_upstream_flight, upstream_flight
+
+FOOTBALL_API_URL = os.getenv('FOOTBALL_API_URL', 'https://api.football-data.org/v4')
+FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
+
+http_client.register_host(urlsplit(FOOTBALL_API_URL).hostname)
+
+UpstreamResult = namedtuple('UpstreamResult', ['status_code', 'data', 'etag'])
+
+
+def build_cache_key(path, params=None):
+    if not params:
+        return path
+    return f"{path}?{urlencode(sorted(params.items()))}"
+
+
+def auth_headers():
+    return {'X-Auth-Token': FOOTBALL_API_KEY} if FOOTBALL_API_KEY else {}
+
+
+def _settle(key, result, ttl):
+    if result.status_code == 200:
+        response_cache.set(key, result, ttl(result.data) if ttl else MATCHES_TTL)
+    elif result.status_code == 429:
+        stale = response_cache.get(key, allow_stale=True)
+        if stale is not None:
+            return stale
+
+    return result
+
+
+def _fetch(path, params, priority):
+    # Every request counts against the quota, so 5xx retries happen here with
+    # a token each instead of inside the HTTP client.
+    for attempt in range(MAX_RETRIES + 1):
+        quota_scheduler.acquire(priority)
+        response = http_client.get(
+            f'{FOOTBALL_API_URL}{path}',
+            params=params,
+            headers=auth_headers(),
+            retry=False
+        )
+        quota_scheduler.observe(response)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        time.sleep(backoff_delay(attempt))
+    return UpstreamResult(response.status_code, response.json(), content_etag(response.content))
+
+
+def football_fetch(path, params=None, ttl=None, priority=PRIORITY_MATCH_DETAILS):
+    key = build_cache_key(path, params)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        # Results shared through the file single-flight come back as lists.
+        result = UpstreamResult(*upstream_flight.do(key, lambda: _fetch(path, params, priority)))
+    except QuotaExhausted:
+        stale = response_cache.get(key, allow_stale=True)
+        if stale is not None:
+            return stale
+        raise
+
+    return _settle(key, result, ttl)
+
+
+def football_get(path, params=None, ttl=None, priority=PRIORITY_MATCH_DETAILS):
+    return football_fetch(path, params, ttl, priority)[:2]
+
+
+async def _fetch_async(path, params, priority):
+    for attempt in range(MAX_RETRIES + 1):
+        await sync_to_async(quota_scheduler.acquire, thread_sensitive=False)(priority)
+        response = await async_http_client.get(
+            f'{FOOTBALL_API_URL}{path}',
+            params=params,
+            headers=auth_headers(),
+            retry=False
+        )
+        quota_scheduler.observe(response)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(backoff_delay(attempt))
+    return UpstreamResult(response.status_code, response.json(), content_etag(response.content))
+
+
+async def football_fetch_async(path, params=None, ttl=None, priority=PRIORITY_MATCH_DETAILS):
+    key = build_cache_key(path, params)
+    cached = response_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        result = await async_upstream_flight.do(key, lambda: _fetch_async(path, params, priority))
+    except QuotaExhausted:
+        stale = response_cache.get(key, allow_stale=True)
+        if stale is not None:
+            return stale
+        raise
+
+    return _settle(key, result, ttl)
+
+
+async def football_get_async(path, params=None, ttl=None, priority=PRIORITY_MATCH_DETAILS):
+    return (await football_fetch_async(path, params, ttl, priority))[:2]
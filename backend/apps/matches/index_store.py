@@ -0,0 +1,85 @@
+import threading
+import time
+
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+
+class RefreshingIndexStore:
+    """Serves an in-memory index, rebuilding it in the background once stale.
+
+    Subclasses set ``key`` and ``name`` and implement ``_load``/``_load_async``.
+    """
+
+    key = None
+    name = 'index'
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._index = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+        self._flight = SingleFlight(mode='thread')
+        self._async_flight = AsyncSingleFlight()
+        self.refreshes = 0
+        self.errors = 0
+
+    def ttl_for(self, index):
+        return self.ttl
+
+    def _load(self):
+        raise NotImplementedError
+
+    async def _load_async(self):
+        raise NotImplementedError
+
+    def _refresh_in_background(self):
+        try:
+            self._flight.do(self.key, self._load)
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"Error refreshing {self.name}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    async def _refresh_in_background_async(self):
+        try:
+            return await self._load_async()
+        except Exception as e:
+            with self._lock:
+                self.errors += 1
+            print(f"Error refreshing {self.name}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _claim(self):
+        with self._lock:
+            index = self._index
+            is_stale = index is None or time.time() - index.fetched_at >= self.ttl_for(index)
+            start_refresh = index is not None and is_stale and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+        return index, start_refresh
+
+    def get(self):
+        index, start_refresh = self._claim()
+        if index is None:
+            return self._flight.do(self.key, self._load)
+
+        if start_refresh:
+            thread_name = self.name.replace(' ', '-') + '-refresh'
+            threading.Thread(target=self._refresh_in_background, name=thread_name, daemon=True).start()
+
+        return index
+
+    async def get_async(self):
+        index, start_refresh = self._claim()
+        if index is None:
+            return await self._async_flight.do(self.key, self._load_async)
+
+        if start_refresh:
+            self._async_flight.start(self.key, self._refresh_in_background_async)
+
+        return index
@@ -0,0 +1,102 @@
+import datetime
+
+from django.utils import timezone
+
+from apps.core.db import upsert_options
+from .cache import LIVE_STATUSES, matches_ttl
+from .football_api import football_get
+from .models import Match
+from .quota import PRIORITY_LIVE, PRIORITY_STANDINGS
+
+UPSERT_FIELDS = ['home_team', 'away_team', 'score', 'status', 'date', 'competition_id', 'competition_name', 'updated_at']
+UPCOMING_STATUSES = ('SCHEDULED', 'TIMED')
+# A scheduled match still not marked live this long after kickoff is treated
+# as postponed or abandoned rather than about to start.
+KICKOFF_WINDOW = datetime.timedelta(hours=3)
+
+
+def format_score(score):
+    full_time = (score or {}).get('fullTime') or {}
+    home = full_time.get('home')
+    away = full_time.get('away')
+    if home is None and away is None:
+        return None
+    return f"{home or 0}-{away or 0}"
+
+
+def match_from_payload(data, now):
+    return Match(
+        match_id=str(data['id']),
+        home_team=(data.get('homeTeam') or {}).get('name') or 'Unknown Team',
+        away_team=(data.get('awayTeam') or {}).get('name') or 'Unknown Team',
+        score=format_score(data.get('score')),
+        status=data.get('status') or 'UNKNOWN',
+        date=datetime.datetime.fromisoformat(data['utcDate'].replace('Z', '+00:00')),
+        competition_id=(data.get('competition') or {}).get('id'),
+        competition_name=(data.get('competition') or {}).get('name'),
+        updated_at=now,
+    )
+
+
+def upsert_matches(payloads):
+    now = timezone.now()
+    matches = [match_from_payload(data, now) for data in payloads if data.get('id') and data.get('utcDate')]
+    if not matches:
+        return 0
+
+    Match.objects.bulk_create(matches, batch_size=500, **upsert_options(Match, ['match_id'], UPSERT_FIELDS))
+    return len(matches)
+
+
+def has_live_matches(now=None):
+    now = now or timezone.now()
+    return (
+        Match.objects.filter(status__in=LIVE_STATUSES).exists()
+        or Match.objects.filter(
+            status__in=UPCOMING_STATUSES, date__lte=now, date__gt=now - KICKOFF_WINDOW
+        ).exists()
+    )
+
+
+def ingest_live():
+    was_live = set(Match.objects.filter(status__in=LIVE_STATUSES).values_list('match_id', flat=True))
+    status_code, data = football_get(
+        '/matches',
+        params={'status': ','.join(LIVE_STATUSES)},
+        ttl=matches_ttl,
+        priority=PRIORITY_LIVE
+    )
+    if status_code != 200:
+        raise RuntimeError(f'Failed to fetch live matches: {status_code}')
+    matches = list(data.get('matches', []))
+
+    # Matches that finished since the last poll drop out of the live feed;
+    # fetch them by id so their final score and status are stored.
+    finished = was_live - {str(match.get('id')) for match in matches}
+    if finished:
+        status_code, data = football_get(
+            '/matches',
+            params={'ids': ','.join(sorted(finished))},
+            ttl=matches_ttl,
+            priority=PRIORITY_LIVE
+        )
+        if status_code != 200:
+            raise RuntimeError(f'Failed to fetch finished matches: {status_code}')
+        matches.extend(data.get('matches', []))
+    return upsert_matches(matches)
+
+
+def ingest_window(days_back=1, days_ahead=7):
+    today = timezone.now().date()
+    status_code, data = football_get(
+        '/matches',
+        params={
+            'dateFrom': (today - datetime.timedelta(days=days_back)).isoformat(),
+            'dateTo': (today + datetime.timedelta(days=days_ahead)).isoformat(),
+        },
+        ttl=matches_ttl,
+        priority=PRIORITY_STANDINGS
+    )
+    if status_code != 200:
+        raise RuntimeError(f'Failed to fetch fixtures: {status_code}')
+    return upsert_matches(data.get('matches', []))
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .cache import LIVE_TTL, matches_ttl
+from .football_api import football_get
+from .quota import PRIORITY_LIVE
+
+LIVE_STREAM_SETTINGS = getattr(settings, 'LIVE_STREAM', {})
+
+POLL_INTERVAL = LIVE_STREAM_SETTINGS.get('POLL_INTERVAL', LIVE_TTL)
+KEEPALIVE_INTERVAL = LIVE_STREAM_SETTINGS.get('KEEPALIVE_INTERVAL', 20)
+# Updates a subscriber may fall behind by before it is disconnected.
+QUEUE_SIZE = LIVE_STREAM_SETTINGS.get('QUEUE_SIZE', 32)
+
+
+def parse_competitions(value):
+    if not value:
+        return None
+    return {int(competition_id) for competition_id in value.split(',') if competition_id.strip().isdigit()}
+
+
+def format_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def event_stream_response(events):
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def compact_match(match):
+    return {
+        'id': match.get('id'),
+        'competitionId': (match.get('competition') or {}).get('id'),
+        'status': match.get('status'),
+        'utcDate': match.get('utcDate'),
+        'score': {
+            'fullTime': (match.get('score') or {}).get('fullTime'),
+            'halfTime': (match.get('score') or {}).get('halfTime'),
+        },
+    }
+
+
+class Subscriber:
+    def __init__(self, competitions, loop, queue_size=QUEUE_SIZE):
+        self.competitions = competitions
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=queue_size + 1)
+        self.queue_size = queue_size
+        self.dropped = False
+
+    def wants(self, match):
+        return not self.competitions or match['competitionId'] in self.competitions
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._offer, event)
+        except RuntimeError:
+            pass
+
+    def _offer(self, event):
+        # Runs on the subscriber's loop. A client that can't keep up gets its
+        # backlog discarded and a final None, which ends its stream; the
+        # EventSource reconnects and starts again from a fresh snapshot.
+        if self.dropped:
+            return
+        if self.queue.qsize() < self.queue_size:
+            self.queue.put_nowait(event)
+            return
+        self.dropped = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class LiveScoreBroadcaster:
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self._subscribers = set()
+        self._state = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_poll = None
+        self.dropped = 0
+
+    def subscribe(self, competitions, loop):
+        subscriber = Subscriber(competitions, loop)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='live-score-poller', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            if subscriber.dropped:
+                self.dropped += 1
+
+    def snapshot(self, subscriber):
+        with self._lock:
+            return [match for match in self._state.values() if subscriber.wants(match)]
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    self._thread = None
+                    return
+
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Error polling live scores: {e}")
+
+            time.sleep(self.interval)
+
+    def poll_once(self):
+        status_code, data = football_get('/matches', ttl=matches_ttl, priority=PRIORITY_LIVE)
+        if status_code != 200:
+            return
+
+        # The feed only covers the current window, so state is rebuilt from it
+        # and matches that have rolled out of the feed stop being tracked.
+        state = {}
+        for match in data.get('matches', []):
+            compact = compact_match(match)
+            state[compact['id']] = compact
+        with self._lock:
+            changed = [match for match_id, match in state.items() if self._state.get(match_id) != match]
+            self._state = state
+            subscribers = list(self._subscribers)
+            self.last_poll = time.time()
+
+        if not changed:
+            return
+
+        for subscriber in subscribers:
+            matches = [match for match in changed if subscriber.wants(match)]
+            if matches:
+                subscriber.push(('update', matches))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'subscribers': len(self._subscribers),
+                'tracked_matches': len(self._state),
+                'last_poll': self.last_poll,
+                'dropped_subscribers': self.dropped,
+            }
+
+
+live_broadcaster = LiveScoreBroadcaster()
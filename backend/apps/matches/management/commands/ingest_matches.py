@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.matches.ingest import has_live_matches, ingest_live, ingest_window
+
+
+class Command(BaseCommand):
+    help = 'Poll football-data.org and upsert fixtures into the Match table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--live-interval', type=int, default=30,
+                            help='Seconds between polls while matches are live')
+        parser.add_argument('--interval', type=int, default=600,
+                            help='Seconds between polls of the full fixture window')
+        parser.add_argument('--days-back', type=int, default=1)
+        parser.add_argument('--days-ahead', type=int, default=7)
+        parser.add_argument('--once', action='store_true',
+                            help='Ingest the fixture window once and exit')
+
+    def handle(self, *args, **options):
+        next_window_poll = 0
+
+        while True:
+            if time.monotonic() >= next_window_poll:
+                self.run_step('fixtures', ingest_window, options['days_back'], options['days_ahead'])
+                next_window_poll = time.monotonic() + options['interval']
+            elif has_live_matches():
+                self.run_step('live', ingest_live)
+
+            if options['once']:
+                break
+
+            time.sleep(options['live_interval'])
+
+    def run_step(self, name, fn, *args):
+        started = time.monotonic()
+        try:
+            count = fn(*args)
+        except Exception as e:
+            self.stderr.write(f'{name}: {e}')
+            return
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(f'{name}: upserted {count} matches in {elapsed:.2f}s')
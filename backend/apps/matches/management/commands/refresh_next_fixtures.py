@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.matches.next_fixtures import refresh_due_fixtures
+
+
+class Command(BaseCommand):
+    help = "Refresh the next-fixture index for every user's favorite team"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=int, default=60,
+                            help='Seconds between passes over expired fixtures')
+        parser.add_argument('--once', action='store_true',
+                            help='Refresh expired fixtures once and exit')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            try:
+                refreshed, failed = refresh_due_fixtures()
+            except Exception as e:
+                self.stderr.write(f'next fixtures: {e}')
+                refreshed = failed = 0
+
+            if refreshed or failed:
+                elapsed = time.monotonic() - started
+                self.stdout.write(f'next fixtures: {refreshed} refreshed, {failed} failed in {elapsed:.2f}s')
+
+            if options['once']:
+                break
+
+            time.sleep(options['interval'])
@@ -0,0 +1,186 @@
+import bisect
+import datetime
+
+from .cache import ResponseCache
+from .dates import with_formatted_dates
+
+MATCH_FIELDS = (
+    'id', 'utcDate', 'status', 'matchday', 'stage', 'group', 'lastUpdated', 'area', 'competition',
+    'season', 'homeTeam', 'awayTeam', 'score', 'odds', 'referees',
+)
+
+
+class MatchQuery:
+    """Filters and projection from ?competitions=&status=&exclude_status=
+    &date_from=&date_to=&fields=. Bad values raise ValueError."""
+
+    def __init__(self, competitions=None, statuses=None, exclude_statuses=None, date_from=None, date_to=None,
+                 fields=None):
+        self.competitions = competitions
+        self.statuses = statuses
+        self.exclude_statuses = exclude_statuses
+        self.date_from = date_from
+        self.date_to = date_to
+        self.fields = fields
+
+    @classmethod
+    def from_request(cls, request, known_fields=MATCH_FIELDS):
+        params = request.GET
+        return cls(
+            competitions=_ids(params.get('competitions')),
+            statuses=_names(params.get('status')),
+            exclude_statuses=_names(params.get('exclude_status')),
+            date_from=_date_bound(params.get('date_from'), end=False),
+            date_to=_date_bound(params.get('date_to'), end=True),
+            fields=_field_tree(params.get('fields'), known_fields),
+        )
+
+    def filters(self):
+        return any(self.key()[:5])
+
+    def key(self):
+        return (
+            sorted(self.competitions) if self.competitions else None,
+            sorted(self.statuses) if self.statuses else None,
+            sorted(self.exclude_statuses) if self.exclude_statuses else None,
+            self.date_from,
+            self.date_to,
+            self.fields,
+        )
+
+
+def _ids(value):
+    if not value:
+        return None
+    try:
+        return {int(part) for part in value.split(',') if part.strip()}
+    except ValueError:
+        raise ValueError('competitions must be a comma-separated list of ids')
+
+
+def _names(value):
+    if not value:
+        return None
+    return {part.strip().upper() for part in value.split(',') if part.strip()}
+
+
+def _date_bound(value, end):
+    if not value:
+        return None
+    try:
+        if len(value) == 10:
+            day = datetime.date.fromisoformat(value)
+            if end:
+                # A bare date_to covers the whole day.
+                day += datetime.timedelta(days=1)
+            moment = datetime.datetime.combine(day, datetime.time(), datetime.timezone.utc)
+        else:
+            moment = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=datetime.timezone.utc)
+    except ValueError:
+        raise ValueError(f'Invalid date: {value}')
+    # utcDate is always "YYYY-MM-DDTHH:MM:SSZ", so bounds compare as strings.
+    return moment.astimezone(datetime.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _field_tree(value, known_fields):
+    # homeTeam.crest,score.fullTime,id -> nested (name, children) tuples;
+    # children of None means the whole value.
+    if not value:
+        return None
+    tree = {}
+    for path in (part.strip() for part in value.split(',')):
+        if not path:
+            continue
+        names = path.split('.')
+        if names[0] not in known_fields:
+            raise ValueError(f"Unknown field: {names[0]}")
+        node = tree
+        for name in names[:-1]:
+            if name in node and node[name] is None:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[names[-1]] = None
+    return _freeze(tree)
+
+
+def _freeze(tree):
+    return tuple(sorted((name, None if child is None else _freeze(child)) for name, child in tree.items()))
+
+
+def project(value, fields):
+    if fields is None or not isinstance(value, dict):
+        return value
+    return {name: project(value[name], child) for name, child in fields if name in value}
+
+
+class MatchIndex:
+    """The /matches payload kept sorted by kickoff, with row numbers per
+    competition and per status, so a filtered page is a few set lookups."""
+
+    def __init__(self, matches):
+        self.matches = sorted(matches, key=lambda match: match.get('utcDate') or '')
+        self.kickoffs = [match.get('utcDate') or '' for match in self.matches]
+        self.by_competition = {}
+        self.by_status = {}
+        for position, match in enumerate(self.matches):
+            competition_id = (match.get('competition') or {}).get('id')
+            self.by_competition.setdefault(competition_id, []).append(position)
+            self.by_status.setdefault(match.get('status'), []).append(position)
+
+    def _positions(self, groups, keys):
+        return {position for key in keys for position in groups.get(key, ())}
+
+    def filter(self, query):
+        start = bisect.bisect_left(self.kickoffs, query.date_from) if query.date_from else 0
+        stop = bisect.bisect_left(self.kickoffs, query.date_to) if query.date_to else len(self.matches)
+        positions = range(start, stop)
+
+        selected = None
+        if query.competitions:
+            selected = self._positions(self.by_competition, query.competitions)
+        if query.statuses:
+            statuses = self._positions(self.by_status, query.statuses)
+            selected = statuses if selected is None else selected & statuses
+        if selected is not None:
+            positions = [position for position in positions if position in selected]
+        if query.exclude_statuses:
+            excluded = self._positions(self.by_status, query.exclude_statuses)
+            positions = [position for position in positions if position not in excluded]
+
+        return [self.matches[position] for position in positions]
+
+
+# Indexes are keyed by the upstream ETag, so each payload is indexed once.
+index_cache = ResponseCache(max_entries=16)
+
+
+def index_for(etag, matches):
+    index = index_cache.get(etag) if etag else None
+    if index is None:
+        index = MatchIndex(matches)
+        if etag:
+            index_cache.set(etag, index)
+    return index
+
+
+def query_matches(data, etag, query):
+    matches = data.get('matches', [])
+    if query.filters():
+        matches = index_for(etag, matches).filter(query)
+    return matches
+
+
+def shape_payload(data, matches, query, today=None):
+    fields = query.fields
+    if today:
+        matches = [with_formatted_dates(match, today) for match in matches]
+        if fields is not None:
+            fields += (('formatted_dates', None),)
+
+    payload = {**data, 'matches': [project(match, fields) for match in matches]}
+    if query.filters() and isinstance(data.get('resultSet'), dict):
+        payload['resultSet'] = {**data['resultSet'], 'count': len(matches)}
+    return payload
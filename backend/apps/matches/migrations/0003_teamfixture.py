@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-17 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matches', '0002_match_competition_and_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamFixture',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('team_id', models.IntegerField(unique=True)),
+                ('match', models.JSONField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField()),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
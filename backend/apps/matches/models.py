@@ -5,8 +5,23 @@ class Match(models.Model):
     home_team = models.CharField(max_length=100)
     away_team = models.CharField(max_length=100)
     score = models.CharField(max_length=20, null=True)
-    status = models.CharField(max_length=50)
-    date = models.DateTimeField()
+    status = models.CharField(max_length=50, db_index=True)
+    date = models.DateTimeField(db_index=True)
+    competition_id = models.IntegerField(null=True, blank=True, db_index=True)
+    competition_name = models.CharField(max_length=100, null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
-        return f"{self.home_team} vs {self.away_team}"
\ No newline at end of file
+        return f"{self.home_team} vs {self.away_team}"
+
+# Next or current fixture of every favorite team, kept fresh by
+# `manage.py refresh_next_fixtures`. match is null when the team has nothing
+# scheduled inside the lookahead window.
+class TeamFixture(models.Model):
+    team_id = models.IntegerField(unique=True)
+    match = models.JSONField(null=True, blank=True)
+    refreshed_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"Next fixture for team {self.team_id}"
@@ -0,0 +1,149 @@
+import datetime
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.db import upsert_options
+from apps.users.models import UserProfile
+from .cache import LIVE_STATUSES, LIVE_TTL, matches_ttl
+from .football_api import football_get
+from .models import TeamFixture
+from .quota import PRIORITY_BACKFILL, PRIORITY_STANDINGS
+
+NEXT_FIXTURE_SETTINGS = getattr(settings, 'NEXT_FIXTURE', {})
+
+REFRESH_INTERVAL = NEXT_FIXTURE_SETTINGS.get('REFRESH_INTERVAL', 60 * 60)
+WINDOW_DAYS = NEXT_FIXTURE_SETTINGS.get('WINDOW_DAYS', 7)
+TEAM_WINDOW_DAYS = NEXT_FIXTURE_SETTINGS.get('TEAM_WINDOW_DAYS', 30)
+
+UPCOMING_STATUSES = ('SCHEDULED', 'TIMED')
+FIXTURE_STATUSES = LIVE_STATUSES + UPCOMING_STATUSES
+
+
+def kickoff_of(match):
+    return datetime.datetime.fromisoformat(match['utcDate'].replace('Z', '+00:00'))
+
+
+def pick_fixture(matches):
+    """A match in play wins over the soonest scheduled one."""
+    live = [match for match in matches if match.get('status') in LIVE_STATUSES]
+    if live:
+        return live[0]
+    upcoming = [match for match in matches if match.get('status') in UPCOMING_STATUSES and match.get('utcDate')]
+    return min(upcoming, key=kickoff_of, default=None)
+
+
+def fixtures_by_team(matches):
+    by_team = {}
+    for match in matches:
+        for side in ('homeTeam', 'awayTeam'):
+            team_id = (match.get(side) or {}).get('id')
+            if team_id is not None:
+                by_team.setdefault(team_id, []).append(match)
+    return {team_id: pick_fixture(team_matches) for team_id, team_matches in by_team.items()}
+
+
+def fixture_ttl(match, now):
+    if match is None:
+        return REFRESH_INTERVAL
+    if match.get('status') in LIVE_STATUSES:
+        return LIVE_TTL
+    # Look again at kickoff so the status flips to live on time.
+    until_kickoff = (kickoff_of(match) - now).total_seconds()
+    return max(LIVE_TTL, min(REFRESH_INTERVAL, until_kickoff))
+
+
+def store_fixture(team_id, match, now=None):
+    now = now or timezone.now()
+    fixture = TeamFixture(
+        team_id=team_id,
+        match=match,
+        refreshed_at=now,
+        expires_at=now + datetime.timedelta(seconds=fixture_ttl(match, now)),
+    )
+
+    TeamFixture.objects.bulk_create(
+        [fixture], **upsert_options(TeamFixture, ['team_id'], ['match', 'refreshed_at', 'expires_at'])
+    )
+    return fixture
+
+
+def fetch_window(days=WINDOW_DAYS):
+    today = timezone.now().date()
+    status_code, data = football_get(
+        '/matches',
+        params={'dateFrom': today.isoformat(), 'dateTo': (today + datetime.timedelta(days=days)).isoformat()},
+        ttl=matches_ttl,
+        priority=PRIORITY_STANDINGS
+    )
+    if status_code != 200:
+        raise RuntimeError(f'Failed to fetch fixtures: {status_code}')
+    return data.get('matches', [])
+
+
+def fetch_team_fixture(team_id, priority=PRIORITY_STANDINGS):
+    today = timezone.now().date()
+    status_code, data = football_get(
+        f'/teams/{team_id}/matches',
+        params={
+            'dateFrom': today.isoformat(),
+            'dateTo': (today + datetime.timedelta(days=TEAM_WINDOW_DAYS)).isoformat(),
+            'status': ','.join(FIXTURE_STATUSES),
+        },
+        ttl=matches_ttl,
+        priority=priority
+    )
+    if status_code != 200:
+        raise RuntimeError(f'Failed to fetch matches for team {team_id}: {status_code}')
+    return pick_fixture(data.get('matches', []))
+
+
+def favorite_team_ids():
+    return set(
+        UserProfile.objects.filter(favorite_team_id__isnull=False)
+        .values_list('favorite_team_id', flat=True).distinct()
+    )
+
+
+def refresh_due_fixtures():
+    """Refresh every followed team whose fixture has expired. One call for the
+    shared fixture window covers most teams; the rest cost one call each."""
+    now = timezone.now()
+    team_ids = favorite_team_ids()
+    TeamFixture.objects.exclude(team_id__in=team_ids).delete()
+
+    fresh = set(TeamFixture.objects.filter(team_id__in=team_ids, expires_at__gt=now).values_list('team_id', flat=True))
+    due = team_ids - fresh
+    if not due:
+        return 0, 0
+
+    window = fixtures_by_team(fetch_window())
+    refreshed = failed = 0
+    for team_id in sorted(due):
+        match = window.get(team_id)
+        if match is None:
+            try:
+                match = fetch_team_fixture(team_id, priority=PRIORITY_BACKFILL)
+            except Exception as e:
+                # Left expired, so the next pass tries again.
+                print(f"Error refreshing next fixture for team {team_id}: {e}")
+                failed += 1
+                continue
+        store_fixture(team_id, match, now)
+        refreshed += 1
+    return refreshed, failed
+
+
+def next_fixture_for(team_id):
+    fixture = TeamFixture.objects.filter(team_id=team_id).first()
+    if fixture is not None and fixture.expires_at > timezone.now():
+        return fixture
+
+    # The scheduled refresh is behind or this team is new: look it up now,
+    # falling back to the expired row if the upstream call fails.
+    try:
+        return store_fixture(team_id, fetch_team_fixture(team_id))
+    except Exception:
+        if fixture is None:
+            raise
+        return fixture
@@ -0,0 +1,233 @@
+from bs4 import BeautifulSoup
+from django.conf import settings
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+HTML_PARSER = getattr(settings, 'HTML_PARSER', 'lxml')
+
+TOP5_LEAGUES = [
+    "English Premier League",
+    "Spanish LALIGA",
+    "German Bundesliga",
+    "Italian Serie A",
+    "French Ligue 1",
+    "UEFA Champions League",
+    "UEFA Europa League",
+]
+
+CARD_SELECTOR = 'section.Card.gameModules'
+HEADER_SELECTOR = 'header.Card__Header'
+TEAM_NAME_SELECTOR = '.SoccerPerformers__Competitor__Team__Name'
+COMPETITOR_CLASS = 'SoccerPerformers__Competitor'
+INFO_SELECTOR = '.SoccerPerformers__Competitor__Info'
+RED_CARD_SELECTOR = '.SoccerPerformers__RedCardIcon'
+GOAL_ICON_SELECTOR = '.SoccerPerformers__GoalIcon'
+NO_GOALS_SELECTOR = '.SoccerPerformers__Competitor__Info__GoalsList--noGoals'
+EVENT_ITEM_SELECTOR = '.SoccerPerformers__Competitor__Info__GoalsList__Item'
+PLAYER_SELECTOR = '.Soccer__PlayerName'
+TIME_SELECTOR = '.GoalScore__Time'
+
+
+def build_events(info_sections):
+    # info_sections yields (is_red_card, has_goal_icon, has_no_goals, [(player, time), ...])
+    events = []
+
+    for is_red_card, has_goal_icon, has_no_goals, items in info_sections:
+        if is_red_card:
+            for player_text, time_text in items:
+                events.append({
+                    'type': 'red',
+                    'player': player_text.strip().replace('-', ''),
+                    'time': time_text.strip().replace('-', '').replace(' ', '')
+                })
+
+        elif has_goal_icon:
+            if has_no_goals:
+                continue
+
+            for player_text, time_text in items:
+                player_name = player_text.strip().replace('-', '')
+                time = time_text.strip().replace('-', '').replace(' ', '')
+                if 'OG' in time:
+                    events.append({
+                        'type': 'own',
+                        'player': player_name,
+                        'time': time.replace('OG', '').strip()
+                    })
+                else:
+                    events.append({
+                        'type': 'goal',
+                        'player': player_name,
+                        'time': time
+                    })
+
+    return events
+
+
+class SoupParser:
+    name = 'html.parser'
+
+    def scoreboard(self, html_source):
+        # Team name -> events, in page order, for every top-league fixture on the page.
+        teams = {}
+
+        soup = BeautifulSoup(html_source, 'html.parser')
+
+        for card in soup.select(CARD_SELECTOR):
+            header = card.select_one(HEADER_SELECTOR)
+            if not header:
+                continue
+
+            league_label = header.get('aria-label', '')
+            if not league_label or not any(league in league_label for league in TOP5_LEAGUES):
+                continue
+
+            for team_element in card.select(TEAM_NAME_SELECTOR):
+                competitor_section = team_element.find_parent(class_=COMPETITOR_CLASS)
+                if not competitor_section:
+                    continue
+
+                team_name = team_element.get_text().strip()
+                teams.setdefault(team_name, []).extend(build_events(self._info_sections(competitor_section)))
+
+        return teams
+
+    def _info_sections(self, competitor_section):
+        for info_section in competitor_section.select(INFO_SELECTOR):
+            items = []
+            for item in info_section.select(EVENT_ITEM_SELECTOR):
+                player_el = item.select_one(PLAYER_SELECTOR)
+                time_el = item.select_one(TIME_SELECTOR)
+                if player_el and time_el:
+                    items.append((player_el.get_text(), time_el.get_text()))
+
+            yield (
+                info_section.select_one(RED_CARD_SELECTOR) is not None,
+                info_section.select_one(GOAL_ICON_SELECTOR) is not None,
+                info_section.select_one(NO_GOALS_SELECTOR) is not None,
+                items,
+            )
+
+    def stream_rows(self, html_source):
+        # (lowercased row text, [hrefs], [cell texts]) for every row of the first table.
+        soup = BeautifulSoup(html_source, 'html.parser')
+
+        tables = soup.find_all('table')
+        if not tables:
+            return []
+
+        return [
+            (
+                row.get_text().strip().lower(),
+                [link.get('href', '') for link in row.find_all('a')],
+                [cell.get_text().strip() for cell in row.find_all(['td', 'th'], recursive=False)],
+            )
+            for row in tables[0].find_all('tr')
+        ]
+
+
+class LxmlParser:
+    name = 'lxml'
+
+    def __init__(self):
+        self.select_cards = CSSSelector(CARD_SELECTOR)
+        self.select_header = CSSSelector(HEADER_SELECTOR)
+        self.select_team_names = CSSSelector(TEAM_NAME_SELECTOR)
+        self.select_infos = CSSSelector(INFO_SELECTOR)
+        self.select_red_card = CSSSelector(RED_CARD_SELECTOR)
+        self.select_goal_icon = CSSSelector(GOAL_ICON_SELECTOR)
+        self.select_no_goals = CSSSelector(NO_GOALS_SELECTOR)
+        self.select_items = CSSSelector(EVENT_ITEM_SELECTOR)
+        self.select_player = CSSSelector(PLAYER_SELECTOR)
+        self.select_time = CSSSelector(TIME_SELECTOR)
+
+    def _document(self, html_source):
+        if isinstance(html_source, str) and html_source.lstrip().startswith('<?xml'):
+            html_source = html_source.encode('utf-8')
+        return lxml.html.document_fromstring(html_source)
+
+    def _first(self, selector, element):
+        found = selector(element)
+        return found[0] if found else None
+
+    def _competitor_for(self, element):
+        for ancestor in element.iterancestors():
+            if COMPETITOR_CLASS in (ancestor.get('class') or '').split():
+                return ancestor
+        return None
+
+    def scoreboard(self, html_source):
+        teams = {}
+
+        document = self._document(html_source)
+
+        for card in self.select_cards(document):
+            header = self._first(self.select_header, card)
+            if header is None:
+                continue
+
+            league_label = header.get('aria-label', '')
+            if not league_label or not any(league in league_label for league in TOP5_LEAGUES):
+                continue
+
+            for team_element in self.select_team_names(card):
+                competitor_section = self._competitor_for(team_element)
+                if competitor_section is None:
+                    continue
+
+                team_name = team_element.text_content().strip()
+                teams.setdefault(team_name, []).extend(build_events(self._info_sections(competitor_section)))
+
+        return teams
+
+    def _info_sections(self, competitor_section):
+        for info_section in self.select_infos(competitor_section):
+            items = []
+            for item in self.select_items(info_section):
+                player_el = self._first(self.select_player, item)
+                time_el = self._first(self.select_time, item)
+                if player_el is not None and time_el is not None:
+                    items.append((player_el.text_content(), time_el.text_content()))
+
+            yield (
+                bool(self.select_red_card(info_section)),
+                bool(self.select_goal_icon(info_section)),
+                bool(self.select_no_goals(info_section)),
+                items,
+            )
+
+    def stream_rows(self, html_source):
+        document = self._document(html_source)
+
+        table = next(document.iter('table'), None)
+        if table is None:
+            return []
+
+        return [
+            (
+                row.text_content().strip().lower(),
+                [link.get('href', '') for link in row.iter('a')],
+                [cell.text_content().strip() for cell in row if cell.tag in ('td', 'th')],
+            )
+            for row in table.iter('tr')
+        ]
+
+
+PARSERS = {
+    SoupParser.name: SoupParser,
+    LxmlParser.name: LxmlParser,
+}
+
+
+def get_parser(name=HTML_PARSER):
+    if name == LxmlParser.name and lxml is None:
+        print("lxml is not installed, falling back to html.parser")
+        name = SoupParser.name
+    return PARSERS[name]()
+
+
+html_parser = get_parser()
@@ -0,0 +1,175 @@
+import heapq
+import itertools
+import json
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+QUOTA_SETTINGS = getattr(settings, 'FOOTBALL_QUOTA', {})
+
+REQUESTS_PER_MINUTE = QUOTA_SETTINGS.get('REQUESTS_PER_MINUTE', 10)
+STATE_PATH = QUOTA_SETTINGS.get('STATE_PATH') or os.path.join(tempfile.gettempdir(), 'ninetyplus-quota.json')
+
+PRIORITY_LIVE = 0
+PRIORITY_MATCH_DETAILS = 1
+PRIORITY_STANDINGS = 2
+PRIORITY_BACKFILL = 3
+
+# Tokens a priority class may not spend, so the last few calls of every
+# minute are kept for live scores and match pages.
+RESERVED_TOKENS = {
+    PRIORITY_LIVE: 0,
+    PRIORITY_MATCH_DETAILS: 1,
+    PRIORITY_STANDINGS: 2,
+    PRIORITY_BACKFILL: 4,
+}
+
+# How long a call of each priority waits for budget before giving up.
+MAX_WAIT = {
+    PRIORITY_LIVE: 10.0,
+    PRIORITY_MATCH_DETAILS: 5.0,
+    PRIORITY_STANDINGS: 2.0,
+    PRIORITY_BACKFILL: 0.0,
+}
+
+POLL_INTERVAL = 0.25
+
+
+class QuotaExhausted(Exception):
+    def __init__(self, retry_after):
+        self.retry_after = max(int(retry_after + 0.999), 1)
+        super().__init__(f'Football API rate limit reached, retry in {self.retry_after}s')
+
+
+class SharedBudget:
+    def __init__(self, path=STATE_PATH, requests_per_minute=REQUESTS_PER_MINUTE):
+        self.path = path
+        self.requests_per_minute = requests_per_minute
+        self._lock = threading.Lock()
+        self._local_state = None
+
+    def _read(self, state_file):
+        try:
+            state_file.seek(0)
+            state = json.loads(state_file.read() or '{}')
+        except ValueError:
+            state = {}
+
+        now = time.time()
+        if state.get('reset_at', 0) <= now:
+            state = {'available': self.requests_per_minute, 'reset_at': now + 60}
+        return state
+
+    def _write(self, state_file, state):
+        state_file.seek(0)
+        state_file.truncate()
+        state_file.write(json.dumps(state))
+        state_file.flush()
+
+    def update(self, fn):
+        with self._lock:
+            if fcntl is None:
+                state = self._local_state or {}
+                if state.get('reset_at', 0) <= time.time():
+                    state = {'available': self.requests_per_minute, 'reset_at': time.time() + 60}
+                result = fn(state)
+                self._local_state = state
+                return result
+
+            with open(self.path, 'a+') as state_file:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                try:
+                    state = self._read(state_file)
+                    result = fn(state)
+                    self._write(state_file, state)
+                    return result
+                finally:
+                    fcntl.flock(state_file, fcntl.LOCK_UN)
+
+
+class QuotaScheduler:
+    def __init__(self, budget=None):
+        self.budget = budget or SharedBudget()
+        self._waiting = []
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.rejected = 0
+
+    def _take_token(self, priority):
+        def take(state):
+            if state['available'] > RESERVED_TOKENS[priority]:
+                state['available'] -= 1
+                return True, 0
+            return False, state['reset_at'] - time.time()
+
+        return self.budget.update(take)
+
+    def acquire(self, priority):
+        deadline = time.monotonic() + MAX_WAIT[priority]
+        ticket = (priority, next(self._counter))
+
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    if self._waiting[0] == ticket:
+                        granted, retry_after = self._take_token(priority)
+                        if granted:
+                            heapq.heappop(self._waiting)
+                            self.granted += 1
+                            return
+                    else:
+                        retry_after = POLL_INTERVAL
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._waiting.remove(ticket)
+                        heapq.heapify(self._waiting)
+                        self.rejected += 1
+                        raise QuotaExhausted(retry_after)
+
+                    self._cond.wait(min(remaining, POLL_INTERVAL))
+            finally:
+                self._cond.notify_all()
+
+    def observe(self, response):
+        available = response.headers.get('X-Requests-Available-Minute')
+        reset = response.headers.get('X-RequestCounter-Reset')
+        if available is None and response.status_code != 429:
+            return
+
+        def learn(state):
+            if available is not None:
+                state['available'] = int(available)
+            if response.status_code == 429:
+                state['available'] = 0
+            if reset is not None:
+                state['reset_at'] = time.time() + int(reset)
+
+        try:
+            self.budget.update(learn)
+        except ValueError as e:
+            print(f"Error reading rate limit headers: {e}")
+
+    def stats(self):
+        state = self.budget.update(lambda state: dict(state))
+        with self._cond:
+            return {
+                'available': state['available'],
+                'reset_in': max(round(state['reset_at'] - time.time(), 1), 0),
+                'waiting': len(self._waiting),
+                'granted': self.granted,
+                'rejected': self.rejected,
+            }
+
+
+quota_scheduler = QuotaScheduler()
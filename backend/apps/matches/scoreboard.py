@@ -0,0 +1,108 @@
+import datetime
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.core.http_client import async_http_client, http_client
+from apps.core.metrics import registry, timed
+from .cache import ResponseCache
+from .parsers import html_parser
+from .scraping import SCRAPE_HEADERS, espn_scoreboard_url, parse_scoreboard
+from .singleflight import AsyncSingleFlight, SingleFlight
+
+SCOREBOARD_SETTINGS = getattr(settings, 'SCOREBOARD_INDEX', {})
+
+LIVE_TTL = SCOREBOARD_SETTINGS.get('LIVE_TTL', 60)
+TTL = SCOREBOARD_SETTINGS.get('TTL', 6 * 60 * 60)
+MAX_DATES = SCOREBOARD_SETTINGS.get('MAX_DATES', 32)
+
+
+def _names_matching(team, names):
+    return [name for name in names if name in team or team in name]
+
+
+class ScoreboardIndex:
+    def __init__(self, teams):
+        self.teams = teams
+        self._resolved = {}
+        self._lock = threading.Lock()
+
+    def events_for(self, home_team, away_team):
+        key = (home_team, away_team)
+        with self._lock:
+            resolved = self._resolved.get(key)
+        if resolved is not None:
+            return resolved
+
+        # ESPN and football-data spell clubs differently, so names match when
+        # either contains the other. A name matching both sides counts as home.
+        home_names = _names_matching(home_team, self.teams)
+        away_names = [name for name in _names_matching(away_team, self.teams) if name not in home_names]
+
+        resolved = (
+            [event for name in home_names for event in self.teams[name]],
+            [event for name in away_names for event in self.teams[name]],
+        )
+        with self._lock:
+            self._resolved[key] = resolved
+        return resolved
+
+
+scoreboard_cache = ResponseCache(max_entries=MAX_DATES)
+registry.register_cache('scoreboard', scoreboard_cache)
+scoreboard_flight = SingleFlight(mode='thread')
+async_scoreboard_flight = AsyncSingleFlight()
+
+
+def _build_index(html):
+    with timed('parse', 'parse_duration_seconds', document='espn_scoreboard', backend=html_parser.name):
+        teams = parse_scoreboard(html)
+    return ScoreboardIndex(teams)
+
+
+def _load_index(url):
+    response = http_client.get(url, headers=SCRAPE_HEADERS)
+    if response.status_code != 200:
+        return None
+    return _build_index(response.text)
+
+
+async def _load_index_async(url):
+    response = await async_http_client.get(url, headers=SCRAPE_HEADERS)
+    if response.status_code != 200:
+        return None
+    # Parsing the whole scoreboard is CPU work, keep it off the event loop.
+    return await sync_to_async(_build_index, thread_sensitive=False)(response.text)
+
+
+def ttl_for_date(match_date):
+    # Fixtures from today or yesterday may still be in play.
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    if (today - match_date.date()).days <= 1:
+        return LIVE_TTL
+    return TTL
+
+
+def get_scoreboard_index(match_date):
+    url = espn_scoreboard_url(match_date)
+    index = scoreboard_cache.get(url)
+    if index is not None:
+        return index
+
+    index = scoreboard_flight.do(url, lambda: _load_index(url))
+    if index is not None:
+        scoreboard_cache.set(url, index, ttl_for_date(match_date))
+    return index
+
+
+async def get_scoreboard_index_async(match_date):
+    url = espn_scoreboard_url(match_date)
+    index = scoreboard_cache.get(url)
+    if index is not None:
+        return index
+
+    index = await async_scoreboard_flight.do(url, lambda: _load_index_async(url))
+    if index is not None:
+        scoreboard_cache.set(url, index, ttl_for_date(match_date))
+    return index
@@ -0,0 +1,29 @@
+from .parsers import html_parser
+
+STREAM_SCHEDULE_URL = "https://techcabal.net/schedule/soccerstreams/"
+ESPN_SCOREBOARD_URL = "https://www.espn.com/soccer/scoreboard/_/date/{date}"
+
+SCRAPE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
+}
+
+
+def espn_scoreboard_url(match_date):
+    return ESPN_SCOREBOARD_URL.format(date=match_date.strftime('%Y%m%d'))
+
+
+def stream_url_for(stream_id):
+    return f"https://techcabal.net/clip/s{stream_id}.html"
+
+
+def stream_id_from_links(hrefs):
+    for href in hrefs:
+        if href and '/s' in href:
+            matchUrl = href.split('/s')
+            if len(matchUrl) > 1:
+                return matchUrl[1].split('.')[0].replace('/', '')
+    return None
+
+
+def parse_scoreboard(html_source, parser=html_parser):
+    return parser.scoreboard(html_source)
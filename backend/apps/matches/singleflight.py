@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+SINGLEFLIGHT_SETTINGS = getattr(settings, 'FOOTBALL_SINGLEFLIGHT', {})
+
+MODE = SINGLEFLIGHT_SETTINGS.get('MODE', 'thread')
+LOCK_DIR = SINGLEFLIGHT_SETTINGS.get('LOCK_DIR') or os.path.join(tempfile.gettempdir(), 'ninetyplus-singleflight')
+# A result written by another worker this many seconds before we started
+# waiting still counts as the same flight.
+SHARE_WINDOW = SINGLEFLIGHT_SETTINGS.get('SHARE_WINDOW', 1.0)
+# Lock and result files of keys nobody has led a flight for in this many
+# seconds are removed by the next sweep.
+FILE_TTL = SINGLEFLIGHT_SETTINGS.get('FILE_TTL', 300)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, mode=MODE, lock_dir=LOCK_DIR, file_ttl=FILE_TTL):
+        if mode == 'file' and fcntl is None:
+            print("File locks are not available on this platform, falling back to thread single-flight")
+            mode = 'thread'
+
+        self.mode = mode
+        self.lock_dir = lock_dir
+        self.file_ttl = file_ttl
+        self._last_sweep = 0.0
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+        if self.mode == 'file':
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run(self, key, fn):
+        if self.mode != 'file':
+            return fn()
+
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        lock_path = os.path.join(self.lock_dir, f'{digest}.lock')
+        result_path = os.path.join(self.lock_dir, f'{digest}.json')
+        started_at = time.time()
+        self._maybe_sweep(started_at)
+
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                shared_result = self._read_result(result_path, started_at)
+                if shared_result is not None:
+                    with self._lock:
+                        self.shared += 1
+                    return shared_result
+
+                # The lock file's mtime marks the key as in use for the sweep.
+                os.utime(lock_path)
+                result = fn()
+                self._write_result(result_path, result)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_result(self, result_path, started_at):
+        try:
+            with open(result_path) as result_file:
+                payload = json.load(result_file)
+        except (OSError, ValueError):
+            return None
+
+        if payload.get('written_at', 0) < started_at - SHARE_WINDOW:
+            return None
+        return payload.get('result')
+
+    def _write_result(self, result_path, result):
+        tmp_path = f'{result_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w') as result_file:
+                json.dump({'written_at': time.time(), 'result': result}, result_file)
+            os.replace(tmp_path, result_path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error sharing single-flight result: {e}")
+
+    def _maybe_sweep(self, now):
+        with self._lock:
+            if now - self._last_sweep < self.file_ttl:
+                return
+            self._last_sweep = now
+        self.sweep(now)
+
+    def sweep(self, now=None):
+        now = now or time.time()
+        try:
+            names = os.listdir(self.lock_dir)
+        except OSError:
+            return 0
+
+        removed = 0
+        for name in names:
+            path = os.path.join(self.lock_dir, name)
+            try:
+                if now - os.path.getmtime(path) < self.file_ttl:
+                    continue
+                if name.endswith('.tmp'):
+                    os.remove(path)
+                    removed += 1
+                elif name.endswith('.lock'):
+                    removed += self._remove_idle_key(path)
+            except OSError:
+                continue
+        return removed
+
+    def _remove_idle_key(self, lock_path):
+        with open(lock_path, 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                # Someone is leading or waiting on this key right now.
+                return 0
+            try:
+                removed = 0
+                for path in (lock_path[:-len('.lock')] + '.json', lock_path):
+                    try:
+                        os.remove(path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                return removed
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'in_flight': len(self._calls),
+                'leaders': self.leaders,
+                'shared': self.shared,
+            }
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines. Callers on the same event loop share one
+    task per key; tasks are per loop since they can't be awaited across loops."""
+
+    def __init__(self):
+        self._flights = weakref.WeakKeyDictionary()
+
+    def start(self, key, fn):
+        loop = asyncio.get_running_loop()
+        flights = self._flights.setdefault(loop, {})
+        task = flights.get(key)
+        if task is None:
+            # The table keeps the task referenced until it finishes.
+            task = loop.create_task(fn())
+            flights[key] = task
+            task.add_done_callback(lambda _: flights.pop(key, None))
+        return task
+
+    async def do(self, key, fn):
+        # A caller that is cancelled leaves the task running for the others.
+        return await asyncio.shield(self.start(key, fn))
+
+
+upstream_flight = SingleFlight()
+async_upstream_flight = AsyncSingleFlight()
@@ -0,0 +1,148 @@
+import asyncio
+import weakref
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from django.conf import settings
+
+from .cache import response_cache, standings_ttl
+from .football_api import build_cache_key, football_fetch, football_fetch_async
+from .quota import PRIORITY_STANDINGS, QuotaExhausted
+
+STANDINGS_BATCH_SETTINGS = getattr(settings, 'STANDINGS_BATCH', {})
+
+MAX_WORKERS = STANDINGS_BATCH_SETTINGS.get('MAX_WORKERS', 4)
+TIMEOUT = STANDINGS_BATCH_SETTINGS.get('TIMEOUT', 5.0)
+MAX_COMPETITIONS = STANDINGS_BATCH_SETTINGS.get('MAX_COMPETITIONS', 10)
+DEFAULT_COMPETITIONS = STANDINGS_BATCH_SETTINGS.get('DEFAULT_COMPETITIONS', (2021, 2014, 2002, 2019, 2015))
+
+# Shared by every request, so a burst of batch calls still makes at most
+# MAX_WORKERS upstream calls at once. Fetches that outlive a request keep
+# running and land in the response cache for the next one.
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='standings')
+
+
+def parse_competition_ids(value):
+    if not value:
+        return list(DEFAULT_COMPETITIONS)
+    ids = [int(part) for part in value.split(',') if part.strip().isdigit()]
+    return list(dict.fromkeys(ids))
+
+
+def standings_path(competition_id):
+    return f'/competitions/{competition_id}/standings'
+
+
+def cached_standings(competition_id):
+    return response_cache.get(build_cache_key(standings_path(competition_id)))
+
+
+def fetch_standings(competition_id):
+    return football_fetch(standings_path(competition_id), ttl=standings_ttl, priority=PRIORITY_STANDINGS)
+
+
+async def fetch_standings_async(competition_id):
+    return await football_fetch_async(standings_path(competition_id), ttl=standings_ttl, priority=PRIORITY_STANDINGS)
+
+
+def freshness(competition_id, source):
+    expires_in = response_cache.expires_in(build_cache_key(standings_path(competition_id)))
+    if source != 'cache' and expires_in is not None and expires_in <= 0:
+        # football_fetch fell back to the expired copy.
+        source = 'stale'
+    return {'source': source, 'expires_in': round(expires_in, 1) if expires_in is not None else None}
+
+
+def standings_entry(competition_id, source, result=None, error=None):
+    if error is not None:
+        entry = {'competition_id': competition_id, 'status': source, 'error': str(error)}
+        if isinstance(error, QuotaExhausted):
+            entry['retry_after'] = error.retry_after
+        return entry
+
+    if result.status_code != 200:
+        return {
+            'competition_id': competition_id,
+            'status': 'error',
+            'error': f'Failed to fetch standings: {result.status_code}',
+        }
+
+    return {
+        'competition_id': competition_id,
+        'status': 'ok',
+        'freshness': freshness(competition_id, source),
+        'etag': result.etag,
+        'data': result.data,
+    }
+
+
+def pending_entry(competition_id, timeout):
+    return standings_entry(competition_id, 'pending', error=f'Still loading after {timeout:g}s, retry shortly')
+
+
+def standings_batch(competition_ids, timeout=TIMEOUT):
+    entries = {}
+    futures = {}
+    for competition_id in competition_ids:
+        cached = cached_standings(competition_id)
+        if cached is not None:
+            entries[competition_id] = standings_entry(competition_id, 'cache', cached)
+        else:
+            futures[_executor.submit(fetch_standings, competition_id)] = competition_id
+
+    done, _ = wait(futures, timeout=timeout)
+    for future, competition_id in futures.items():
+        if future not in done:
+            entries[competition_id] = pending_entry(competition_id, timeout)
+        elif future.exception() is not None:
+            entries[competition_id] = standings_entry(competition_id, 'error', error=future.exception())
+        else:
+            entries[competition_id] = standings_entry(competition_id, 'upstream', future.result())
+
+    return [entries[competition_id] for competition_id in competition_ids]
+
+
+# Per event loop, like the async single-flight table.
+_async_limits = weakref.WeakKeyDictionary()
+# The loop only holds weak references to tasks a request stopped waiting for.
+_background_tasks = set()
+
+
+def _async_limit():
+    loop = asyncio.get_running_loop()
+    limit = _async_limits.get(loop)
+    if limit is None:
+        limit = _async_limits[loop] = asyncio.Semaphore(MAX_WORKERS)
+    return limit
+
+
+async def _fetch_limited(competition_id):
+    async with _async_limit():
+        return await fetch_standings_async(competition_id)
+
+
+async def standings_batch_async(competition_ids, timeout=TIMEOUT):
+    entries = {}
+    tasks = {}
+    loop = asyncio.get_running_loop()
+    for competition_id in competition_ids:
+        cached = cached_standings(competition_id)
+        if cached is not None:
+            entries[competition_id] = standings_entry(competition_id, 'cache', cached)
+        else:
+            task = loop.create_task(_fetch_limited(competition_id))
+            _background_tasks.add(task)
+            task.add_done_callback(_background_tasks.discard)
+            tasks[task] = competition_id
+
+    if tasks:
+        # Unfinished tasks are left running so their result still reaches the cache.
+        await asyncio.wait(tasks, timeout=timeout)
+    for task, competition_id in tasks.items():
+        if not task.done():
+            entries[competition_id] = pending_entry(competition_id, timeout)
+        elif task.exception() is not None:
+            entries[competition_id] = standings_entry(competition_id, 'error', error=task.exception())
+        else:
+            entries[competition_id] = standings_entry(competition_id, 'upstream', task.result())
+
+    return [entries[competition_id] for competition_id in competition_ids]
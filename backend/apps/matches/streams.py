@@ -0,0 +1,158 @@
+import datetime
+import re
+import time
+import unicodedata
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.core.http_client import async_http_client, http_client
+from apps.core.metrics import timed
+from .index_store import RefreshingIndexStore
+from .parsers import html_parser
+from .scraping import SCRAPE_HEADERS, STREAM_SCHEDULE_URL, stream_id_from_links
+
+STREAM_INDEX_SETTINGS = getattr(settings, 'STREAM_INDEX', {})
+
+TTL = STREAM_INDEX_SETTINGS.get('TTL', 300)
+
+KICKOFF_PATTERN = re.compile(r'(?<!\d)(\d{1,2}):(\d{2})(?!\d)')
+TEAMS_PATTERN = re.compile(r'\s+(?:vs\.?|v|-)\s+', re.IGNORECASE)
+NAME_NOISE = {'fc', 'cf', 'afc', 'sc', 'club', 'de', 'the', 'calcio', 'ssc', 'as', 'ac', 'us', '1', 'fk'}
+
+
+def normalize_team(name):
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    tokens = re.sub(r'[^a-z0-9 ]+', ' ', name).split()
+    return ' '.join(token for token in tokens if token not in NAME_NOISE) or ' '.join(tokens)
+
+
+def name_score(wanted, candidate):
+    if not wanted or not candidate:
+        return 0
+    if wanted == candidate:
+        return 3
+    if wanted in candidate or candidate in wanted:
+        return 2
+    shared = {token for token in wanted.split() if len(token) > 3} & set(candidate.split())
+    return 1 if shared else 0
+
+
+def kickoff_of(text):
+    found = KICKOFF_PATTERN.search(text)
+    if not found:
+        return None
+    return f"{int(found.group(1)):02d}:{found.group(2)}"
+
+
+def kickoff_for(match_date_str):
+    match_date = datetime.datetime.fromisoformat(match_date_str.replace('Z', '+00:00'))
+    return match_date.strftime('%H:%M')
+
+
+class StreamScheduleIndex:
+    def __init__(self, rows):
+        self.fetched_at = time.time()
+        self.by_teams = {}
+        self.by_kickoff = {}
+        self.unparsed = {}
+
+        for row_text, hrefs, cells in rows:
+            stream_id = stream_id_from_links(hrefs)
+            kickoff = kickoff_of(row_text)
+            if not stream_id or not kickoff:
+                continue
+
+            teams = self._teams_from_cells(cells)
+            if teams is None:
+                # Rows we can't split into two teams keep the old row-text heuristic.
+                self.unparsed.setdefault(kickoff, []).append((row_text, stream_id))
+                continue
+
+            home, away = normalize_team(teams[0]), normalize_team(teams[1])
+            self.by_teams.setdefault((kickoff, home, away), stream_id)
+            self.by_kickoff.setdefault(kickoff, []).append((home, away, stream_id))
+
+    def _teams_from_cells(self, cells):
+        for cell in cells:
+            parts = TEAMS_PATTERN.split(cell, maxsplit=1)
+            if len(parts) == 2 and parts[0] and parts[1]:
+                return parts
+        return None
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.by_kickoff.values()) + sum(len(rows) for rows in self.unparsed.values())
+
+    def lookup(self, home_team, away_team, kickoff):
+        home, away = normalize_team(home_team), normalize_team(away_team)
+
+        # Schedules don't always agree on who is at home, so both orders count.
+        stream_id = self.by_teams.get((kickoff, home, away)) or self.by_teams.get((kickoff, away, home))
+        if stream_id:
+            return stream_id
+
+        best_score, best_stream_id = 0, None
+        for row_home, row_away, row_stream_id in self.by_kickoff.get(kickoff, []):
+            for first, second in ((home, away), (away, home)):
+                home_score = name_score(first, row_home)
+                away_score = name_score(second, row_away)
+                if home_score and away_score and home_score + away_score > best_score:
+                    best_score, best_stream_id = home_score + away_score, row_stream_id
+        if best_stream_id:
+            return best_stream_id
+
+        home_first_letter = home_team[0].lower()
+        away_first_letter = away_team[0].lower()
+        for row_text, row_stream_id in self.unparsed.get(kickoff, []):
+            if home_first_letter in row_text and away_first_letter in row_text:
+                return row_stream_id
+
+        return None
+
+
+class StreamIndexStore(RefreshingIndexStore):
+    key = STREAM_SCHEDULE_URL
+    name = 'stream schedule'
+
+    def __init__(self, ttl=TTL, parser=html_parser):
+        super().__init__(ttl)
+        self.parser = parser
+
+    def _build(self, response):
+        if response.status_code != 200:
+            raise RuntimeError(f'Failed to fetch stream source: {response.status_code}')
+
+        with timed('parse', 'parse_duration_seconds', document='stream_schedule', backend=self.parser.name):
+            index = StreamScheduleIndex(self.parser.stream_rows(response.text))
+        with self._lock:
+            self._index = index
+            self.refreshes += 1
+        return index
+
+    def _load(self):
+        return self._build(http_client.get(STREAM_SCHEDULE_URL, headers=SCRAPE_HEADERS))
+
+    async def _load_async(self):
+        response = await async_http_client.get(STREAM_SCHEDULE_URL, headers=SCRAPE_HEADERS)
+        # Parsing the schedule is CPU work, keep it off the event loop.
+        return await sync_to_async(self._build, thread_sensitive=False)(response)
+
+    def find_stream_id(self, home_team, away_team, match_date_str):
+        kickoff = kickoff_for(match_date_str)
+        return self.get().lookup(home_team, away_team, kickoff)
+
+    async def find_stream_id_async(self, home_team, away_team, match_date_str):
+        kickoff = kickoff_for(match_date_str)
+        return (await self.get_async()).lookup(home_team, away_team, kickoff)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'rows': len(self._index) if self._index else 0,
+                'age': round(time.time() - self._index.fetched_at, 1) if self._index else None,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+            }
+
+
+stream_index = StreamIndexStore()
@@ -0,0 +1,159 @@
+import bisect
+import re
+import time
+import unicodedata
+
+from django.conf import settings
+
+from .index_store import RefreshingIndexStore
+from .standings import standings_batch, standings_batch_async
+
+TEAM_INDEX_SETTINGS = getattr(settings, 'TEAM_INDEX', {})
+
+TTL = TEAM_INDEX_SETTINGS.get('TTL', 6 * 60 * 60)
+COMPETITIONS = TEAM_INDEX_SETTINGS.get('COMPETITIONS', (2021, 2014, 2002, 2019, 2015))
+MAX_RESULTS = TEAM_INDEX_SETTINGS.get('MAX_RESULTS', 20)
+# An index missing leagues is rebuilt this soon instead of waiting out the TTL.
+RETRY_AFTER = TEAM_INDEX_SETTINGS.get('RETRY_AFTER', 60)
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text or '').encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(re.sub(r'[^a-z0-9 ]+', ' ', text).split())
+
+
+def teams_from_standings(data):
+    competition = data.get('competition') or {}
+    area = data.get('area') or {}
+    # The TOTAL table comes first; HOME/AWAY repeat the same clubs.
+    tables = [standing.get('table') or [] for standing in data.get('standings') or []]
+    teams = {}
+    for row in (row for table in tables for row in table):
+        team = row.get('team') or {}
+        if team.get('id') is None or team['id'] in teams:
+            continue
+        teams[team['id']] = {
+            'id': team['id'],
+            'name': team.get('name'),
+            'shortName': team.get('shortName'),
+            'tla': team.get('tla'),
+            'crest': team.get('crest'),
+            'league': competition.get('name'),
+            'league_id': competition.get('id'),
+            'country': area.get('name'),
+        }
+    return list(teams.values())
+
+
+class TeamIndex:
+    def __init__(self, teams_by_competition):
+        self.fetched_at = time.time()
+        self.teams_by_competition = teams_by_competition
+        self.teams = [team for teams in teams_by_competition.values() for team in teams]
+
+        # Every word start of every name is a key, so "uni" finds
+        # "Manchester United" by prefix without scanning.
+        self._folded = []
+        keys = []
+        for position, team in enumerate(self.teams):
+            names = {fold(team[field]) for field in ('name', 'shortName', 'tla') if team.get(field)}
+            self._folded.append(names)
+            for name in names:
+                words = name.split()
+                for start in range(len(words)):
+                    keys.append((' '.join(words[start:]), start == 0, position))
+        keys.sort()
+        self._keys = keys
+        self._key_texts = [key for key, _, _ in keys]
+
+    def __len__(self):
+        return len(self.teams)
+
+    def search(self, query, limit=MAX_RESULTS):
+        query = fold(query)
+        if not query:
+            return []
+
+        # Rank: exact name, name prefix, word prefix, then any substring.
+        ranks = {}
+        for position, names in enumerate(self._folded):
+            if query in names:
+                ranks[position] = 0
+
+        start = bisect.bisect_left(self._key_texts, query)
+        for key, is_name_start, position in self._keys[start:]:
+            if not key.startswith(query):
+                break
+            rank = 1 if is_name_start else 2
+            if rank < ranks.get(position, 4):
+                ranks[position] = rank
+
+        for position, names in enumerate(self._folded):
+            if position not in ranks and any(query in name for name in names):
+                ranks[position] = 3
+
+        ordered = sorted(ranks, key=lambda position: (ranks[position], self.teams[position]['name'] or ''))
+        return [self.teams[position] for position in ordered[:limit]]
+
+
+class TeamIndexStore(RefreshingIndexStore):
+    key = 'teams'
+    name = 'team index'
+
+    def __init__(self, ttl=TTL, competitions=COMPETITIONS):
+        super().__init__(ttl)
+        self.competitions = competitions
+
+    def ttl_for(self, index):
+        if len(index.teams_by_competition) < len(self.competitions):
+            return min(self.ttl, RETRY_AFTER)
+        return self.ttl
+
+    def _build(self, entries):
+        with self._lock:
+            previous = self._index.teams_by_competition if self._index else {}
+
+        teams_by_competition = {}
+        for entry in entries:
+            competition_id = entry['competition_id']
+            if entry['status'] == 'ok':
+                teams_by_competition[competition_id] = teams_from_standings(entry['data'])
+                continue
+
+            # A league that fails keeps the teams from the last good build.
+            with self._lock:
+                self.errors += 1
+            print(f"Error indexing teams for competition {competition_id}: {entry['error']}")
+            if competition_id in previous:
+                teams_by_competition[competition_id] = previous[competition_id]
+
+        index = TeamIndex(teams_by_competition)
+        with self._lock:
+            self._index = index
+            self.refreshes += 1
+        return index
+
+    def _load(self):
+        return self._build(standings_batch(self.competitions))
+
+    async def _load_async(self):
+        return self._build(await standings_batch_async(self.competitions))
+
+    def search(self, query, limit=MAX_RESULTS):
+        return self.get().search(query, limit)
+
+    async def search_async(self, query, limit=MAX_RESULTS):
+        return (await self.get_async()).search(query, limit)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'teams': len(self._index) if self._index else 0,
+                'competitions': sorted(self._index.teams_by_competition) if self._index else [],
+                'age': round(time.time() - self._index.fetched_at, 1) if self._index else None,
+                'refreshes': self.refreshes,
+                'errors': self.errors,
+            }
+
+
+team_index = TeamIndexStore()
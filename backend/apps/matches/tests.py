@@ -0,0 +1,306 @@
+import datetime
+import os
+import re
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.comments.counters import record_comment
+from apps.comments.models import Comment
+from apps.core.testing import endpoint_budget
+from apps.users.models import UserProfile
+from . import football_api, quota
+from .cache import encoded_cache, response_cache
+from .ingest import has_live_matches, ingest_live
+from .live_stream import LiveScoreBroadcaster
+from .match_index import MatchIndex, MatchQuery, query_matches, shape_payload
+from .models import Match
+from .parsers import PARSERS, lxml
+from .quota import PRIORITY_BACKFILL, PRIORITY_LIVE, PRIORITY_STANDINGS, QuotaExhausted, QuotaScheduler, SharedBudget
+from .singleflight import SingleFlight, fcntl
+from .streams import StreamScheduleIndex
+
+
+def match(match_id, hours=24):
+    kickoff = timezone.now() + datetime.timedelta(hours=hours)
+    return {
+        'id': match_id,
+        'utcDate': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'status': 'TIMED',
+        'competition': {'id': 2021},
+        'homeTeam': {'id': 57},
+        'awayTeam': {'id': 61},
+    }
+
+
+class MatchQueryBudgetTests(TransactionTestCase):
+    def setUp(self):
+        response_cache.clear()
+        encoded_cache.clear()
+        self.user = User.objects.create(username='fan')
+        UserProfile.objects.create(user=self.user, favorite_team_id=57)
+        record_comment(Comment.objects.create(user=self.user, match_id='1', content='hi'), 1)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=self.user).key)
+
+    def upstream(self, data):
+        return mock.patch.object(football_api, '_fetch', return_value=football_api.UpstreamResult(200, data, '"v1"'))
+
+    def test_matches(self):
+        with self.upstream({'matches': [match(1), match(2)]}), endpoint_budget('matches'):
+            response = self.client.get('/api/matches/live/')
+        self.assertEqual(response.json()['comment_counts'], {'1': 1, '2': 0})
+
+    def test_match_details(self):
+        with self.upstream(match(1)), endpoint_budget('match-details'):
+            response = self.client.get('/api/matches/match/1/')
+        self.assertEqual(response.json()['comment_count'], 1)
+
+    def test_next_fixture(self):
+        # Cold: no row for the team yet, so it is fetched and stored.
+        with self.upstream({'matches': [match(3)]}), endpoint_budget('next-fixture'):
+            response = self.client.get('/api/matches/next-fixture/')
+        self.assertEqual(response.json()['match']['id'], 3)
+
+        with endpoint_budget('next-fixture'):
+            response = self.client.get('/api/matches/next-fixture/')
+        self.assertEqual(response.json()['match']['id'], 3)
+
+
+@unittest.skipIf(fcntl is None, 'file single-flight needs fcntl')
+class FileSingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.lock_dir = directory.name
+        self.flight = SingleFlight(mode='file', lock_dir=self.lock_dir, file_ttl=60)
+
+    def age(self, seconds):
+        past = time.time() - seconds
+        for name in os.listdir(self.lock_dir):
+            os.utime(os.path.join(self.lock_dir, name), (past, past))
+
+    def test_sweep_keeps_recent_keys(self):
+        self.assertEqual(self.flight.do('/matches', lambda: [200, {}]), [200, {}])
+        self.assertEqual(self.flight.sweep(), 0)
+        self.assertEqual(len(os.listdir(self.lock_dir)), 2)
+
+    def test_sweep_removes_idle_keys(self):
+        self.flight.do('/matches', lambda: [200, {}])
+        self.age(120)
+        self.assertEqual(self.flight.sweep(), 2)
+        self.assertEqual(os.listdir(self.lock_dir), [])
+
+        # The key works again afterwards.
+        self.assertEqual(self.flight.do('/matches', lambda: [200, {'n': 2}]), [200, {'n': 2}])
+
+
+class LiveScoreBroadcasterTests(SimpleTestCase):
+    def poll(self, broadcaster, *matches):
+        feed = {'matches': [{'id': match_id, 'status': status} for match_id, status in matches]}
+        with mock.patch('apps.matches.live_stream.football_get', return_value=(200, feed)):
+            broadcaster.poll_once()
+
+    def test_state_follows_the_feed(self):
+        broadcaster = LiveScoreBroadcaster()
+        self.poll(broadcaster, (1, 'IN_PLAY'), (2, 'IN_PLAY'))
+        self.poll(broadcaster, (2, 'FINISHED'))
+        self.assertEqual({match_id: match['status'] for match_id, match in broadcaster._state.items()},
+                         {2: 'FINISHED'})
+        self.assertEqual(broadcaster.stats()['tracked_matches'], 1)
+
+
+class IngestLiveTests(TestCase):
+    def payload(self, match_id, status):
+        return {'id': match_id, 'status': status, 'utcDate': '2024-05-01T19:00:00Z',
+                'homeTeam': {'name': 'Home'}, 'awayTeam': {'name': 'Away'}}
+
+    def test_refetches_matches_that_left_the_live_feed(self):
+        Match.objects.create(match_id='1', home_team='Home', away_team='Away', status='IN_PLAY', date=timezone.now())
+        responses = [(200, {'matches': [self.payload(2, 'IN_PLAY')]}),
+                     (200, {'matches': [self.payload(1, 'FINISHED')]})]
+        with mock.patch('apps.matches.ingest.football_get', side_effect=responses) as get:
+            self.assertEqual(ingest_live(), 2)
+        self.assertEqual(get.call_args.kwargs['params'], {'ids': '1'})
+        self.assertEqual(Match.objects.get(match_id='1').status, 'FINISHED')
+
+    def test_stale_scheduled_match_is_not_live(self):
+        now = timezone.now()
+        match = Match.objects.create(match_id='1', home_team='Home', away_team='Away', status='TIMED',
+                                     date=now - datetime.timedelta(minutes=10))
+        self.assertTrue(has_live_matches(now))
+        match.date = now - datetime.timedelta(days=2)
+        match.save()
+        self.assertFalse(has_live_matches(now))
+
+
+class QuotaSchedulerTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.budget = SharedBudget(path=os.path.join(directory.name, 'quota.json'), requests_per_minute=10)
+        self.scheduler = QuotaScheduler(self.budget)
+        # Nothing waits for budget, so refusals are immediate.
+        patcher = mock.patch.dict(quota.MAX_WAIT, {priority: 0 for priority in quota.MAX_WAIT})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def drain(self, available):
+        self.budget.update(lambda state: state.update(available=available))
+
+    def test_reserved_tokens_are_kept_for_live(self):
+        self.drain(2)
+        for priority in (PRIORITY_BACKFILL, PRIORITY_STANDINGS):
+            with self.assertRaises(QuotaExhausted) as refused:
+                self.scheduler.acquire(priority)
+            self.assertGreater(refused.exception.retry_after, 0)
+
+        self.scheduler.acquire(PRIORITY_LIVE)
+        self.assertEqual(self.scheduler.stats()['available'], 1)
+        self.assertEqual((self.scheduler.granted, self.scheduler.rejected), (1, 2))
+
+    def test_empty_bucket_refuses_live_until_reset(self):
+        self.drain(0)
+        with self.assertRaises(QuotaExhausted) as refused:
+            self.scheduler.acquire(PRIORITY_LIVE)
+        self.assertTrue(1 <= refused.exception.retry_after <= 60)
+
+
+def schedule_row(kickoff, teams, stream_id):
+    return (f'{kickoff} premier league {teams} watch'.lower(), [f'/clip/s{stream_id}.html'],
+            [kickoff, 'Premier League', teams, 'Watch'])
+
+
+class StreamScheduleIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = StreamScheduleIndex([
+            schedule_row('20:00', 'Arsenal vs Chelsea', 1),
+            schedule_row('20:00', 'Manchester United vs Manchester City', 2),
+            schedule_row('20:00', 'Manchester City vs Liverpool', 3),
+            schedule_row('17:30', 'Brighton vs Wolves', 4),
+        ])
+
+    def test_club_suffix_is_ignored(self):
+        self.assertEqual(self.index.lookup('Arsenal FC', 'Chelsea FC', '20:00'), '1')
+
+    def test_swapped_home_and_away(self):
+        self.assertEqual(self.index.lookup('Chelsea FC', 'Arsenal FC', '20:00'), '1')
+        self.assertEqual(self.index.lookup('Wolves', 'Brighton & Hove Albion FC', '17:30'), '4')
+
+    def test_manchester_derby_is_not_confused(self):
+        self.assertEqual(self.index.lookup('Manchester United FC', 'Manchester City FC', '20:00'), '2')
+        self.assertEqual(self.index.lookup('Manchester City FC', 'Manchester United FC', '20:00'), '2')
+        self.assertEqual(self.index.lookup('Manchester City FC', 'Liverpool FC', '20:00'), '3')
+
+    def test_miss(self):
+        self.assertIsNone(self.index.lookup('Everton FC', 'Fulham FC', '20:00'))
+        self.assertIsNone(self.index.lookup('Arsenal FC', 'Chelsea FC', '17:30'))
+
+
+def indexed_match(match_id, competition_id, status, kickoff):
+    return {'id': match_id, 'competition': {'id': competition_id, 'name': 'League'}, 'status': status,
+            'utcDate': kickoff, 'homeTeam': {'id': 1, 'name': 'Home', 'crest': 'home.png'},
+            'awayTeam': {'id': 2, 'name': 'Away', 'crest': 'away.png'}}
+
+
+class MatchIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.data = {
+            'resultSet': {'count': 4, 'played': 1},
+            'matches': [
+                indexed_match(4, 2014, 'TIMED', '2025-05-03T12:00:00Z'),
+                indexed_match(1, 2021, 'FINISHED', '2025-05-01T15:00:00Z'),
+                indexed_match(2, 2021, 'IN_PLAY', '2025-05-02T23:30:00Z'),
+                indexed_match(3, 2002, 'POSTPONED', '2025-05-03T00:00:00Z'),
+            ],
+        }
+
+    def query(self, **params):
+        return MatchQuery.from_request(RequestFactory().get('/api/matches/', params))
+
+    def ids(self, **params):
+        return [match['id'] for match in MatchIndex(self.data['matches']).filter(self.query(**params))]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(competitions='2021,2002'), [1, 2, 3])
+        self.assertEqual(self.ids(competitions='2021', status='in_play'), [2])
+        self.assertEqual(self.ids(exclude_status='POSTPONED,FINISHED'), [2, 4])
+
+    def test_bare_date_to_includes_the_whole_day(self):
+        self.assertEqual(self.ids(date_from='2025-05-02', date_to='2025-05-02'), [2])
+        self.assertEqual(self.ids(date_to='2025-05-02T23:00:00Z'), [1])
+        self.assertEqual(self.ids(date_from='2025-05-03'), [3, 4])
+
+    def test_bad_values_are_rejected(self):
+        for params in ({'competitions': 'PL'}, {'date_to': '2025-13-01'}, {'fields': 'nope'}):
+            with self.assertRaises(ValueError):
+                self.query(**params)
+
+    def test_nested_fields_projection(self):
+        query = self.query(competitions='2002', fields='id,homeTeam.crest,homeTeam')
+        payload = shape_payload(self.data, query_matches(self.data, None, query), query)
+        self.assertEqual(payload['matches'], [{'id': 3, 'homeTeam': {'id': 1, 'name': 'Home', 'crest': 'home.png'}}])
+
+        query = self.query(fields='id,awayTeam.crest')
+        payload = shape_payload(self.data, query_matches(self.data, None, query), query)
+        self.assertEqual(payload['matches'][0], {'id': 4, 'awayTeam': {'crest': 'away.png'}})
+
+    def test_result_set_count_follows_the_filter(self):
+        query = self.query(status='TIMED,IN_PLAY')
+        payload = shape_payload(self.data, query_matches(self.data, None, query), query)
+        self.assertEqual(payload['resultSet'], {'count': 2, 'played': 1})
+
+        query = self.query(fields='id')
+        payload = shape_payload(self.data, query_matches(self.data, None, query), query)
+        self.assertEqual(payload['resultSet'], {'count': 4, 'played': 1})
+
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'benchmarks', 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as fixture:
+        return fixture.read()
+
+
+@unittest.skipIf(lxml is None, 'parser parity needs lxml')
+class ParserParityTests(SimpleTestCase):
+    def test_backends_find_the_same_events(self):
+        html = load_fixture('espn_scoreboard.html')
+        results = {name: parser_class().scoreboard(html) for name, parser_class in PARSERS.items()}
+        self.assertTrue(results['html.parser'])
+        self.assertEqual(results['lxml'], results['html.parser'])
+
+    def test_backends_find_the_same_streams(self):
+        html = load_fixture('techcabal_schedule.html')
+        queries = re.findall(r'<td class="time">([\d:]+)</td>.*?<td class="match">(.+?) vs (.+?)</td>', html)
+        self.assertTrue(queries)
+        results = {}
+        for name, parser_class in PARSERS.items():
+            index = StreamScheduleIndex(parser_class().stream_rows(html))
+            results[name] = [index.lookup(home, away, kickoff) for kickoff, home, away in queries]
+        self.assertTrue(all(results['html.parser']))
+        self.assertEqual(results['lxml'], results['html.parser'])
+
+
+class MatchListFieldsTests(TestCase):
+    def setUp(self):
+        Match.objects.create(match_id='m1', home_team='Arsenal', away_team='Chelsea', status='TIMED',
+                             date=timezone.now(), competition_id=2021)
+
+    def test_projects_serializer_fields(self):
+        response = APIClient().get('/api/matches/', {'fields': 'id,home_team'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()[0]), {'id', 'home_team'})
+
+    def test_rejects_upstream_field_names(self):
+        response = APIClient().get('/api/matches/', {'fields': 'homeTeam'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Unknown field: homeTeam'})
@@ -1,15 +1,24 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+upstream_views = async_views if settings.MATCHES_ASYNC_VIEWS else views
 
 urlpatterns = [
     path('', views.match_list, name='match-list'),
-    path('live/', views.get_matches, name='matches'),
-    path('standings/<int:competition_id>/', views.get_standings, name='standings'),
-    path('standings/', views.get_standings, name='premier-league-standings'),
-    path('match/<int:match_id>/', views.get_match_details, name='match-details'),
-    path('fetch-source/', views.fetch_site_source, name='fetch-site-source'),
-    path('team/<int:team_id>/', views.get_team_matches, name='team-matches'),
-    path('stream-embed/', views.get_stream_embed, name='get-stream-embed'),
-    path('match-events/<int:match_id>/', views.get_match_events, name='match-events'),
+    path('live/', upstream_views.get_matches, name='matches'),
+    path('live/stream/', async_views.live_stream, name='live-stream'),
+    path('standings/batch/', upstream_views.get_standings_batch, name='standings-batch'),
+    path('standings/<int:competition_id>/', upstream_views.get_standings, name='standings'),
+    path('standings/', upstream_views.get_standings, name='premier-league-standings'),
+    path('match/<int:match_id>/', upstream_views.get_match_details, name='match-details'),
+    path('fetch-source/', upstream_views.fetch_site_source, name='fetch-site-source'),
+    path('team/<int:team_id>/', upstream_views.get_team_matches, name='team-matches'),
+    path('next-fixture/', views.next_fixture, name='next-fixture'),
+    path('teams/search/', upstream_views.search_teams, name='team-search'),
+    path('stream-embed/', upstream_views.get_stream_embed, name='get-stream-embed'),
+    path('match-events/<int:match_id>/', upstream_views.get_match_events, name='match-events'),
     path('format-date/', views.format_date, name='format-date'),
+    path('format-dates/', views.format_dates, name='format-dates'),
+    path('cache-stats/', views.cache_stats, name='cache-stats'),
 ]
\ No newline at end of file
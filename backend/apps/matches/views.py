@@ -1,27 +1,60 @@
 import os
-import requests
 from django.shortcuts import render
 from rest_framework import status
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from django.conf import settings
 from .models import Match
+from apps.users.models import UserProfile
 from rest_framework import serializers
 from django.http import HttpResponse
 from django.views import View
 import json
-from bs4 import BeautifulSoup
 import datetime
-import pytz
-
-FOOTBALL_API_URL = 'https://api.football-data.org/v4'
-FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
+from django.views.decorators.http import require_GET
+from .cache import encoded_body, match_ttl, matches_ttl, response_cache, standings_ttl, team_matches_ttl
+from apps.core.renderers import PreRenderedJSON
+from apps.core.http_client import http_client
+from apps.core.etags import etag_matches, make_etag, negotiated_etag, not_modified, with_etag
+from apps.comments.counters import match_comment_counts
+from .dates import (
+    FORMAT_TYPES,
+    MAX_BULK_DATES,
+    bg_today,
+    format_match_date,
+    format_match_dates,
+    parse_utc_date,
+    wants_formatted_dates,
+    with_formatted_dates,
+)
+from .football_api import football_fetch, football_get
+from .match_index import MatchQuery, project, query_matches, shape_payload
+from .next_fixtures import next_fixture_for
+from .live_stream import live_broadcaster
+from .scoreboard import get_scoreboard_index, scoreboard_cache
+from .scraping import SCRAPE_HEADERS, stream_url_for
+from .streams import stream_index
+from .standings import MAX_COMPETITIONS, parse_competition_ids, standings_batch
+from .teams import MAX_RESULTS, team_index
+from .quota import PRIORITY_LIVE, PRIORITY_MATCH_DETAILS, PRIORITY_STANDINGS, QuotaExhausted, quota_scheduler
+from .singleflight import upstream_flight
 
 class MatchSerializer(serializers.ModelSerializer):
     class Meta:
         model = Match
         fields = ['id', 'match_id', 'home_team', 'away_team', 'score', 'status', 'date']
 
+def encoded_response(endpoint, etag, build):
+    # Proxied payloads are encoded once per ETag, not once per request.
+    return with_etag(Response(PreRenderedJSON(encoded_body(endpoint, etag, build))), etag)
+
+def rate_limited_response(error):
+    return Response({
+        'error': str(error),
+        'retry_after': error.retry_after
+    }, status=429, headers={'Retry-After': str(error.retry_after)})
+
 @api_view(['GET'])
 def format_date(request):
     try:
@@ -31,77 +64,157 @@ def format_date(request):
         if not utc_date_str:
             return Response({'error': 'utc_date parameter is required'}, status=400)
 
-        utc_date = datetime.datetime.fromisoformat(utc_date_str.replace('Z', '+00:00'))
-        
-        bg_timezone = pytz.timezone('Europe/Sofia')
-        bg_date = utc_date.astimezone(bg_timezone)
-        
-        if format_type == 'time_only':
-            formatted_date = bg_date.strftime('%H:%M')
-            return Response({'formatted_date': formatted_date})
-        elif format_type == 'date_time':
-            month_day = bg_date.strftime('%d %b')
-            time = bg_date.strftime('%H:%M')
-            formatted_date = f"{month_day}, {time}"
-            return Response({'formatted_date': formatted_date})
-        elif format_type == 'match_status':
-            today = datetime.datetime.now(bg_timezone).date()
-            tomorrow = today + datetime.timedelta(days=1)
-            
-            if bg_date.date() == today:
-                formatted_date = bg_date.strftime('%H:%M')
-            elif bg_date.date() == tomorrow:
-                formatted_date = f"Tomorrow, {bg_date.strftime('%H:%M')}"
-            else:
-                month_day = bg_date.strftime('%d %b')
-                time = bg_date.strftime('%H:%M')
-                formatted_date = f"{month_day}, {time}"
-                
-            return Response({'formatted_date': formatted_date})
-        else:
+        parse_utc_date(utc_date_str)
+
+        if format_type not in FORMAT_TYPES:
             return Response({'error': 'Invalid format_type parameter'}, status=400)
+
+        return Response({'formatted_date': format_match_date(utc_date_str, format_type)})
             
     except ValueError as e:
         return Response({'error': f'Invalid date format: {str(e)}'}, status=400)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def format_dates(request):
+    try:
+        utc_dates = request.data.get('utc_dates')
+        format_types = request.data.get('format_types') or ['match_status']
+
+        if not isinstance(utc_dates, list) or not utc_dates:
+            return Response({'error': 'utc_dates must be a non-empty list'}, status=400)
+        if len(utc_dates) > MAX_BULK_DATES:
+            return Response({'error': f'At most {MAX_BULK_DATES} utc_dates per request'}, status=400)
+        if not isinstance(format_types, list) or any(format_type not in FORMAT_TYPES for format_type in format_types):
+            return Response({'error': f"format_types must be a list of {', '.join(FORMAT_TYPES)}"}, status=400)
+
+        today = bg_today()
+        formatted = {}
+        errors = {}
+        for utc_date_str in map(str, utc_dates):
+            try:
+                formatted[utc_date_str] = format_match_dates(utc_date_str, format_types, today)
+            except ValueError as e:
+                errors[utc_date_str] = f'Invalid date format: {str(e)}'
+
+        return Response({'formatted_dates': formatted, 'errors': errors})
+
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+@api_view(['GET'])
+def cache_stats(request):
+    return Response({
+        'cache': response_cache.stats(),
+        'single_flight': upstream_flight.stats(),
+        'upstream': http_client.stats(),
+        'quota': quota_scheduler.stats(),
+        'live_stream': live_broadcaster.stats(),
+        'scoreboard': scoreboard_cache.stats(),
+        'stream_index': stream_index.stats(),
+        'team_index': team_index.stats(),
+    })
+
 @api_view(['GET'])
 def match_list(request):
+    try:
+        # fields= names this endpoint's columns, not the upstream match keys.
+        query = MatchQuery.from_request(request, known_fields=MatchSerializer.Meta.fields)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+
     matches = Match.objects.all().order_by('-date')
+    if query.competitions:
+        matches = matches.filter(competition_id__in=query.competitions)
+    if query.statuses:
+        matches = matches.filter(status__in=query.statuses)
+    if query.exclude_statuses:
+        matches = matches.exclude(status__in=query.exclude_statuses)
+    if query.date_from:
+        matches = matches.filter(date__gte=query.date_from)
+    if query.date_to:
+        matches = matches.filter(date__lt=query.date_to)
     serializer = MatchSerializer(matches, many=True)
-    return Response(serializer.data)
+    return Response([project(match, query.fields) for match in serializer.data])
 
 @api_view(['GET'])
 def get_matches(request):
     try:
-        response = requests.get(
-            f'{FOOTBALL_API_URL}/matches',
-            headers={'X-Auth-Token': FOOTBALL_API_KEY}
-        )
-        return Response(response.json())
+        query = MatchQuery.from_request(request)
+        result = football_fetch('/matches', ttl=matches_ttl, priority=PRIORITY_LIVE)
+        matches = query_matches(result.data, result.etag, query)
+        comment_counts = match_comment_counts([match['id'] for match in matches])
+
+        # match_status depends on the current day, so it is part of the validator.
+        today = bg_today() if wants_formatted_dates(request) else None
+        etag = negotiated_etag(request, make_etag(result.etag, comment_counts, today, query.key()))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return encoded_response('matches', etag, lambda: {
+            **shape_payload(result.data, matches, query, today),
+            'comment_counts': comment_counts,
+        })
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 @api_view(['GET'])
 def get_standings(request, competition_id=2021):
     try:
-        response = requests.get(
-            f'{FOOTBALL_API_URL}/competitions/{competition_id}/standings',
-            headers={'X-Auth-Token': FOOTBALL_API_KEY}
+        result = football_fetch(
+            f'/competitions/{competition_id}/standings',
+            ttl=standings_ttl,
+            priority=PRIORITY_STANDINGS
         )
-        return Response(response.json())
+        etag = negotiated_etag(request, result.etag)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return encoded_response('standings', etag, lambda: result.data)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+@api_view(['GET'])
+def get_standings_batch(request):
+    try:
+        competition_ids = parse_competition_ids(request.query_params.get('competitions'))
+        if not competition_ids or len(competition_ids) > MAX_COMPETITIONS:
+            return Response({'error': f'competitions must list 1 to {MAX_COMPETITIONS} competition ids'}, status=400)
+
+        standings = standings_batch(competition_ids)
+        etag = negotiated_etag(request, make_etag(
+            [(entry['competition_id'], entry['status'], entry.get('etag')) for entry in standings]
+        ))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        return with_etag(Response({'standings': standings}), etag)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 @api_view(['GET'])
 def get_match_details(request, match_id):
     try:
-        response = requests.get(
-            f'{FOOTBALL_API_URL}/matches/{match_id}',
-            headers={'X-Auth-Token': FOOTBALL_API_KEY}
-        )
-        return Response({'match': response.json()})
+        result = football_fetch(f'/matches/{match_id}', ttl=match_ttl, priority=PRIORITY_MATCH_DETAILS)
+        comment_count = match_comment_counts([match_id])[str(match_id)]
+
+        today = bg_today() if wants_formatted_dates(request) else None
+        etag = negotiated_etag(request, make_etag(result.etag, comment_count, today))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return encoded_response('match-details', etag, lambda: {
+            'match': with_formatted_dates(result.data, today) if today else result.data,
+            'comment_count': comment_count,
+        })
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
@@ -116,11 +229,7 @@ def fetch_site_source(request):
                 'error': 'URL parameter is required',
             }, status=400)
             
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_client.get(url, headers=SCRAPE_HEADERS)
         status_code = response.status_code
         
         html_source = response.text
@@ -139,25 +248,79 @@ def fetch_site_source(request):
 @api_view(['GET'])
 def get_team_matches(request, team_id):
     try:
+        query = MatchQuery.from_request(request)
         today = datetime.datetime.now().strftime('%Y-%m-%d')
         thirty_days_later = (datetime.datetime.now() + datetime.timedelta(days=30)).strftime('%Y-%m-%d')
         
-        response = requests.get(
-            f'{FOOTBALL_API_URL}/teams/{team_id}/matches',
+        result = football_fetch(
+            f'/teams/{team_id}/matches',
             params={
                 'dateFrom': today,
                 'dateTo': thirty_days_later,
                 'status': 'SCHEDULED,TIMED'
             },
-            headers={'X-Auth-Token': FOOTBALL_API_KEY}
+            ttl=team_matches_ttl,
+            priority=PRIORITY_STANDINGS
         )
         
-        if response.status_code == 200:
-            return Response(response.json())
+        if result.status_code == 200:
+            etag = negotiated_etag(request, make_etag(result.etag, query.key()))
+            if etag_matches(request, etag):
+                return not_modified(etag)
+            return encoded_response('team-matches', etag, lambda: shape_payload(
+                result.data, query_matches(result.data, result.etag, query), query
+            ))
         else:
             return Response({
-                'error': f"Failed to fetch team matches: {response.status_code}"
-            }, status=response.status_code)
+                'error': f"Failed to fetch team matches: {result.status_code}"
+            }, status=result.status_code)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=400)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+def search_limit(request):
+    try:
+        return max(1, min(int(request.query_params.get('limit', MAX_RESULTS)), MAX_RESULTS))
+    except ValueError:
+        return MAX_RESULTS
+
+@api_view(['GET'])
+def search_teams(request):
+    try:
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q parameter is required'}, status=400)
+
+        return Response({'teams': team_index.search(query, search_limit(request))})
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
+    except Exception as e:
+        return Response({'error': str(e)}, status=500)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def next_fixture(request):
+    try:
+        team_id = UserProfile.objects.filter(user=request.user).values_list('favorite_team_id', flat=True).first()
+        if team_id is None:
+            return Response({'team_id': None, 'match': None, 'refreshed_at': None})
+
+        fixture = next_fixture_for(team_id)
+        today = bg_today() if wants_formatted_dates(request) and fixture.match else None
+        etag = negotiated_etag(request, make_etag(team_id, fixture.refreshed_at, today))
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+        return with_etag(Response({
+            'team_id': team_id,
+            'match': with_formatted_dates(fixture.match, today) if today else fixture.match,
+            'refreshed_at': fixture.refreshed_at,
+        }), etag)
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
@@ -173,58 +336,11 @@ def get_stream_embed(request):
                 'error': 'home_team, away_team, and match_date parameters are required',
             }, status=400)
             
-        targetUrl = "https://techcabal.net/schedule/soccerstreams/"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-        }
-        
-        response = requests.get(targetUrl, headers=headers, timeout=10)
-        
-        if response.status_code != 200:
-            return Response({
-                'error': f'Failed to fetch stream source: {response.status_code}',
-            }, status=response.status_code)
-        
-        html_source = response.text
-        soup = BeautifulSoup(html_source, 'html.parser')
-        
-        tables = soup.find_all('table')
-        
-        if not tables or len(tables) == 0:
-            return Response({
-                'stream_url': None
-            })
-        
-        matchDate = datetime.datetime.fromisoformat(match_date_str.replace('Z', '+00:00'))
-        timeToFind = matchDate.strftime('%H:%M')
-        
-        home_first_letter = home_team[0].lower()
-        away_first_letter = away_team[0].lower()
-        
-        rows = tables[0].find_all('tr')
-        
-        streamId = None
-        
-        for i, row in enumerate(rows):
-            row_text = row.get_text().strip().lower()
-            
-            if timeToFind in row_text and home_first_letter in row_text and away_first_letter in row_text:
-                links = row.find_all('a')
-                for link in links:
-                    href = link.get('href', '')
-                    if href and '/s' in href:
-                        matchUrl = href.split('/s')
-                        if len(matchUrl) > 1:
-                            streamId = matchUrl[1].split('.')[0].replace('/', '')
-                            break
-                if streamId:
-                    break
+        streamId = stream_index.find_stream_id(home_team, away_team, match_date_str)
         
         if streamId:
-            stream_url = f"https://techcabal.net/clip/s{streamId}.html"
             return Response({
-                'stream_url': stream_url
+                'stream_url': stream_url_for(streamId)
             })
         else:
             return Response({
@@ -240,17 +356,13 @@ def get_stream_embed(request):
 @api_view(['GET'])
 def get_match_events(request, match_id):
     try:
-        response = requests.get(
-            f'{FOOTBALL_API_URL}/matches/{match_id}',
-            headers={'X-Auth-Token': FOOTBALL_API_KEY}
-        )
+        status_code, match_data = football_get(f'/matches/{match_id}', ttl=match_ttl, priority=PRIORITY_MATCH_DETAILS)
         
-        if response.status_code != 200:
+        if status_code != 200:
             return Response({
-                'error': f'Failed to fetch match data: {response.status_code}'
-            }, status=response.status_code)
+                'error': f'Failed to fetch match data: {status_code}'
+            }, status=status_code)
         
-        match_data = response.json()
         home_team = match_data.get('homeTeam', {}).get('name', '')
         away_team = match_data.get('awayTeam', {}).get('name', '')
 
@@ -263,123 +375,22 @@ def get_match_events(request, match_id):
                 'awayTeamEvents': []
             })
 
-        year = match_date.strftime('%Y')
-        month = match_date.strftime('%m')
-        day = match_date.strftime('%d')
-        formatted_date = f"{year}{month}{day}"
-        
-        espn_url = f"https://www.espn.com/soccer/scoreboard/_/date/{formatted_date}"
-
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36',
-        }
-        
-        espn_response = requests.get(espn_url, headers=headers, timeout=10)
+        scoreboard = get_scoreboard_index(match_date)
         
-        if espn_response.status_code != 200:
+        if scoreboard is None:
             return Response({
                 'homeTeamEvents': [],
                 'awayTeamEvents': []
             })
 
-        home_events = []
-        away_events = []
-        
-        soup = BeautifulSoup(espn_response.text, 'html.parser')
-
-        card_sections = soup.select('section.Card.gameModules')
-        
-        for card in card_sections:
-            header = card.select_one('header.Card__Header')
-            if not header:
-                continue
-                
-            league_label = header.get('aria-label', '')
-            if not league_label:
-                continue
-                
-            top5_leagues = [
-                "English Premier League",
-                "Spanish LALIGA",
-                "German Bundesliga",
-                "Italian Serie A",
-                "French Ligue 1",
-                "UEFA Champions League",
-                "UEFA Europa League",
-            ]
-            
-            if not any(league in league_label for league in top5_leagues):
-                continue
-                
-            teams = card.select('.SoccerPerformers__Competitor__Team__Name')
-            
-            for i, team_element in enumerate(teams):
-                team_name = team_element.get_text().strip()
-                
-                if (team_name in home_team or home_team in team_name or 
-                    team_name in away_team or away_team in team_name):
-                    
-                    competitor_section = team_element.find_parent(class_='SoccerPerformers__Competitor')
-                    if not competitor_section:
-                        continue
-                        
-                    is_home_team = team_name in home_team or home_team in team_name
-                    events_array = home_events if is_home_team else away_events
-                    
-                    goal_infos = competitor_section.select('.SoccerPerformers__Competitor__Info')
-                    
-                    for info_section in goal_infos:
-                        is_red_card = info_section.select_one('.SoccerPerformers__RedCardIcon')
-                        
-                        if is_red_card:
-                            red_card_items = info_section.select('.SoccerPerformers__Competitor__Info__GoalsList__Item')
-                            
-                            for item in red_card_items:
-                                player_el = item.select_one('.Soccer__PlayerName')
-                                time_el = item.select_one('.GoalScore__Time')
-                                
-                                if player_el and time_el:
-                                    player_name = player_el.get_text().strip().replace('-', '')
-                                    time = time_el.get_text().strip().replace('-', '').replace(' ', '')
-                                    
-                                    events_array.append({
-                                        'type': 'red',
-                                        'player': player_name,
-                                        'time': time
-                                    })
-                        
-                        elif info_section.select_one('.SoccerPerformers__GoalIcon'):
-                            no_goals = info_section.select_one('.SoccerPerformers__Competitor__Info__GoalsList--noGoals')
-                            if no_goals:
-                                continue
-                                
-                            goal_items = info_section.select('.SoccerPerformers__Competitor__Info__GoalsList__Item')
-                            
-                            for item in goal_items:
-                                player_el = item.select_one('.Soccer__PlayerName')
-                                time_el = item.select_one('.GoalScore__Time')
-                                
-                                if player_el and time_el:
-                                    player_name = player_el.get_text().strip().replace('-', '')
-                                    time = time_el.get_text().strip().replace('-', '').replace(' ', '')
-                                    
-                                    if 'OG' in time:
-                                        events_array.append({
-                                            'type': 'own',
-                                            'player': player_name,
-                                            'time': time.replace('OG', '').strip()
-                                        })
-                                    else:
-                                        events_array.append({
-                                            'type': 'goal',
-                                            'player': player_name,
-                                            'time': time
-                                        })
+        home_events, away_events = scoreboard.events_for(home_team, away_team)
         
         return Response({
             'homeTeamEvents': home_events,
             'awayTeamEvents': away_events
         })
         
+    except QuotaExhausted as e:
+        return rate_limited_response(e)
     except Exception as e:
         return Response({'error': str(e)}, status=500)
\ No newline at end of file
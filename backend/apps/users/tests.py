@@ -0,0 +1,26 @@
+from django.contrib.auth.models import User
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from apps.comments.models import Comment
+from apps.comments.counters import record_comment
+from apps.core.testing import endpoint_budget
+from .models import UserProfile
+
+
+class PublicProfileQueryBudgetTests(TransactionTestCase):
+    def test_public_profile(self):
+        user = User.objects.create(username='fan')
+        UserProfile.objects.create(user=user, favorite_team_id=57)
+        record_comment(Comment.objects.create(user=user, match_id='1', content='hi'), 1)
+
+        with endpoint_budget('public-profile'):
+            response = APIClient().get('/api/users/profile/fan/')
+        self.assertEqual(response.json()['comment_count'], 1)
+
+    def test_public_profile_without_profile(self):
+        User.objects.create(username='new')
+
+        with endpoint_budget('public-profile'):
+            response = APIClient().get('/api/users/profile/new/')
+        self.assertEqual(response.json()['comment_count'], 0)
@@ -10,7 +10,6 @@ from rest_framework import serializers
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.authtoken.models import Token
 from datetime import timedelta
-from apps.comments.models import Comment
 
 class UserSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True)
@@ -94,10 +93,13 @@ def user_details(request):
 @api_view(['GET'])
 def public_profile(request, username):
     try:
-        user = User.objects.get(username=username)
-        profile, created = UserProfile.objects.get_or_create(user=user)
+        user = User.objects.select_related('profile', 'comment_counter').get(username=username)
+        if hasattr(user, 'profile'):
+            profile = user.profile
+        else:
+            profile, created = UserProfile.objects.get_or_create(user=user)
         
-        comment_count = Comment.objects.filter(user=user).count()
+        comment_count = user.comment_counter.count if hasattr(user, 'comment_counter') else 0
         
         local_date = user.date_joined + timedelta(hours=3)
         
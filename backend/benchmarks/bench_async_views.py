@@ -0,0 +1,164 @@
+"""Compare concurrent-request capacity of the sync (WSGI) and async (ASGI)
+match views against a slow local stand-in for football-data.org.
+
+    python -m benchmarks.bench_async_views --requests 200 --delay 0.2 --threads 8
+
+Each mode runs in its own interpreter because MATCHES_ASYNC_VIEWS is read
+when the URLconf is imported.
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SlowUpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    delay = 0.2
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        match_id = self.path.rstrip('/').rsplit('/', 1)[-1]
+        body = json.dumps({
+            'id': match_id,
+            'status': 'TIMED',
+            'utcDate': '2030-01-01T20:00:00Z',
+            'homeTeam': {'name': 'Home FC'},
+            'awayTeam': {'name': 'Away FC'},
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SlowUpstreamServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def summarize(mode, latencies, elapsed, options):
+    return {
+        'mode': mode,
+        'requests': options.requests,
+        'threads': options.threads if mode == 'sync' else None,
+        'upstream_delay_ms': options.delay * 1000,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(options.requests / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+    }
+
+
+def run_sync(options):
+    from django.test import Client
+
+    def one(match_id):
+        started = time.perf_counter()
+        response = Client().get(f'/api/matches/match/{match_id}/')
+        assert response.status_code == 200, response.content
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=options.threads) as pool:
+        latencies = list(pool.map(one, range(1, options.requests + 1)))
+    return summarize('sync', latencies, time.perf_counter() - started, options)
+
+
+def run_async(options):
+    from django.test import AsyncClient
+
+    async def one(client, match_id):
+        started = time.perf_counter()
+        response = await client.get(f'/api/matches/match/{match_id}/')
+        assert response.status_code == 200, response.content
+        return time.perf_counter() - started
+
+    async def run_all():
+        client = AsyncClient()
+        return await asyncio.gather(*(one(client, match_id) for match_id in range(1, options.requests + 1)))
+
+    started = time.perf_counter()
+    latencies = asyncio.run(run_all())
+    return summarize('async', latencies, time.perf_counter() - started, options)
+
+
+def run_mode(options):
+    import django
+    django.setup()
+
+    from django.core.management import call_command
+
+    # The views read comment counters. The main thread's connection stays
+    # open, which keeps the shared in-memory database alive for the workers.
+    call_command('migrate', verbosity=0)
+
+    if options.mode == 'async':
+        return run_async(options)
+    return run_sync(options)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--delay', type=float, default=0.2, help='Upstream latency in seconds')
+    parser.add_argument('--threads', type=int, default=8, help='Worker threads for the sync run')
+    parser.add_argument('--mode', choices=['sync', 'async'])
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    options = parser.parse_args()
+
+    if options.mode:
+        print(json.dumps(run_mode(options)))
+        return
+
+    SlowUpstreamHandler.delay = options.delay
+    server = SlowUpstreamServer(('127.0.0.1', 0), SlowUpstreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = []
+    try:
+        for mode in ('sync', 'async'):
+            env = dict(
+                os.environ,
+                DJANGO_SETTINGS_MODULE='benchmarks.settings',
+                FOOTBALL_API_URL=f'http://127.0.0.1:{server.server_address[1]}/v4',
+                MATCHES_ASYNC_VIEWS='True' if mode == 'async' else 'False',
+            )
+            command = [
+                sys.executable, '-m', 'benchmarks.bench_async_views',
+                '--mode', mode,
+                '--requests', str(options.requests),
+                '--delay', str(options.delay),
+                '--threads', str(options.threads),
+            ]
+            completed = subprocess.run(command, env=env, capture_output=True, text=True, check=True)
+            results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    finally:
+        server.shutdown()
+
+    for result in results:
+        print(f"{result['mode']:>5}: {result['throughput_rps']:>8} req/s  "
+              f"p50 {result['p50_ms']:>8} ms  p99 {result['p99_ms']:>8} ms")
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
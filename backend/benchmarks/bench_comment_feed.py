@@ -0,0 +1,71 @@
+"""comment_list_all at shallow and deep positions, in page (OFFSET) mode
+and cursor (keyset) mode, over a synthetic comment table."""
+import datetime
+
+from benchmarks.common import time_call
+
+PAGE_SIZE = 20
+
+
+def seed(rows):
+    from django.contrib.auth.models import User
+    from django.core.cache import cache
+
+    from apps.comments.models import Comment, MatchSnapshot
+
+    Comment.objects.all().delete()
+    MatchSnapshot.objects.all().delete()
+    User.objects.all().delete()
+    cache.clear()
+
+    users = User.objects.bulk_create([User(username=f'user{i}') for i in range(max(rows // 50, 1))])
+    snapshots = MatchSnapshot.objects.bulk_create([
+        MatchSnapshot(match_id=str(500000 + i), home_team_name=f'Home {i}', away_team_name=f'Away {i}',
+                      status='FINISHED', score={'fullTime': {'home': 1, 'away': 0}})
+        for i in range(max(rows // 100, 1))
+    ])
+
+    started = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+    batch = []
+    for i in range(rows):
+        snapshot = snapshots[i % len(snapshots)]
+        batch.append(Comment(user=users[i % len(users)], match_id=snapshot.match_id, snapshot=snapshot,
+                             content=f'Comment {i}'))
+        if len(batch) == 5000:
+            Comment.objects.bulk_create(batch)
+            batch = []
+    Comment.objects.bulk_create(batch)
+    # created_at is auto_now_add, spread it out afterwards so ordering is meaningful.
+    Comment.objects.update(created_at=started)
+    for offset in range(0, rows, 5000):
+        Comment.objects.filter(id__gt=offset, id__lte=offset + 5000).update(
+            created_at=started + datetime.timedelta(minutes=offset)
+        )
+
+
+def run(options):
+    from rest_framework.test import APIRequestFactory
+
+    from apps.comments.models import Comment
+    from apps.comments.pagination import encode_cursor
+    from apps.comments.views import comment_list_all
+
+    factory = APIRequestFactory()
+    results = []
+    for rows in options.rows:
+        seed(rows)
+        ordered = Comment.objects.order_by('-created_at', '-id')
+        last_page = max((rows + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+
+        for depth, page in (('first', 1), ('middle', max(last_page // 2, 1)), ('last', last_page)):
+            params = {'page': page, 'page_size': PAGE_SIZE}
+            request = lambda: comment_list_all(factory.get('/api/comments/', params))
+            results.append(dict(benchmark='feed.page', rows=rows, depth=depth,
+                                **time_call(request, options.repeat)))
+
+            offset = (page - 1) * PAGE_SIZE
+            cursor = encode_cursor(ordered[offset - 1], 'next') if offset else ''
+            cursor_request = lambda: comment_list_all(factory.get('/api/comments/', {'cursor': cursor, 'page_size': PAGE_SIZE}))
+            results.append(dict(benchmark='feed.cursor', rows=rows, depth=depth,
+                                **time_call(cursor_request, options.repeat)))
+    return results
@@ -0,0 +1,82 @@
+"""Parse-time benchmark for the HTML parser backends.
+
+    python -m benchmarks.bench_parsers --repeat 20
+
+The fixtures in benchmarks/fixtures are synthetic pages that follow the
+markup get_match_events and get_stream_embed read on ESPN and techcabal.
+apps.matches.tests checks that the backends agree on every event and stream id.
+"""
+import argparse
+import json
+import os
+import re
+
+import django
+
+from benchmarks.common import load_fixture, time_call
+
+
+def stream_queries(schedule_html):
+    # One lookup per fixture row: kickoff time plus both team names.
+    for kickoff, home, away in re.findall(r'<td class="time">([\d:]+)</td>.*?<td class="match">(.+?) vs (.+?)</td>', schedule_html):
+        yield home, away, f'2025-05-01T{kickoff}:00Z'
+
+
+def lookup(index, home, away, match_date_str):
+    return index.lookup(home, away, match_date_str[11:16])
+
+
+def run(repeat):
+    from apps.matches.parsers import PARSERS, html_parser
+    from apps.matches.streams import StreamScheduleIndex
+
+    scoreboard_html = load_fixture('espn_scoreboard.html')
+    schedule_html = load_fixture('techcabal_schedule.html')
+    queries = list(stream_queries(schedule_html))
+
+    scoreboard = html_parser.scoreboard(scoreboard_html)
+    index = StreamScheduleIndex(html_parser.stream_rows(schedule_html))
+    summary = {
+        'teams': len(scoreboard),
+        'events': sum(len(team_events) for team_events in scoreboard.values()),
+        'streams': sum(1 for query in queries if lookup(index, *query)),
+        'queries': len(queries),
+    }
+
+    results = []
+    for name, parser_class in PARSERS.items():
+        parser = parser_class()
+        results.append(dict(benchmark='parse.espn_scoreboard', backend=name, bytes=len(scoreboard_html),
+                            **time_call(lambda: parser.scoreboard(scoreboard_html), repeat)))
+        results.append(dict(benchmark='parse.techcabal_schedule', backend=name, bytes=len(schedule_html),
+                            **time_call(lambda: parser.stream_rows(schedule_html), repeat)))
+        index = StreamScheduleIndex(parser.stream_rows(schedule_html))
+        results.append(dict(benchmark='lookup.stream_index', backend=name, rows=len(index),
+                            **time_call(lambda: [lookup(index, *query) for query in queries], repeat)))
+    return results, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    results, summary = run(options.repeat)
+
+    print(f"scoreboard: {summary['teams']} teams, {summary['events']} events; "
+          f"schedule: {summary['streams']}/{summary['queries']} streams found")
+    for result in results:
+        print(f"{result['benchmark']:<26} {result['backend']:<12} "
+              f"min {result['min_ms']:>9.3f} ms  median {result['median_ms']:>9.3f} ms")
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
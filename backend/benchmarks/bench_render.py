@@ -0,0 +1,83 @@
+"""JSON rendering, compression and the encoded-bytes cache: DRF's stdlib
+renderer against ORJSONRenderer, and /api/matches/live/ through the full
+middleware stack with its caches cold and warm."""
+from unittest import mock
+
+from benchmarks.common import time_call
+
+MATCH_COUNTS = (50, 400)
+
+
+def build_payload(count):
+    return {
+        'filters': {'dateFrom': '2025-05-01', 'dateTo': '2025-05-08'},
+        'resultSet': {'count': count, 'first': '2025-05-01', 'last': '2025-05-08', 'played': count // 2},
+        'matches': [
+            {
+                'area': {'id': 2072, 'name': 'England', 'code': 'ENG', 'flag': 'https://crests.football-data.org/770.svg'},
+                'competition': {'id': 2021, 'name': 'Premier League', 'code': 'PL', 'type': 'LEAGUE',
+                                'emblem': 'https://crests.football-data.org/PL.png'},
+                'season': {'id': 2287, 'startDate': '2024-08-16', 'endDate': '2025-05-25', 'currentMatchday': 35},
+                'id': 500000 + i,
+                'utcDate': f'2025-05-0{1 + i % 7}T{12 + i % 9}:00:00Z',
+                'status': ('FINISHED', 'TIMED', 'IN_PLAY')[i % 3],
+                'matchday': 35,
+                'stage': 'REGULAR_SEASON',
+                'group': None,
+                'lastUpdated': '2025-05-01T08:20:51Z',
+                'homeTeam': {'id': i * 2, 'name': f'Home Team {i} FC', 'shortName': f'Home {i}', 'tla': 'HOM',
+                             'crest': f'https://crests.football-data.org/{i * 2}.png'},
+                'awayTeam': {'id': i * 2 + 1, 'name': f'Away Team {i} FC', 'shortName': f'Away {i}', 'tla': 'AWA',
+                             'crest': f'https://crests.football-data.org/{i * 2 + 1}.png'},
+                'score': {'winner': 'HOME_TEAM', 'duration': 'REGULAR',
+                          'fullTime': {'home': i % 4, 'away': i % 3}, 'halfTime': {'home': i % 2, 'away': 0}},
+                'odds': {'msg': 'Activate Odds-Package in User-Panel to retrieve odds.'},
+                'referees': [{'id': 11605, 'name': 'Michael Oliver', 'type': 'REFEREE', 'nationality': 'England'}],
+            }
+            for i in range(count)
+        ],
+    }
+
+
+def run(options):
+    from django.test import Client
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.core.compression import COMPRESSORS, compressed_cache
+    from apps.core.renderers import ORJSONRenderer, orjson
+    from apps.matches import football_api
+    from apps.matches.cache import encoded_cache, response_cache
+
+    results = []
+    for count in MATCH_COUNTS:
+        payload = build_payload(count)
+        body = JSONRenderer().render(payload)
+        if orjson is not None:
+            assert ORJSONRenderer().render(payload) == body, 'orjson output differs from JSONRenderer'
+
+        for name, renderer in (('json', JSONRenderer()), ('orjson', ORJSONRenderer())):
+            results.append(dict(benchmark='render', renderer=name, matches=count, bytes=len(body),
+                                **time_call(lambda: renderer.render(payload), options.repeat)))
+        for encoding, compress in sorted(COMPRESSORS.items()):
+            results.append(dict(benchmark='compress', encoding=encoding, matches=count,
+                                bytes=len(compress(body)), **time_call(lambda: compress(body), options.repeat)))
+
+        upstream = football_api.UpstreamResult(200, payload, f'"bench-{count}"')
+        client = Client()
+
+        def cold(encoding):
+            encoded_cache.clear()
+            compressed_cache.clear()
+            return client.get('/api/matches/live/', HTTP_ACCEPT_ENCODING=encoding)
+
+        def warm(encoding):
+            return client.get('/api/matches/live/', HTTP_ACCEPT_ENCODING=encoding)
+
+        response_cache.clear()
+        with mock.patch.object(football_api, '_fetch', return_value=upstream):
+            assert warm('gzip').status_code == 200, 'matches view failed'
+            for encoding in ('identity', 'gzip'):
+                for cache, request in (('cold', cold), ('warm', warm)):
+                    results.append(dict(benchmark='view.matches', cache=cache, encoding=encoding, matches=count,
+                                        **time_call(lambda: request(encoding), options.repeat)))
+    return results
@@ -0,0 +1,56 @@
+"""MatchSerializer, CommentSerializer and UserCommentSerializer over
+synthetic in-memory rows, so only serialization is measured."""
+import datetime
+
+from benchmarks.common import time_call
+
+STATUSES = ('FINISHED', 'TIMED', 'IN_PLAY', 'SCHEDULED')
+
+
+def build_rows(rows):
+    from django.contrib.auth.models import User
+
+    from apps.comments.models import Comment, MatchSnapshot
+    from apps.matches.models import Match
+
+    kickoff = datetime.datetime(2025, 5, 1, 19, 0, tzinfo=datetime.timezone.utc)
+    users = [User(id=i + 1, username=f'user{i}') for i in range(max(rows // 50, 1))]
+    snapshots = [
+        MatchSnapshot(id=i + 1, match_id=str(500000 + i), home_team_name=f'Home {i}', away_team_name=f'Away {i}',
+                      home_team_crest='https://crests.football-data.org/1.png', competition_id=2021,
+                      competition_name='Premier League', date=kickoff, status='FINISHED',
+                      score={'fullTime': {'home': i % 4, 'away': i % 3}})
+        for i in range(max(rows // 100, 1))
+    ]
+
+    matches = [
+        Match(id=i + 1, match_id=500000 + i, home_team=f'Home {i}', away_team=f'Away {i}',
+              score=f'{i % 4}-{i % 3}', status=STATUSES[i % len(STATUSES)], date=kickoff)
+        for i in range(rows)
+    ]
+    comments = []
+    for i in range(rows):
+        snapshot = snapshots[i % len(snapshots)]
+        comment = Comment(id=i + 1, match_id=snapshot.match_id, content=f'Comment {i} ' * 4, created_at=kickoff)
+        comment.user = users[i % len(users)]
+        comment.snapshot = snapshot
+        comments.append(comment)
+    return matches, comments
+
+
+def run(options):
+    from apps.comments.views import CommentSerializer, UserCommentSerializer
+    from apps.matches.views import MatchSerializer
+
+    results = []
+    for rows in options.rows:
+        matches, comments = build_rows(rows)
+        repeat = max(1, min(options.repeat, 1000000 // rows))
+        for name, serializer_class, data in (
+            ('serializer.match', MatchSerializer, matches),
+            ('serializer.comment', CommentSerializer, comments),
+            ('serializer.user_comment', UserCommentSerializer, comments),
+        ):
+            results.append(dict(benchmark=name, rows=rows,
+                                **time_call(lambda: serializer_class(data, many=True).data, repeat)))
+    return results
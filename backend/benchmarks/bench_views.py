@@ -0,0 +1,63 @@
+"""get_match_events and get_stream_embed end to end, with ESPN, techcabal
+and football-data replaced by the recorded fixtures."""
+from unittest import mock
+
+from benchmarks.common import FixtureResponse, load_fixture, time_call
+
+
+def run(options):
+    from rest_framework.test import APIRequestFactory
+
+    from apps.core.http_client import http_client
+    from apps.matches import scoreboard, streams, views
+    from apps.matches.parsers import html_parser
+    from apps.matches.scraping import ESPN_SCOREBOARD_URL, STREAM_SCHEDULE_URL
+
+    scoreboard_html = load_fixture('espn_scoreboard.html')
+    schedule_html = load_fixture('techcabal_schedule.html')
+    home_team, away_team = list(html_parser.scoreboard(scoreboard_html))[:2]
+
+    match_data = {
+        'id': 1,
+        'status': 'FINISHED',
+        'utcDate': '2025-05-01T19:00:00Z',
+        'homeTeam': {'name': home_team},
+        'awayTeam': {'name': away_team},
+    }
+    factory = APIRequestFactory()
+    events_request = lambda: views.get_match_events(factory.get('/api/matches/match-events/1/'), match_id=1)
+    embed_request = lambda: views.get_stream_embed(factory.get('/api/matches/stream-embed/', {
+        'home_team': 'VfB Stuttgart', 'away_team': 'SC Freiburg', 'match_date': '2025-05-01T20:45:00Z',
+    }))
+
+    def cold_events():
+        scoreboard.scoreboard_cache.clear()
+        events_request()
+
+    def cold_embed():
+        streams.stream_index._index = None
+        embed_request()
+
+    def fixture_get(url, **kwargs):
+        if url.startswith(ESPN_SCOREBOARD_URL.split('{')[0]):
+            return FixtureResponse(scoreboard_html)
+        if url == STREAM_SCHEDULE_URL:
+            return FixtureResponse(schedule_html)
+        raise AssertionError(f'Unexpected network call to {url}')
+
+    results = []
+    # scoreboard and streams share one http_client, so a single fake serves both.
+    with mock.patch.object(views, 'football_get', return_value=(200, match_data)), \
+            mock.patch.object(http_client, 'get', side_effect=fixture_get):
+        assert events_request().data['homeTeamEvents'], 'fixture produced no events'
+        assert embed_request().data['stream_url'], 'fixture produced no stream'
+
+        results.append(dict(benchmark='view.match_events', cache='cold', backend=html_parser.name,
+                            **time_call(cold_events, options.repeat)))
+        results.append(dict(benchmark='view.match_events', cache='warm', backend=html_parser.name,
+                            **time_call(events_request, options.repeat)))
+        results.append(dict(benchmark='view.stream_embed', cache='cold', backend=html_parser.name,
+                            **time_call(cold_embed, options.repeat)))
+        results.append(dict(benchmark='view.stream_embed', cache='warm', backend=html_parser.name,
+                            **time_call(embed_request, options.repeat)))
+    return results
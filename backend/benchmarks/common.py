@@ -0,0 +1,30 @@
+import os
+import statistics
+import time
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as fixture:
+        return fixture.read()
+
+
+def time_call(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        'min_ms': round(min(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+    }
+
+
+class FixtureResponse:
+    def __init__(self, text, status_code=200):
+        self.text = text
+        self.status_code = status_code
@@ -0,0 +1,132 @@
+"""Offline benchmark suite: parsers, views, serializers, the comment feed and
+JSON rendering.
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --rows 10000 100000 1000000 --suite serializers
+    python -m benchmarks.run --output new.json --compare baseline.json
+
+Nothing touches the network: upstream calls are answered from the recorded
+fixtures in benchmarks/fixtures and the database is in-memory SQLite. With
+--compare the run exits non-zero if any benchmark's median got slower than
+the baseline by more than --threshold.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import django
+
+SUITES = ('parsers', 'views', 'serializers', 'comment_feed', 'render')
+TIMING_KEYS = ('min_ms', 'median_ms')
+
+
+def run_suite(name, options):
+    if name == 'parsers':
+        from benchmarks import bench_parsers
+        return bench_parsers.run(options.repeat)[0]
+    if name == 'views':
+        from benchmarks import bench_views
+        return bench_views.run(options)
+    if name == 'serializers':
+        from benchmarks import bench_serializers
+        return bench_serializers.run(options)
+    if name == 'comment_feed':
+        from benchmarks import bench_comment_feed
+        return bench_comment_feed.run(options)
+    if name == 'render':
+        from benchmarks import bench_render
+        return bench_render.run(options)
+    raise ValueError(name)
+
+
+def result_key(result):
+    return tuple(sorted((key, value) for key, value in result.items() if key not in TIMING_KEYS))
+
+
+def describe(result):
+    return ' '.join([result['benchmark']] + [
+        f'{key}={value}' for key, value in sorted(result.items()) if key not in TIMING_KEYS + ('benchmark',)
+    ])
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    baseline_by_key = {result_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results:
+        previous = baseline_by_key.get(result_key(result))
+        if previous is None or not previous['median_ms']:
+            print(f"{describe(result):<60} {result['median_ms']:>10.3f} ms  (new)")
+            continue
+
+        change = result['median_ms'] / previous['median_ms'] - 1
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(describe(result))
+        print(f"{describe(result):<60} {previous['median_ms']:>10.3f} -> {result['median_ms']:>10.3f} ms "
+              f"({change:+.1%}){flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suite', action='append', choices=SUITES,
+                        help='Run only this suite (repeatable); all suites by default')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000],
+                        help='Synthetic dataset sizes for the serializer and feed suites')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--output', help='Write the JSON results to this file')
+    parser.add_argument('--compare', help='Baseline JSON from an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Allowed median slowdown before --compare fails (0.2 = 20%%)')
+    options = parser.parse_args()
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+    results = []
+    for suite in options.suite or SUITES:
+        print(f'running {suite}...', file=sys.stderr)
+        results.extend(run_suite(suite, options))
+
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+    if options.output:
+        with open(options.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if options.compare:
+        with open(options.compare) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), options.threshold)
+        if regressions:
+            print(f'{len(regressions)} benchmark(s) regressed by more than {options.threshold:.0%}', file=sys.stderr)
+            sys.exit(1)
+    else:
+        for result in results:
+            print(f"{describe(result):<60} min {result['min_ms']:>10.3f} ms  median {result['median_ms']:>10.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,20 @@
+import os
+import tempfile
+
+os.environ.setdefault('SECRET_KEY', 'benchmark')
+os.environ.setdefault('FOOTBALL_REQUESTS_PER_MINUTE', '1000000')
+os.environ.setdefault('FOOTBALL_QUOTA_STATE_PATH', os.path.join(tempfile.gettempdir(), 'ninetyplus-benchmark-quota.json'))
+
+from settings import *  # noqa: E402,F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['*']
+
+# Shared-cache in-memory sqlite: every thread's connection sees the tables
+# migrated by the main thread, which the threaded benchmarks rely on.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': 'file:benchmarks?mode=memory&cache=shared',
+    }
+}
@@ -20,12 +20,16 @@ INSTALLED_APPS = [
     'rest_framework',
     'rest_framework.authtoken',
     'corsheaders',
+    'apps.core.apps.CoreConfig',
     'apps.matches.apps.MatchesConfig',
     'apps.users.apps.UsersConfig',
     'apps.comments.apps.CommentsConfig',
 ]
 
 MIDDLEWARE = [
+    'apps.core.middleware.MetricsMiddleware',
+    'apps.core.middleware.CompressionMiddleware',
+    'apps.core.middleware.QueryCountMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -99,6 +103,129 @@ CORS_ALLOW_CREDENTIALS = True
 
 FOOTBALL_API_KEY = os.getenv('FOOTBALL_API_KEY')
 
+HTTP_CLIENT = {
+    'POOL_MAXSIZE': 20,
+    'MAX_RETRIES': 2,
+    'BACKOFF_FACTOR': 0.3,
+    'BACKOFF_JITTER': 0.3,
+    'DEFAULT_TIMEOUT': (3.05, 10),
+    'TIMEOUTS': {
+        'api.football-data.org': (3.05, 8),
+        'www.espn.com': (3.05, 10),
+        'techcabal.net': (3.05, 10),
+    },
+}
+
+MATCHES_ASYNC_VIEWS = os.getenv('MATCHES_ASYNC_VIEWS') == 'True'
+
+FOOTBALL_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('FOOTBALL_CACHE_MAX_ENTRIES', 512)),
+    'LIVE_TTL': 15,
+    'MATCHES_TTL': 60,
+    'STANDINGS_TTL': 300,
+    'TEAM_MATCHES_TTL': 600,
+    'FINISHED_TTL': None,
+    'ENCODED_MAX_ENTRIES': 128,
+}
+
+HTML_PARSER = os.getenv('HTML_PARSER', 'lxml')
+
+SCOREBOARD_INDEX = {
+    'LIVE_TTL': 60,
+    'TTL': 6 * 60 * 60,
+    'MAX_DATES': 32,
+}
+
+# Parsed techcabal stream schedule, refreshed in the background once stale
+STREAM_INDEX = {
+    'TTL': 5 * 60,
+}
+
+# /api/matches/standings/batch/: standings missing from the cache are fetched
+# side by side, and any still loading after TIMEOUT are reported as pending
+STANDINGS_BATCH = {
+    'MAX_WORKERS': 4,
+    'TIMEOUT': 5.0,
+    'MAX_COMPETITIONS': 10,
+    'DEFAULT_COMPETITIONS': (2021, 2014, 2002, 2019, 2015),
+}
+
+# Favorite-team search, built from the standings of these competitions
+TEAM_INDEX = {
+    'TTL': 6 * 60 * 60,
+    'RETRY_AFTER': 60,
+    'COMPETITIONS': (2021, 2014, 2002, 2019, 2015),
+    'MAX_RESULTS': 20,
+}
+
+# Favorite teams' next fixtures, refreshed by `manage.py refresh_next_fixtures`
+NEXT_FIXTURE = {
+    'REFRESH_INTERVAL': 60 * 60,
+    'WINDOW_DAYS': 7,
+    'TEAM_WINDOW_DAYS': 30,
+}
+
+# Legacy comments without stored match details are backfilled per page
+MATCH_DETAILS_PREFETCH = {
+    'MAX_WORKERS': 4,
+}
+
+# Database-backed queue drained by `manage.py process_enrichment_jobs`
+ENRICHMENT_QUEUE = {
+    'LEASE_SECONDS': 300,
+    'MAX_ATTEMPTS': 5,
+    'RETRY_BACKOFF': 30,
+}
+
+# Global comment feed
+COMMENT_FEED = {
+    'MAX_PAGE_SIZE': 100,
+}
+
+# Upper bound on SQL queries per request, by URL name. QueryCountMiddleware
+# warns about overruns in DEBUG and apps.core.testing.endpoint_budget asserts them.
+QUERY_BUDGETS = {
+    'matches': 2,
+    'match-details': 2,
+    'comment-list': 3,
+    'comment-list-all': 8,
+    'user-comments': 7,
+    'user-comments-by-username': 8,
+    'public-profile': 5,
+    'next-fixture': 5,
+}
+
+# Prometheus metrics on /metrics; each worker writes its counters to DIR
+METRICS = {
+    'DIR': os.getenv('METRICS_DIR'),
+    'FLUSH_INTERVAL': 1.0,
+    'TOKEN': os.getenv('METRICS_TOKEN'),
+}
+
+# gzip/brotli for JSON bodies over MIN_SIZE bytes; brotli needs `pip install brotli`
+COMPRESSION = {
+    'MIN_SIZE': 1024,
+    'GZIP_LEVEL': 6,
+    'BROTLI_QUALITY': 5,
+    'CACHE_ENTRIES': 256,
+}
+
+LIVE_STREAM = {
+    'POLL_INTERVAL': 15,
+    'KEEPALIVE_INTERVAL': 20,
+    'QUEUE_SIZE': 32,
+}
+
+FOOTBALL_QUOTA = {
+    'REQUESTS_PER_MINUTE': int(os.getenv('FOOTBALL_REQUESTS_PER_MINUTE', 10)),
+    'STATE_PATH': os.getenv('FOOTBALL_QUOTA_STATE_PATH'),
+}
+
+FOOTBALL_SINGLEFLIGHT = {
+    'MODE': os.getenv('FOOTBALL_SINGLEFLIGHT_MODE', 'thread'),
+    'LOCK_DIR': os.getenv('FOOTBALL_SINGLEFLIGHT_LOCK_DIR'),
+}
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.TokenAuthentication',
@@ -106,4 +233,8 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
\ No newline at end of file
@@ -1,9 +1,11 @@
 from django.contrib import admin
 from django.urls import path, include
+from apps.core.views import metrics
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/matches/', include('apps.matches.urls')),
     path('api/users/', include('apps.users.urls')),
     path('api/comments/', include('apps.comments.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
\ No newline at end of file
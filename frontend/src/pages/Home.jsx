@@ -53,38 +53,17 @@ function Home() {
         setFeaturedMatches(featured);
 
         if (favoriteTeam?.favorite_team_id) {
-          const teamMatch = allMatches.find(
-            (match) =>
-              match.homeTeam.id === favoriteTeam.favorite_team_id ||
-              match.awayTeam.id === favoriteTeam.favorite_team_id
-          );
-
-          if (teamMatch) {
-            setFavoriteTeamMatch(teamMatch);
-          } else {
-            try {
-              const response = await api.get(
-                `/matches/team/${favoriteTeam.favorite_team_id}/`
+          try {
+            const response = await api.get("/matches/next-fixture/");
+            const nextMatch = response.data?.match;
+            if (nextMatch) {
+              setFavoriteTeamMatch(
+                allMatches.find((match) => match.id === nextMatch.id) ||
+                  nextMatch
               );
-              if (
-                response.data &&
-                response.data.matches &&
-                response.data.matches.length > 0
-              ) {
-                const upcomingMatches = response.data.matches
-                  .filter(
-                    (match) =>
-                      match.status === "SCHEDULED" || match.status === "TIMED"
-                  )
-                  .sort((a, b) => new Date(a.utcDate) - new Date(b.utcDate));
-
-                if (upcomingMatches.length > 0) {
-                  setFavoriteTeamMatch(upcomingMatches[0]);
-                }
-              }
-            } catch (err) {
-              console.error("Failed to fetch favorite team's next match", err);
             }
+          } catch (err) {
+            console.error("Failed to fetch favorite team's next match", err);
           }
         }
       } catch (error) {
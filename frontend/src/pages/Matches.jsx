@@ -1,5 +1,10 @@
 import { useEffect, useRef, useState } from "react";
-import { getMatches } from "../services/footballService";
+import {
+  applyLiveUpdates,
+  getMatches,
+  subscribeToLiveScores,
+} from "../services/footballService";
+import { TOP_LEAGUES } from "../config/leagues";
 import MatchDetails from "../components/MatchDetails";
 import ErrorOutlineIcon from "@mui/icons-material/ErrorOutline";
 import FavoriteIcon from "@mui/icons-material/Favorite";
@@ -134,42 +139,19 @@ function Matches() {
 
         let favoriteTeamMatch = null;
         if (favoriteTeam && favoriteTeam.favorite_team_id) {
-          if (allMatchesData && allMatchesData.length > 0) {
-            favoriteTeamMatch = allMatchesData.find(
-              (match) =>
-                match.homeTeam.id === favoriteTeam.favorite_team_id ||
-                match.awayTeam.id === favoriteTeam.favorite_team_id
-            );
-          }
-
-          if (!favoriteTeamMatch) {
-            try {
-              const response = await api.get(
-                `/matches/team/${favoriteTeam.favorite_team_id}/`
-              );
-
-              if (
-                response.data &&
-                response.data.matches &&
-                response.data.matches.length > 0
-              ) {
-                const upcomingMatches = response.data.matches
-                  .filter(
-                    (match) =>
-                      match.status === "SCHEDULED" || match.status === "TIMED"
-                  )
-                  .sort((a, b) => new Date(a.utcDate) - new Date(b.utcDate));
-
-                if (upcomingMatches.length > 0) {
-                  favoriteTeamMatch = upcomingMatches[0];
-                }
-              }
-            } catch (err) {
-              console.error(
-                "Failed to fetch favorite team's upcoming match",
-                err
-              );
+          try {
+            const response = await api.get("/matches/next-fixture/");
+            const nextMatch = response.data?.match;
+            if (nextMatch) {
+              favoriteTeamMatch =
+                allMatchesData.find((match) => match.id === nextMatch.id) ||
+                nextMatch;
             }
+          } catch (err) {
+            console.error(
+              "Failed to fetch favorite team's upcoming match",
+              err
+            );
           }
         }
 
@@ -249,11 +231,38 @@ function Matches() {
 
     fetchData();
 
-    const interval = setInterval(fetchData, 180000);
+    // Poll until the live stream is open, and again whenever it drops.
+    let pollInterval = null;
+    const startPolling = () => {
+      if (!pollInterval) pollInterval = setInterval(fetchData, 180000);
+    };
+    const stopPolling = () => {
+      clearInterval(pollInterval);
+      pollInterval = null;
+    };
+    startPolling();
+
+    const unsubscribe = subscribeToLiveScores(
+      (updates) => {
+        if (!isMounted) return;
+
+        setMatches((current) => {
+          const updated = applyLiveUpdates(current, updates);
+          prevMatchesRef.current = updated;
+          return updated;
+        });
+        setFavoriteTeamMatch((current) =>
+          current ? applyLiveUpdates([current], updates)[0] : current
+        );
+      },
+      TOP_LEAGUES.map((league) => league.id),
+      { onOpen: stopPolling, onError: startPolling }
+    );
 
     return () => {
       isMounted = false;
-      clearInterval(interval);
+      stopPolling();
+      unsubscribe();
     };
   }, [favoriteTeam]);
 
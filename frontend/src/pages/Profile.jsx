@@ -10,7 +10,6 @@ import FavoriteIcon from "@mui/icons-material/Favorite";
 import StarIcon from "@mui/icons-material/Star";
 import DeleteIcon from "@mui/icons-material/Delete"
 import { toast } from "react-toastify";
-import { DOMESTIC_LEAGUES } from "../config/leagues";
 
 function Profile() {
   const {
@@ -87,61 +86,18 @@ function Profile() {
     }
 
     setIsSearching(true);
-    const allTeams = [];
-    let hasErrors = false;
 
     try {
-      const leaguesToSearch = DOMESTIC_LEAGUES;
-      
-      for (const league of leaguesToSearch) {
-        try {
-          const response = await api.get(`/matches/standings/${league.id}/`, {
-            timeout: 8000
-          });
-          
-          if (response.data && Array.isArray(response.data.standings)) {
-            const teams = response.data.standings[0].table.map(standing => ({
-              id: standing.team.id,
-              name: standing.team.name,
-              shortName: standing.team.shortName,
-              crest: standing.team.crest,
-              league: league.name,
-              country: league.country
-            }));
-            
-            allTeams.push(...teams);
-          } else if (response.data && Array.isArray(response.data)) {
-            const teams = response.data.map(standing => ({
-              id: standing.team.id,
-              name: standing.team.name,
-              shortName: standing.team.shortName,
-              crest: standing.team.crest,
-              league: league.name,
-              country: league.country
-            }));
-            
-            allTeams.push(...teams);
-          }
-        } catch (err) {
-          console.error(`Failed to fetch teams for league ${league.name}`, err);
-          hasErrors = true;
-        }
-      }
-      
-      const searchTerm = teamSearchQuery.toLowerCase();
-      const filteredTeams = allTeams.filter(team => 
-        team.name.toLowerCase().includes(searchTerm) || 
-        (team.shortName && team.shortName.toLowerCase().includes(searchTerm))
-      );
-      
-      setSearchResults(filteredTeams);
-      
-      if (filteredTeams.length === 0) {
-        if (hasErrors) {
-          toast.warning("Some leagues timed out. Try a more specific search term. Try waiting a minute.");
-        } else {
-          toast.info("No teams found matching your search. Try waiting a minute.");
-        }
+      const response = await api.get("/matches/teams/search/", {
+        params: { q: teamSearchQuery.trim() },
+        timeout: 8000
+      });
+      const teams = response.data?.teams || [];
+
+      setSearchResults(teams);
+
+      if (teams.length === 0) {
+        toast.info("No teams found matching your search. Try waiting a minute.");
       }
     } catch (err) {
       toast.error("Search failed. Please try again later. Try waiting a minute.");
@@ -1,5 +1,5 @@
-import { useState, useEffect } from "react";
-import { getStandings } from "../services/footballService";
+import { useState, useEffect, useRef } from "react";
+import { getStandings, getStandingsBatch } from "../services/footballService";
 import { DOMESTIC_LEAGUES } from "../config/leagues";
 import { LEAGUE_ICONS } from "../config/leagueIcons";
 import ErrorOutlineIcon from "@mui/icons-material/ErrorOutline";
@@ -11,12 +11,21 @@ function Standings() {
   const [error, setError] = useState(null);
   const [isRateLimited, setIsRateLimited] = useState(false);
   const [selectedLeague, setSelectedLeague] = useState(DOMESTIC_LEAGUES[0]);
+  const tablesRef = useRef(null);
 
   useEffect(() => {
     const fetchStandings = async () => {
       setLoading(true);
       try {
-        const data = await getStandings(selectedLeague.id);
+        // Every league's table arrives in one request, so switching tabs is instant.
+        if (!tablesRef.current) {
+          tablesRef.current = await getStandingsBatch(
+            DOMESTIC_LEAGUES.map((league) => league.id)
+          );
+        }
+        const data =
+          tablesRef.current[selectedLeague.id] ||
+          (await getStandings(selectedLeague.id));
         if (!data || data.length === 0) {
           setIsRateLimited(true);
         } else {
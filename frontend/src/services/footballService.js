@@ -1,5 +1,6 @@
 import axios from "axios";
 import { TOP_LEAGUES } from "../config/leagues";
+import { formatDateBatched } from "../utils/matchUtils";
 
 const api = axios.create({
   baseURL: import.meta.env.VITE_API_URL,
@@ -8,32 +9,94 @@ const api = axios.create({
 const CACHE_TIME = 180000;
 let matchesCache = { data: null, timestamp: 0 };
 
+// Only the attributes the match cards and details modal render.
+const MATCH_FIELDS = [
+  "id",
+  "utcDate",
+  "status",
+  "competition.id",
+  "competition.name",
+  "homeTeam",
+  "awayTeam",
+  "score.fullTime",
+  "score.halfTime",
+].join(",");
+
 export const getMatches = async () => {
   const now = Date.now();
   if (matchesCache.data && now - matchesCache.timestamp < CACHE_TIME) {
-    return matchesCache.data.filter(
-      (match) =>
-        TOP_LEAGUES.some((league) => league.id === match.competition.id) &&
-        match.status !== "POSTPONED"
-    );
+    return matchesCache.data;
   }
 
   try {
-    const response = await api.get("/matches/live/");
+    const response = await api.get("/matches/live/", {
+      params: {
+        competitions: TOP_LEAGUES.map((league) => league.id).join(","),
+        exclude_status: "POSTPONED",
+        fields: MATCH_FIELDS,
+      },
+    });
     matchesCache = {
       data: response.data.matches,
       timestamp: now,
     };
-    return matchesCache.data.filter(
-      (match) =>
-        TOP_LEAGUES.some((league) => league.id === match.competition.id) &&
-        match.status !== "POSTPONED"
-    );
+    return matchesCache.data;
   } catch (error) {
     return [];
   }
 };
 
+export const subscribeToLiveScores = (
+  onUpdate,
+  competitionIds = [],
+  { onOpen, onError } = {}
+) => {
+  const params = competitionIds.length
+    ? `?competitions=${competitionIds.join(",")}`
+    : "";
+  const source = new EventSource(
+    `${import.meta.env.VITE_API_URL}/matches/live/stream/${params}`
+  );
+
+  const handleEvent = (event) => {
+    try {
+      onUpdate(JSON.parse(event.data));
+    } catch (error) {
+      console.error("Error reading live score update:", error);
+    }
+  };
+
+  source.addEventListener("snapshot", handleEvent);
+  source.addEventListener("update", handleEvent);
+  // The browser reconnects on its own unless the server refused the stream
+  // (readyState CLOSED), e.g. the 501 returned outside ASGI.
+  source.onopen = () => onOpen?.();
+  source.onerror = () => onError?.(source.readyState === EventSource.CLOSED);
+
+  return () => source.close();
+};
+
+export const applyLiveUpdates = (matches, updates) => {
+  if (!updates.length) return matches;
+
+  const updatesById = new Map(updates.map((update) => [update.id, update]));
+
+  return matches.map((match) => {
+    const update = updatesById.get(match.id);
+    if (!update) return match;
+
+    return {
+      ...match,
+      status: update.status,
+      score: {
+        ...match.score,
+        fullTime: update.score.fullTime || match.score.fullTime,
+        halfTime: update.score.halfTime || match.score.halfTime,
+      },
+    };
+  });
+};
+
 export const getStandings = async (leagueId = 2021) => {
   try {
     const response = await api.get(`/matches/standings/${leagueId}/`);
@@ -43,6 +106,23 @@ export const getStandings = async (leagueId = 2021) => {
   }
 };
 
+export const getStandingsBatch = async (leagueIds) => {
+  try {
+    const response = await api.get("/matches/standings/batch/", {
+      params: { competitions: leagueIds.join(",") },
+    });
+    const tables = {};
+    response.data.standings
+      .filter((entry) => entry.status === "ok")
+      .forEach((entry) => {
+        tables[entry.competition_id] = entry.data.standings[0].table;
+      });
+    return tables;
+  } catch (error) {
+    return {};
+  }
+};
+
 export const getMatchDetails = async (matchId) => {
   try {
     const response = await api.get(`/matches/match/${matchId}/`);
@@ -63,13 +143,7 @@ export const formatBulgarianTimeSync = (utcDate) => {
 
 export const formatBulgarianTime = async (utcDate) => {
   try {
-    const response = await api.get(`/matches/format-date/`, {
-      params: {
-        utc_date: utcDate,
-        format_type: 'time_only'
-      }
-    });
-    return response.data.formatted_date;
+    return await formatDateBatched(utcDate, "time_only");
   } catch (error) {
     console.error("Error formatting time:", error);
     return formatBulgarianTimeSync(utcDate);
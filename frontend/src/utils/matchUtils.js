@@ -41,15 +41,50 @@ export const formatMatchDateTimeSync = (utcDate) => {
   }
 };
 
-export const formatMatchDateTime = async (utcDate) => {
+const pendingDateFormats = new Map();
+let dateFormatTimer = null;
+
+const flushDateFormats = async () => {
+  const batch = new Map(pendingDateFormats);
+  pendingDateFormats.clear();
+  dateFormatTimer = null;
+
+  const formatTypes = [...new Set([...batch.keys()].map((key) => key.split("|")[1]))];
+  const utcDates = [...new Set([...batch.keys()].map((key) => key.split("|")[0]))];
+
   try {
-    const response = await api.get(`/matches/format-date/`, {
-      params: {
-        utc_date: utcDate,
-        format_type: 'match_status'
-      }
+    const response = await api.post(`/matches/format-dates/`, {
+      utc_dates: utcDates,
+      format_types: formatTypes,
+    });
+    batch.forEach((callbacks, key) => {
+      const [utcDate, formatType] = key.split("|");
+      const formatted = response.data.formatted_dates[utcDate];
+      callbacks.forEach(({ resolve, reject }) =>
+        formatted ? resolve(formatted[formatType]) : reject(new Error(response.data.errors[utcDate]))
+      );
     });
-    return response.data.formatted_date;
+  } catch (error) {
+    batch.forEach((callbacks) => callbacks.forEach(({ reject }) => reject(error)));
+  }
+};
+
+// Calls made in the same tick share one /format-dates/ request.
+export const formatDateBatched = (utcDate, formatType) =>
+  new Promise((resolve, reject) => {
+    const key = `${utcDate}|${formatType}`;
+    if (!pendingDateFormats.has(key)) {
+      pendingDateFormats.set(key, []);
+    }
+    pendingDateFormats.get(key).push({ resolve, reject });
+    if (!dateFormatTimer) {
+      dateFormatTimer = setTimeout(flushDateFormats, 0);
+    }
+  });
+
+export const formatMatchDateTime = async (utcDate) => {
+  try {
+    return await formatDateBatched(utcDate, "match_status");
   } catch (error) {
     console.error("Error formatting date time:", error);
     return formatMatchDateTimeSync(utcDate);